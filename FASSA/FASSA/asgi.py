@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'FASSA.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up; serves the server-sent event stream (realtime.stream).
+from realtime.stream import PushRouter  # noqa: E402
+
+application = PushRouter(django_application)
@@ -0,0 +1,79 @@
+"""
+DATABASES built from the environment.
+
+DB_ENGINE=postgresql (default) or sqlite. PostgreSQL connections are either
+persistent (DB_CONN_MAX_AGE seconds, checked with DB_CONN_HEALTH_CHECKS) or
+taken from psycopg's pool (DB_POOL=True, DB_POOL_MIN_SIZE/MAX_SIZE/TIMEOUT);
+Django does not allow both, so the pool forces CONN_MAX_AGE to 0. Behind
+pgbouncer in transaction mode set DB_PGBOUNCER=True: server-side cursors
+cannot survive across transactions there, so they are disabled.
+
+Setting DB_REPLICA_HOST (or DB_REPLICA_NAME for SQLite) adds a 'replica'
+alias, which FASSA.routers sends opted-in read-only views to. Two SQLite files
+are enough to try it locally:
+
+    DB_ENGINE=sqlite DB_REPLICA_NAME=db-replica.sqlite3 python manage.py migrate
+    DB_ENGINE=sqlite DB_REPLICA_NAME=db-replica.sqlite3 python manage.py migrate --database=replica
+"""
+from decouple import config
+
+
+def postgresql(prefix, fallback=None):
+    def value(key):
+        if fallback is None:
+            return config(f'{prefix}_{key}')
+        return config(f'{prefix}_{key}', default=fallback[key])
+
+    pooled = config('DB_POOL', default=False, cast=bool)
+    options = {}
+    if pooled:
+        options['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=20, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        }
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': value('NAME'),
+        'USER': value('USER'),
+        'PASSWORD': value('PASSWORD'),
+        'HOST': value('HOST'),
+        'PORT': value('PORT'),
+        'CONN_MAX_AGE': 0 if pooled else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_PGBOUNCER', default=False, cast=bool),
+        'OPTIONS': options,
+    }
+
+
+def sqlite(name):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        # Writers queue for the lock at BEGIN instead of failing when a read
+        # transaction tries to upgrade; the test database is a file so that
+        # waiting works for threaded tests too (in-memory shared cache never waits).
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+        'TEST': {'NAME': f'{name}.test'},
+    }
+
+
+def database_settings(base_dir):
+    engine = config('DB_ENGINE', default='postgresql')
+    if engine == 'sqlite':
+        databases = {'default': sqlite(config('DB_NAME', default=str(base_dir / 'db.sqlite3')))}
+        replica_name = config('DB_REPLICA_NAME', default='')
+        if replica_name:
+            databases['replica'] = sqlite(replica_name)
+    else:
+        databases = {'default': postgresql('DB')}
+        if config('DB_REPLICA_HOST', default=''):
+            primary = {key: databases['default'][key] for key in ('NAME', 'USER', 'PASSWORD', 'HOST', 'PORT')}
+            databases['replica'] = postgresql('DB_REPLICA', fallback=primary)
+
+    if 'replica' in databases:
+        # Tests run against a single database; the replica alias reads it too.
+        databases['replica']['TEST'] = {'MIRROR': 'default'}
+    return databases
@@ -0,0 +1,236 @@
+"""
+Per-endpoint request metrics: SQL query count, DB time, serializer time,
+response size and wall time, keyed by URL name and served in Prometheus
+text format at /metrics/.
+
+Views may declare `query_budget = <n>` for their reads (plus one for the
+user lookup on stateless_auth views without SHARED_CACHE); reads that run more
+queries are logged, counted, and raise QueryBudgetExceeded when
+QUERY_BUDGET_STRICT is on (use it in tests, or mix QueryBudgetTestMixin into a
+TestCase).
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    """Collected for one request; also used as a connection execute_wrapper."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+class MetricsRegistry:
+    COUNTERS = (
+        ('requests', 'fassa_http_requests_total', 'Requests handled.'),
+        ('queries', 'fassa_db_queries_total', 'SQL queries executed.'),
+        ('db_seconds', 'fassa_db_seconds_total', 'Time spent in the database.'),
+        ('serializer_seconds', 'fassa_serializer_seconds_total', 'Time spent producing serializer output.'),
+        ('request_seconds', 'fassa_request_seconds_total', 'Wall time spent handling requests.'),
+        ('response_bytes', 'fassa_response_bytes_total', 'Bytes of non-streaming response bodies.'),
+        ('budget_exceeded', 'fassa_query_budget_exceeded_total', 'Requests that ran more queries than their budget.'),
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(lambda: defaultdict(float))
+
+    def record(self, view, metrics, seconds, size, over_budget):
+        with self.lock:
+            stats = self.views[view]
+            stats['requests'] += 1
+            stats['queries'] += metrics.queries
+            stats['db_seconds'] += metrics.db_time
+            stats['serializer_seconds'] += metrics.serializer_time
+            stats['request_seconds'] += seconds
+            stats['response_bytes'] += size
+            stats['budget_exceeded'] += over_budget
+            stats['max_queries'] = max(stats['max_queries'], metrics.queries)
+
+    def prometheus(self):
+        with self.lock:
+            snapshot = {view: dict(stats) for view, stats in self.views.items()}
+        lines = []
+        for key, name, help_text in self.COUNTERS + (('max_queries', 'fassa_db_queries_max', 'Most queries seen in one request.'),):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {'gauge' if key == 'max_queries' else 'counter'}")
+            for view, stats in sorted(snapshot.items()):
+                value = stats.get(key, 0)
+                lines.append(f'{name}{{view="{view}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def install_serializer_timer():
+    """Time every top-level serializer `.data` access made while a request is being measured."""
+    from rest_framework.serializers import BaseSerializer
+
+    if getattr(BaseSerializer, '_timed_by_instrumentation', False):
+        return
+    original = BaseSerializer.data.fget
+
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.in_serializer:
+            return original(self)
+        metrics.in_serializer = True
+        start = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.in_serializer = False
+
+    BaseSerializer.data = property(data)
+    BaseSerializer._timed_by_instrumentation = True
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    return (match.url_name or match.view_name) if match else 'unmatched'
+
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def query_budget(request):
+    """The view's budget for this request; writes (imports, bulk updates) have none."""
+    if request.method not in READ_METHODS:
+        return None
+    match = getattr(request, 'resolver_match', None)
+    view_class = getattr(match.func, 'view_class', None) if match else None
+    budget = getattr(view_class, 'query_budget', None)
+    if budget is not None and getattr(view_class, 'stateless_auth', False) and not settings.SHARED_CACHE:
+        # Budgets assume the token claims are trusted; without a shared cache
+        # the user is loaded (accounts.authentication.StatelessReadJWTAuthentication).
+        budget += 1
+    return budget
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True  # keeps async views on the event loop under ASGI
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        install_serializer_timer()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    def finish(self, request, response, metrics, seconds):
+        budget = query_budget(request)
+        over_budget = budget is not None and metrics.queries > budget
+        size = 0 if response.streaming else len(response.content)
+        registry.record(view_label(request), metrics, seconds, size, over_budget)
+
+        response.request_metrics = metrics
+        response.query_budget = budget
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(metrics.queries)
+            response['X-DB-Time'] = f"{metrics.db_time * 1000:.1f}ms"
+
+        if over_budget:
+            message = f"{view_label(request)} ran {metrics.queries} queries; budget is {budget}."
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+def metrics_view(request):
+    if request.META.get('REMOTE_ADDR') not in getattr(settings, 'METRICS_ALLOWED_IPS', ()):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class QueryBudgetTestMixin:
+    """
+    For django.test.TestCase subclasses:
+        response = self.client.get(url)
+        self.assertWithinQueryBudget(response)
+    """
+
+    def assertWithinQueryBudget(self, response, budget=None, status_code=200):
+        self.assertEqual(response.status_code, status_code, getattr(response, 'data', None))
+        budget = budget if budget is not None else response.query_budget
+        if budget is None:
+            self.fail("The view declares no query_budget.")
+        queries = response.request_metrics.queries
+        self.assertLessEqual(queries, budget, f"{queries} queries exceed the budget of {budget}.")
+
+    def assertQueriesDoNotGrow(self, fetch, add_rows):
+        """
+        Call fetch() (which returns a response), then add_rows(), then fetch()
+        again: both responses must pass their budget with the same query count,
+        so a list costs the same for one row as for many.
+        """
+        before = fetch()
+        self.assertWithinQueryBudget(before)
+        add_rows()
+        after = fetch()
+        self.assertWithinQueryBudget(after)
+        self.assertGreater(len(after.data), len(before.data), "add_rows() added nothing to the response.")
+        self.assertEqual(after.request_metrics.queries, before.request_metrics.queries)
@@ -0,0 +1,80 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA = 'replica'
+
+_use_replica = contextvars.ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica():
+    """Route ORM reads in this block to the replica (when one is configured)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def pin_key(scope):
+    return f'db:pinned:{scope}'
+
+
+def pin_to_primary(scope):
+    """
+    After a write, keep readers of `scope` on the primary for REPLICA_PIN_SECONDS
+    so they cannot read (and cache) data the replica has not caught up with yet.
+    """
+    if replica_configured():
+        cache.set(pin_key(scope), 1, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+
+
+def is_pinned(*scopes):
+    return bool(cache.get_many([pin_key(scope) for scope in scopes]))
+
+
+class ReplicaRouter:
+    """Writes, and reads outside read_from_replica(), go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_configured():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+
+class ReplicaReadMixin:
+    """
+    DRF view mixin: safe requests read from the replica for the whole
+    request, unless one of get_replica_pins() was written to moments ago.
+    """
+
+    def get_replica_pins(self):
+        return ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = None
+        if request.method in SAFE_METHODS and replica_configured() and not is_pinned(*self.get_replica_pins()):
+            self._replica_token = _use_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _use_replica.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -2,6 +2,8 @@ from pathlib import Path
 from decouple import config
 from datetime import timedelta
 
+from .database import database_settings
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,14 +25,22 @@ INSTALLED_APPS = [
     'admin_panel',
     'announcements',
     'clubs',
+    'realtime',
     'resources',
     'students',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'accounts.authentication.StatelessReadJWTAuthentication',
+    ),
+    # Token buckets used by accounts.throttling: burst/period per client IP or email.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': config('THROTTLE_LOGIN_IP', default='30/min'),
+        'login_email': config('THROTTLE_LOGIN_EMAIL', default='5/min'),
+        'password_reset_ip': config('THROTTLE_PASSWORD_RESET_IP', default='10/hour'),
+        'password_reset_email': config('THROTTLE_PASSWORD_RESET_EMAIL', default='3/hour'),
+    },
 }
 
 SIMPLE_JWT = {
@@ -47,6 +57,7 @@ SIMPLE_JWT = {
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
+    'FASSA.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,6 +67,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request metrics (FASSA.instrumentation), scraped from /metrics/.
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1', cast=lambda v: [ip.strip() for ip in v.split(',')])
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=False, cast=bool)
+
 ROOT_URLCONF = 'FASSA.urls'
 
 TEMPLATES = [
@@ -74,19 +89,53 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'FASSA.wsgi.application'
-
-
-DATABASES = {
+ASGI_APPLICATION = 'FASSA.asgi.application'
+
+# Serve register/ and password-reset/ with the async views in accounts.async_views.
+# Turn on when running under an ASGI server (uvicorn, daphne, gunicorn -k uvicorn...).
+ACCOUNTS_ASYNC_VIEWS = config('ACCOUNTS_ASYNC_VIEWS', default=False, cast=bool)
+
+# Delta sync for mobile clients (students.sync).
+SYNC_PAGE_SIZE = config('SYNC_PAGE_SIZE', default=1000, cast=int)
+# Must exceed the longest transaction that logs changes (see students.sync.settle_bound).
+SYNC_SETTLE_SECONDS = config('SYNC_SETTLE_SECONDS', default=5, cast=int)
+SYNC_LOG_RETENTION_DAYS = config('SYNC_LOG_RETENTION_DAYS', default=90, cast=int)
+
+# Server-sent events for timetable, course and announcement changes (realtime.stream),
+# served by FASSA.asgi only. InProcessBroker reaches only streams held by the process
+# that made the change; use realtime.broker.RedisBroker with more than one worker.
+PUSH_PATH = '/api/push/'
+PUSH_BROKER = config('PUSH_BROKER', default='realtime.broker.InProcessBroker')
+PUSH_REDIS_URL = config('PUSH_REDIS_URL', default='redis://localhost:6379/0')
+PUSH_HEARTBEAT_SECONDS = config('PUSH_HEARTBEAT_SECONDS', default=25, cast=int)
+PUSH_QUEUE_SIZE = config('PUSH_QUEUE_SIZE', default=100, cast=int)
+
+
+DATABASES = database_settings(BASE_DIR)
+DATABASE_ROUTERS = ['FASSA.routers.ReplicaRouter']
+# Seconds a user (or the catalogue) reads from the primary after a write.
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
+# Local-memory by default. Multi-process deployments need a shared backend
+# (file-based, Redis, ...) so invalidations reach every worker.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': config('DB_NAME'),
-        'USER': config('DB_USER'),
-        'PASSWORD': config('DB_PASSWORD'),
-        'HOST': config('DB_HOST'),
-        'PORT': config('DB_PORT'),
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='fassa'),
     }
 }
 
+# True when every server process and management command reads the same cache
+# (Redis, Memcached, database, files). Token revocations live there; without
+# it, stateless_auth views load the user instead of trusting the token claims.
+SHARED_CACHE = config('SHARED_CACHE', cast=bool, default=CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+))
+
+STUDENT_CACHE_TIMEOUT = config('STUDENT_CACHE_TIMEOUT', default=3600, cast=int)
+CLUB_MEMBERSHIP_CACHE_TIMEOUT = config('CLUB_MEMBERSHIP_CACHE_TIMEOUT', default=3600, cast=int)
+
 EMAIL_BACKEND = config("EMAIL_BACKEND")
 EMAIL_HOST = config("EMAIL_HOST")
 EMAIL_PORT = config("EMAIL_PORT")
@@ -94,7 +143,32 @@ EMAIL_USE_TLS = config("EMAIL_USE_TLS")
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL")
+EMAIL_FILE_PATH = config("EMAIL_FILE_PATH", default=str(BASE_DIR / 'sent_emails'))  # filebased backend only
+
+# Outbox worker (manage.py send_queued_mail)
+EMAIL_QUEUE_MAX_ATTEMPTS = config("EMAIL_QUEUE_MAX_ATTEMPTS", default=5, cast=int)
+EMAIL_QUEUE_RETRY_BASE_SECONDS = config("EMAIL_QUEUE_RETRY_BASE_SECONDS", default=30, cast=int)
+EMAIL_QUEUE_RETRY_MAX_SECONDS = config("EMAIL_QUEUE_RETRY_MAX_SECONDS", default=3600, cast=int)
+EMAIL_QUEUE_RETENTION_DAYS = config("EMAIL_QUEUE_RETENTION_DAYS", default=7, cast=int)  # then SENT rows are deleted
+
+
+# The first hasher hashes new passwords; the rest still verify old hashes,
+# which Django upgrades to the preferred one on the user's next login.
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'accounts.hashers.TunablePBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER
+]
+PBKDF2_ITERATIONS = config('PBKDF2_ITERATIONS', default=0, cast=int)  # 0 = Django's default
 
+# Lifetimes of the stateless links emailed to users (seconds).
+PASSWORD_RESET_TIMEOUT = config('PASSWORD_RESET_TIMEOUT', default=3600, cast=int)
+VERIFICATION_TOKEN_MAX_AGE = config('VERIFICATION_TOKEN_MAX_AGE', default=7 * 24 * 3600, cast=int)
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -122,6 +196,20 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Admin exports (admin_panel.exports)
+EXPORT_ROOT = config('EXPORT_ROOT', default=str(BASE_DIR / 'exports'))
+EXPORT_SYNC_ROW_LIMIT = config('EXPORT_SYNC_ROW_LIMIT', default=50000, cast=int)
+
+# Course resources (resources.storage): content-addressed files on local disk.
+RESOURCE_ROOT = config('RESOURCE_ROOT', default=str(BASE_DIR / 'resource_store'))
+RESOURCE_MAX_UPLOAD_SIZE = config('RESOURCE_MAX_UPLOAD_SIZE', default=500 * 1024 * 1024, cast=int)
+# '' streams from Django; 'nginx' uses X-Accel-Redirect to RESOURCE_ACCEL_PREFIX
+# (an internal location aliased to RESOURCE_ROOT); 'sendfile' sets X-Sendfile.
+RESOURCE_SENDFILE = config('RESOURCE_SENDFILE', default='')
+RESOURCE_ACCEL_PREFIX = config('RESOURCE_ACCEL_PREFIX', default='/protected-resources/')
+# Extracted text kept per file for search (resources.indexing).
+RESOURCE_TEXT_MAX_CHARS = config('RESOURCE_TEXT_MAX_CHARS', default=2_000_000, cast=int)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
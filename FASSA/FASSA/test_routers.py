@@ -0,0 +1,80 @@
+import tempfile
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from accounts.testing import log_in, make_user
+from admin_panel.catalogue import record_catalogue_change
+from admin_panel.models import Course
+from students.cache import bump_user_version
+from .routers import REPLICA, is_pinned, read_from_replica
+
+
+class ReplicaRouterTests(TransactionTestCase):
+    """
+    Runs against a second SQLite file as the replica, which replication never
+    reaches: a row is visible there only if it was written there directly.
+    """
+    @classmethod
+    def setUpClass(cls):
+        # settings.DATABASES is the dict connections reads, so this adds the
+        # alias for both the router and the ORM. The runner only sets up the
+        # databases tests declare up front, hence not a class attribute.
+        cls.databases = {'default', REPLICA}
+        name = str(Path(cls.enterClassContext(tempfile.TemporaryDirectory())) / 'replica.sqlite3')
+        connections.settings[REPLICA] = {**connections['default'].settings_dict, 'NAME': name}
+        cls.addClassCleanup(cls.remove_replica)
+        call_command('migrate', database=REPLICA, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        Course.objects.create(code='PRI101', title='On the primary')
+        Course.objects.using(REPLICA).create(code='REP101', title='On the replica')
+        cache.clear()  # drop the catalogue pin those writes left
+
+    def codes(self):
+        return sorted(Course.objects.values_list('code', flat=True))
+
+    def available(self, student):
+        log_in(self.client, student)
+        response = self.client.get(reverse('available-courses'))
+        self.assertEqual(response.status_code, 200)
+        return [row['code'] for row in response.data]
+
+    def test_reads_use_the_replica_only_when_asked(self):
+        self.assertEqual(self.codes(), ['PRI101'])
+        with read_from_replica():
+            self.assertEqual(self.codes(), ['REP101'])
+        self.assertEqual(self.codes(), ['PRI101'])
+
+    def test_writes_always_go_to_the_primary(self):
+        with read_from_replica():
+            Course.objects.create(code='NEW101', title='Written while reading the replica')
+        self.assertEqual(self.codes(), ['NEW101', 'PRI101'])
+        self.assertFalse(Course.objects.using(REPLICA).filter(code='NEW101').exists())
+
+    def test_views_read_the_replica_until_a_write_pins_them(self):
+        student = make_user('replica-reader@ttu.edu.gh')
+        self.assertEqual(self.available(student), ['REP101'])
+
+        # A catalogue change keeps catalogue readers on the primary for a while.
+        record_catalogue_change()
+        self.assertTrue(is_pinned('catalogue'))
+        self.assertEqual(self.available(student), ['PRI101'])
+
+    def test_pins_are_scoped(self):
+        bump_user_version(1)
+        self.assertTrue(is_pinned('catalogue', 'user:1'))
+        self.assertFalse(is_pinned('catalogue', 'user:2'))
+        # Unrelated pins leave the catalogue on the replica.
+        self.assertEqual(self.available(make_user('unpinned@ttu.edu.gh')), ['REP101'])
@@ -1,10 +1,15 @@
 from django.contrib import admin
 from django.urls import path, include
+from .instrumentation import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/accounts/', include('accounts.urls')),
     path('api/admin_panel/', include('admin_panel.urls')),
     path('api/students/', include('students.urls')),
+    path('api/announcements/', include('announcements.urls')),
+    path('api/clubs/', include('clubs.urls')),
+    path('api/resources/', include('resources.urls')),
+    path('metrics/', metrics_view, name='metrics'),
 
 ]
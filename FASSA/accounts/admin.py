@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django import forms
-from .models import User
+from .models import OutboundEmail, User
 
 
 class UserCreationForm(forms.ModelForm):
@@ -66,3 +66,12 @@ class UserAdmin(BaseUserAdmin):
 
     search_fields = ('email', 'full_name')
     ordering = ('email',)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('created_at', 'sent_at')
+    exclude = ('body',)  # may hold a temporary password until sent
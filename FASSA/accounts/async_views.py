@@ -0,0 +1,90 @@
+"""
+Async variants of the I/O-bound account endpoints, for deployments served by
+an ASGI server (see ACCOUNTS_ASYNC_VIEWS), so a worker keeps serving other
+connections while they wait on the database. Authentication, permissions,
+throttling, validation and the serializers' save() are the same code as the
+sync views, awaited in a worker thread.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import mailqueue
+from .permissions import CanCreateAccount
+from .serializers import PasswordResetRequestSerializer, StudentRegistrationSerializer, SuperAdminUserSerializer
+from .throttling import EmailTokenBucketThrottle, IPTokenBucketThrottle
+from .tokens import make_password_reset_token
+from .utils import password_reset_email_message
+
+User = get_user_model()
+
+
+class AsyncAPIView(APIView):
+    """APIView whose handlers are coroutines."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+    async def validated(self, serializer_class, data, **context):
+        serializer = serializer_class(data=data, context={'request': self.request, 'view': self, **context})
+        # Unique validators query the database.
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        return serializer
+
+    async def created(self, serializer_class, data):
+        serializer = await self.validated(serializer_class, data)
+        await sync_to_async(serializer.save)()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class AsyncStudentRegisterView(AsyncAPIView):
+    permission_classes = [AllowAny]
+
+    async def post(self, request):
+        return await self.created(StudentRegistrationSerializer, request.data)
+
+
+class AsyncPasswordResetRequestView(AsyncAPIView):
+    permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'password_reset'
+
+    async def post(self, request):
+        serializer = await self.validated(PasswordResetRequestSerializer, request.data)
+
+        user = await User.objects.filter(email=serializer.validated_data['email']).afirst()
+        if user is not None:
+            await mailqueue.aenqueue([password_reset_email_message(user.email, make_password_reset_token(user))])
+
+        return Response({"detail": "If this email exists, a reset link will be sent."}, status=status.HTTP_200_OK)
+
+
+class AsyncSuperAdminUserCreateView(AsyncAPIView):
+    """POST half of SuperAdminUserView; listing stays on the sync view."""
+    permission_classes = [IsAuthenticated, CanCreateAccount]
+
+    async def post(self, request):
+        return await self.created(SuperAdminUserSerializer, request.data)
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import is_revoked, issued_at_ms
+
+
+class ClaimsTokenUser(TokenUser):
+    """TokenUser exposing the claims added by ClaimsRefreshToken."""
+
+    @cached_property
+    def role(self):
+        return self.token.get('role')
+
+    @cached_property
+    def is_verified(self):
+        return self.token.get('is_verified', False)
+
+    @property
+    def is_active(self):
+        return self.token.get('is_active', False)
+
+
+class StatelessReadJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication with a no-database fast path.
+
+    Safe requests to views that set `stateless_auth = True` get a ClaimsTokenUser
+    built from the token instead of a User row; such views must only use
+    request.user.id / .role. Everything else loads the user as before. Tokens
+    issued before a revocation (accounts.tokens.revoke_user_tokens) are rejected
+    on both paths.
+
+    Revocations are cache entries, so the claims are only trusted with
+    SHARED_CACHE: with a per-process cache, a revocation made by another
+    process would go unseen, and every request loads the user.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.validate(raw_token)
+
+        view = (getattr(request, 'parser_context', None) or {}).get('view')
+        if (
+            request.method in SAFE_METHODS
+            and settings.SHARED_CACHE
+            and getattr(view, 'stateless_auth', False)
+            and 'role' in validated_token
+        ):
+            user = ClaimsTokenUser(validated_token)
+            if not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"), code='user_inactive')
+            return user, validated_token
+
+        return self.get_user(validated_token), validated_token
+
+    def validate(self, raw_token):
+        validated_token = self.get_validated_token(raw_token)
+        if is_revoked(validated_token.get(api_settings.USER_ID_CLAIM), issued_at_ms(validated_token)):
+            raise AuthenticationFailed(_("Token has been revoked."), code='token_revoked')
+        return validated_token
+
+    def token_user(self, raw_token):
+        """
+        The user of a raw token, for non-DRF endpoints: a ClaimsTokenUser without
+        touching the database under SHARED_CACHE, otherwise the User row.
+        """
+        validated_token = self.validate(raw_token)
+        if not settings.SHARED_CACHE or 'role' not in validated_token:
+            return self.get_user(validated_token)
+        user = ClaimsTokenUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code='user_inactive')
+        return user
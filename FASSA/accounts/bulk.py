@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from admin_panel.analytics import students_added
+from . import mailqueue
+from .serializers import BulkUserRowSerializer
+from .utils import account_email_message, generate_temporary_password
+
+User = get_user_model()
+
+
+def read_rows(fileobj, fmt='csv'):
+    """Read import rows from an uploaded/opened file (bytes or text)."""
+    content = fileobj.read()
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if fmt == 'json':
+        data = json.loads(content)
+        return data.get('users', []) if isinstance(data, dict) else data
+    reader = csv.DictReader(io.StringIO(content))
+    return [{key.strip(): (value or '').strip() for key, value in row.items() if key} for row in reader]
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash passwords on a thread pool. hashlib's PBKDF2 releases the GIL,
+    so this scales with CPU cores without forking Django into subprocesses.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(make_password, passwords))
+
+
+class BulkUserImporter:
+    """
+    Validate, deduplicate and insert many accounts at once.
+    Returns a per-row report: {"row", "email", "status", "errors"?}.
+    """
+
+    def __init__(self, allowed_roles=('STUDENT', 'ADMIN'), batch_size=500, send_emails=True):
+        self.allowed_roles = allowed_roles
+        self.batch_size = batch_size
+        self.send_emails = send_emails
+
+    def run(self, rows):
+        report = {}
+        pending = self.validate(rows, report)
+        pending = self.drop_duplicates(pending, report)
+
+        passwords = [generate_temporary_password() for _ in pending]
+        hashes = hash_passwords(passwords)
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = [
+                (row, data, password, hashed)
+                for (row, data), password, hashed in zip(
+                    pending[start:start + self.batch_size],
+                    passwords[start:start + self.batch_size],
+                    hashes[start:start + self.batch_size],
+                )
+            ]
+            self.insert_batch(batch, report)
+
+        return [report[row] for row in sorted(report)]
+
+    def validate(self, rows, report):
+        pending = []
+        for row_number, row in enumerate(rows, start=1):
+            serializer = BulkUserRowSerializer(data=row)
+            if not serializer.is_valid():
+                report[row_number] = self.error(row_number, row.get('email'), serializer.errors)
+                continue
+            data = dict(serializer.validated_data)
+            data['email'] = User.objects.normalize_email(data['email'])
+            data['index_number'] = data.get('index_number') or None
+            data['position'] = data.get('position') or None
+            if data['role'] not in self.allowed_roles:
+                report[row_number] = self.error(
+                    row_number, data['email'], {"role": f"You cannot create {data['role']} accounts."}
+                )
+                continue
+            pending.append((row_number, data))
+        return pending
+
+    def drop_duplicates(self, pending, report):
+        emails = {data['email'] for _, data in pending}
+        index_numbers = {data['index_number'] for _, data in pending if data['index_number']}
+        taken = User.objects.filter(Q(email__in=emails) | Q(index_number__in=index_numbers))
+        taken_emails, taken_indexes = set(), set()
+        for email, index_number in taken.values_list('email', 'index_number'):
+            taken_emails.add(email)
+            taken_indexes.add(index_number)
+
+        unique = []
+        for row_number, data in pending:
+            errors = {}
+            if data['email'] in taken_emails:
+                errors['email'] = "A user with this email already exists."
+            if data['index_number'] and data['index_number'] in taken_indexes:
+                errors['index_number'] = "A user with this index number already exists."
+            if errors:
+                report[row_number] = self.error(row_number, data['email'], errors)
+                continue
+            # Later rows in the same file count as duplicates of earlier ones.
+            taken_emails.add(data['email'])
+            if data['index_number']:
+                taken_indexes.add(data['index_number'])
+            unique.append((row_number, data))
+        return unique
+
+    def build_user(self, data, hashed):
+        return User(
+            email=data['email'],
+            full_name=data['full_name'],
+            role=data['role'],
+            index_number=data['index_number'],
+            position=data['position'],
+            password=hashed,
+        )
+
+    def insert_batch(self, batch, report):
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create(
+                    [self.build_user(data, hashed) for _, data, _, hashed in batch]
+                )
+                # bulk_create skips post_save, so update the dashboard counters here.
+                students_added(users)
+                created = batch
+        except IntegrityError:
+            # Someone created a clashing account since drop_duplicates ran;
+            # fall back to row-by-row so only the offending rows fail.
+            created = []
+            for item in batch:
+                row_number, data, _, hashed = item
+                try:
+                    with transaction.atomic():
+                        self.build_user(data, hashed).save()
+                    created.append(item)
+                except IntegrityError:
+                    report[row_number] = self.error(
+                        row_number, data['email'], {"email": "A user with this email or index number already exists."}
+                    )
+
+        for row_number, data, _, _ in created:
+            report[row_number] = {"row": row_number, "email": data['email'], "status": "created"}
+
+        if self.send_emails:
+            mailqueue.enqueue(
+                account_email_message(data['email'], data['full_name'], data['role'], password)
+                for _, data, password, _ in created
+            )
+
+    @staticmethod
+    def error(row_number, email, errors):
+        return {"row": row_number, "email": email, "status": "error", "errors": errors}
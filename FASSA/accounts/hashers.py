@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor taken from settings.PBKDF2_ITERATIONS.
+    Changing the setting makes must_update() true for older hashes, so Django
+    rehashes each user transparently on their next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PBKDF2_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
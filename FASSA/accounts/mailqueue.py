@@ -0,0 +1,142 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboundEmail
+from .sweeper import in_batches
+
+logger = logging.getLogger(__name__)
+
+# How long a worker owns a claimed batch before another worker may retry it.
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def outbox_rows(messages):
+    return [
+        OutboundEmail(
+            subject=message.subject,
+            body=message.body,
+            from_email=message.from_email,
+            to=list(message.to),
+        )
+        for message in messages
+    ]
+
+
+def enqueue(messages):
+    """Store EmailMessage objects in the outbox. Commits with the caller's transaction."""
+    rows = outbox_rows(messages)
+    if rows:
+        OutboundEmail.objects.bulk_create(rows)
+    return rows
+
+
+async def aenqueue(messages):
+    """enqueue() for async views: a single awaited INSERT, no SMTP."""
+    rows = outbox_rows(messages)
+    if rows:
+        await OutboundEmail.objects.abulk_create(rows)
+    return rows
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'EMAIL_QUEUE_RETRY_BASE_SECONDS', 30)
+    ceiling = getattr(settings, 'EMAIL_QUEUE_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), ceiling))
+
+
+def claim_batch(batch_size):
+    """
+    Lease up to `batch_size` due messages by pushing their next_attempt_at
+    forward, so concurrent workers never pick the same rows.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = OutboundEmail.objects.filter(status='PENDING', next_attempt_at__lte=now).order_by('next_attempt_at', 'id')
+        if db_connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size])
+        if batch:
+            OutboundEmail.objects.filter(id__in=[row.id for row in batch]).update(
+                next_attempt_at=now + CLAIM_LEASE, attempts=F('attempts') + 1
+            )
+    for row in batch:
+        row.attempts += 1
+        row.next_attempt_at = now + CLAIM_LEASE
+    return batch
+
+
+def deliver(batch, connection):
+    """
+    Send a claimed batch over one open connection. Returns (sent, failed) counts.
+    Each row is marked as soon as its send returns, so a worker dying mid-batch
+    leaves only unsent rows to be reclaimed. Bodies can carry temporary
+    passwords, so they are blanked as soon as a message is sent or has failed
+    for good.
+    """
+    max_attempts = getattr(settings, 'EMAIL_QUEUE_MAX_ATTEMPTS', 5)
+    sent = failed = 0
+
+    for row in batch:
+        if timezone.now() >= row.next_attempt_at:
+            # The lease ran out; another worker may have claimed the rest.
+            break
+        message = EmailMessage(row.subject, row.body, row.from_email, row.to, connection=connection)
+        try:
+            message.send(fail_silently=False)
+        except Exception as exc:
+            failed += 1
+            logger.warning("Email %s to %s failed (attempt %s): %s", row.id, row.to, row.attempts, exc)
+            changes = {
+                'status': 'PENDING',
+                'next_attempt_at': timezone.now() + retry_delay(row.attempts),
+                'last_error': str(exc)[:1000],
+            }
+            if row.attempts >= max_attempts:
+                changes.update(status='FAILED', body='')
+            OutboundEmail.objects.filter(id=row.id).update(**changes)
+            # The connection may be broken; drop it so the next send reconnects.
+            try:
+                connection.close()
+            except Exception:
+                pass
+        else:
+            sent += 1
+            OutboundEmail.objects.filter(id=row.id).update(
+                status='SENT', sent_at=timezone.now(), last_error='', body=''
+            )
+    return sent, failed
+
+
+def send_pending(batch_size=100, backend=None):
+    """Drain every due message, reusing a single connection across batches."""
+    connection = get_connection(backend)
+    sent = failed = 0
+    try:
+        while True:
+            batch = claim_batch(batch_size)
+            if not batch:
+                break
+            batch_sent, batch_failed = deliver(batch, connection)
+            sent += batch_sent
+            failed += batch_failed
+            if batch_sent + batch_failed < len(batch):
+                break  # the lease ran out mid-batch; leave the rest to the next run
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return sent, failed
+
+
+def purge_sent(days=None, batch_size=1000, pause=0.0):
+    """Delete SENT rows older than EMAIL_QUEUE_RETENTION_DAYS."""
+    days = settings.EMAIL_QUEUE_RETENTION_DAYS if days is None else days
+    old = OutboundEmail.objects.filter(status='SENT', sent_at__lt=timezone.now() - timedelta(days=days))
+    return in_batches(old, lambda batch: batch.delete()[0], batch_size, pause)
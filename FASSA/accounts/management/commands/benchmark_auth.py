@@ -0,0 +1,53 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.authentication import StatelessReadJWTAuthentication
+from accounts.tokens import ClaimsRefreshToken
+from students.views import AvailableCoursesView
+
+User = get_user_model()
+
+BENCH_EMAIL = 'zzbench-auth@ttu.edu.gh'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/second on AvailableCoursesView with the DB-backed JWT user lookup "
+        "and with the stateless token-user path. Requests revalidate with If-None-Match, "
+        "so the only database work left is authentication."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(
+            email=BENCH_EMAIL,
+            defaults={'full_name': 'Auth Benchmark', 'role': 'STUDENT', 'is_active': True, 'is_verified': True},
+        )
+        token = str(ClaimsRefreshToken.for_user(user).access_token)
+        factory = APIRequestFactory()
+
+        for label, auth_class in [('db lookup', JWTAuthentication), ('stateless', StatelessReadJWTAuthentication)]:
+            view = AvailableCoursesView.as_view(authentication_classes=[auth_class])
+            etag = view(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))['ETag']
+
+            count = options['requests']
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for _ in range(count):
+                    response = view(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_IF_NONE_MATCH=etag))
+                elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{label:<10} {count / elapsed:8.0f} req/s   "
+                f"{len(queries) / count:.2f} queries/request   (status {response.status_code})"
+            )
+
+        user.delete()
@@ -0,0 +1,51 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+PASSWORD = 'correct-horse-battery-staple'
+
+
+def verify_for(encoded, seconds):
+    """Verify `encoded` repeatedly for `seconds`; return the number of checks."""
+    deadline = time.perf_counter() + seconds
+    checks = 0
+    while time.perf_counter() < deadline:
+        check_password(PASSWORD, encoded)
+        checks += 1
+    return checks
+
+
+class Command(BaseCommand):
+    help = "Measure password verifications (i.e. logins) per second per core for each configured hasher."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=3.0, help="Measuring time per hasher.")
+        parser.add_argument('--processes', type=int, default=1,
+                            help="Also measure aggregate throughput across this many processes.")
+
+    def handle(self, *args, **options):
+        seconds = options['seconds']
+        self.stdout.write(f"Preferred hasher: {settings.PASSWORD_HASHERS[0]}")
+
+        for name, path in settings.PASSWORD_HASHER_CHOICES.items():
+            hasher = import_string(path)()
+            try:
+                encoded = make_password(PASSWORD, hasher=hasher)
+            except (ImportError, ValueError) as exc:
+                self.stdout.write(f"{name:<8} unavailable ({exc})")
+                continue
+
+            per_core = verify_for(encoded, seconds) / seconds
+            line = f"{name:<8} {per_core:8.1f} logins/s/core"
+
+            processes = options['processes']
+            if processes > 1:
+                with ProcessPoolExecutor(max_workers=processes) as pool:
+                    total = sum(pool.map(verify_for, [encoded] * processes, [seconds] * processes))
+                line += f"   {total / seconds:8.1f} logins/s on {processes} processes (of {os.cpu_count()} cores)"
+            self.stdout.write(line)
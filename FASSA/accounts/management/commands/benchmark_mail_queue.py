@@ -0,0 +1,42 @@
+import time
+
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand
+
+from accounts.mailqueue import enqueue, send_pending
+from accounts.models import OutboundEmail
+
+BACKENDS = {
+    'locmem': 'django.core.mail.backends.locmem.EmailBackend',
+    'file': 'django.core.mail.backends.filebased.EmailBackend',
+    'console': 'django.core.mail.backends.console.EmailBackend',
+}
+
+
+class Command(BaseCommand):
+    help = "Measure outbox enqueue and drain throughput against an offline mail backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--backend', choices=sorted(BACKENDS), default='locmem',
+                            help="'file' writes to EMAIL_FILE_PATH.")
+
+    def handle(self, *args, **options):
+        count = options['messages']
+        messages = [
+            EmailMessage(f"Benchmark {i}", "Queued mail throughput test.", "FASSA <bench@localhost>", [f"user{i}@example.com"])
+            for i in range(count)
+        ]
+
+        start = time.perf_counter()
+        rows = enqueue(messages)
+        enqueued = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sent, failed = send_pending(batch_size=options['batch_size'], backend=BACKENDS[options['backend']])
+        drained = time.perf_counter() - start
+
+        OutboundEmail.objects.filter(id__in=[row.id for row in rows]).delete()
+        self.stdout.write(f"Enqueued {count} in {enqueued:.3f}s ({count / enqueued:.0f} msg/s)")
+        self.stdout.write(f"Delivered {sent} (failed {failed}) in {drained:.3f}s ({sent / drained:.0f} msg/s)")
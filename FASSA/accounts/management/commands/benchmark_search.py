@@ -0,0 +1,110 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.views import StudentListView
+from admin_panel.analytics import students_added
+from admin_panel.models import Course
+from students.sync import log_changes
+from students.views import AvailableCoursesView
+
+User = get_user_model()
+
+FIRST_NAMES = ['Kwame', 'Ama', 'Kofi', 'Akosua', 'Yaw', 'Abena', 'Kojo', 'Efua', 'Kwesi', 'Adwoa', 'Nana', 'Esi']
+LAST_NAMES = ['Mensah', 'Owusu', 'Boateng', 'Asante', 'Osei', 'Agyeman', 'Danso', 'Addo', 'Appiah', 'Quaye']
+WORDS = ['Introduction', 'Advanced', 'Systems', 'Networks', 'Databases', 'Programming', 'Design', 'Analysis',
+         'Security', 'Statistics', 'Accounting', 'Economics', 'Communication', 'Graphics', 'Algorithms']
+
+BENCH_EMAIL_PREFIX = 'zzbench'
+BENCH_CODE_PREFIX = 'ZZB'
+
+
+class Command(BaseCommand):
+    help = "Seed synthetic students/courses and time StudentListView/AvailableCoursesView search queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument('--courses', type=int, default=5_000)
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument('--skip-seed', action='store_true')
+        parser.add_argument('--cleanup', action='store_true', help="Delete the synthetic rows afterwards.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        if not options['skip_seed']:
+            self.seed(rng, options['users'], options['courses'])
+
+        self.stdout.write(f"Database vendor: {connection.vendor}")
+        factory = APIRequestFactory()
+        cases = [
+            (StudentListView, 'kwame mensah'),
+            (StudentListView, 'ZZB0012'),
+            (StudentListView, f'{BENCH_EMAIL_PREFIX}4242'),
+            (AvailableCoursesView, 'advanced networks'),
+            (AvailableCoursesView, 'ZZB00'),
+        ]
+        for view_class, term in cases:
+            timings = self.time_search(factory, view_class, term, options['runs'])
+            self.stdout.write(
+                f"{view_class.__name__:<22} {term!r:<22} "
+                f"median {statistics.median(timings) * 1000:7.2f} ms   "
+                f"max {max(timings) * 1000:7.2f} ms"
+            )
+
+        if options['cleanup']:
+            User.objects.filter(email__startswith=BENCH_EMAIL_PREFIX).delete()
+            Course.objects.filter(code__startswith=BENCH_CODE_PREFIX).delete()
+
+    def seed(self, rng, users, courses):
+        password = make_password('benchmark-password')
+        existing = User.objects.filter(email__startswith=BENCH_EMAIL_PREFIX).count()
+        created = User.objects.bulk_create(
+            (
+                User(
+                    email=f'{BENCH_EMAIL_PREFIX}{i}@ttu.edu.gh',
+                    full_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    index_number=f'ZZB{i:07d}',
+                    role='STUDENT',
+                    password=password,
+                )
+                for i in range(existing, users)
+            ),
+            batch_size=5000,
+        )
+        students_added(created)
+        existing = Course.objects.filter(code__startswith=BENCH_CODE_PREFIX).count()
+        new_courses = Course.objects.bulk_create(
+            (
+                Course(
+                    code=f'{BENCH_CODE_PREFIX}{i:05d}',
+                    title=' '.join(rng.sample(WORDS, 3)),
+                    lecturer=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                )
+                for i in range(existing, courses)
+            ),
+            batch_size=5000,
+        )
+        log_changes('course', new_courses)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('ANALYZE accounts_user')
+                cursor.execute('ANALYZE admin_panel_course')
+
+    def time_search(self, factory, view_class, term, runs):
+        view = view_class()
+        timings = []
+        for _ in range(runs):
+            request = Request(factory.get('/', {'search': term}))
+            view.request = request
+            start = time.perf_counter()
+            queryset = view.filter_queryset(view.get_queryset())
+            list(queryset[:50])
+            timings.append(time.perf_counter() - start)
+        return timings
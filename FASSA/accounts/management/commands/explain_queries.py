@@ -0,0 +1,165 @@
+import datetime
+import random
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import PasswordReset
+from admin_panel import analytics
+from admin_panel.catalogue import record_catalogue_change
+from admin_panel.models import Course, Timetable
+from students.models import CourseRegistration
+from students.sync import log_changes
+
+User = get_user_model()
+
+EXPLAIN_EMAIL_PREFIX = 'zzexplain'
+EXPLAIN_CODE_PREFIX = 'ZZE'
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+# The indexes added for these access patterns; --compare drops them inside a
+# rolled-back transaction to show the plans without them.
+TUNED_INDEXES = {
+    User: ['user_student_joined_idx', 'user_role_idx', 'user_verification_token_idx'],
+    PasswordReset: ['passwordreset_expires_idx'],
+    Timetable: ['timetable_course_slot_idx', 'timetable_slot_idx'],
+    CourseRegistration: ['registration_date_idx'],
+}
+
+
+class Command(BaseCommand):
+    help = "Seed realistic data and print EXPLAIN (ANALYZE on PostgreSQL) plans for the hot queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=50_000)
+        parser.add_argument('--courses', type=int, default=800)
+        parser.add_argument('--registrations', type=int, default=6, help="Courses per student.")
+        parser.add_argument('--skip-seed', action='store_true')
+        parser.add_argument('--compare', action='store_true', help="Also show the plans without the tuned indexes.")
+        parser.add_argument('--cleanup', action='store_true', help="Delete the synthetic rows afterwards.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        if not options['skip_seed']:
+            self.seed(rng, options['students'], options['courses'], options['registrations'])
+        self.stdout.write(f"Database vendor: {connection.vendor}")
+
+        if options['compare']:
+            with transaction.atomic():
+                with connection.schema_editor(atomic=False) as schema_editor:
+                    for model, names in TUNED_INDEXES.items():
+                        for index in model._meta.indexes:
+                            if index.name in names:
+                                schema_editor.remove_index(model, index)
+                self.explain_all("WITHOUT tuned indexes")
+                transaction.set_rollback(True)
+        self.explain_all("WITH tuned indexes")
+
+        if options['cleanup']:
+            User.objects.filter(email__startswith=EXPLAIN_EMAIL_PREFIX).delete()
+            Course.objects.filter(code__startswith=EXPLAIN_CODE_PREFIX).delete()
+
+    def queries(self):
+        sample = User.objects.filter(email__startswith=EXPLAIN_EMAIL_PREFIX).order_by('?').first()
+        token = uuid.uuid4()  # only legacy accounts still store one; the plan is what matters
+        course_ids = list(
+            CourseRegistration.objects.filter(student=sample).values_list('course_id', flat=True)
+        ) if sample else []
+        now = timezone.now()
+        return [
+            ("Student list page", User.objects.filter(role='STUDENT').order_by('-date_joined', '-id')[:50]),
+            ("Admin list", User.objects.filter(role='ADMIN')),
+            ("Verify account", User.objects.filter(verification_token=token)),
+            ("Expired password resets", PasswordReset.objects.filter(expires_at__lt=now).values('id')[:1000]),
+            ("Personal timetable",
+             Timetable.objects.filter(course_id__in=course_ids).order_by('day_of_week', 'start_time')),
+            ("Timetable list", Timetable.objects.order_by('day_of_week', 'start_time')[:100]),
+            ("Registrations this week",
+             CourseRegistration.objects.filter(date_registered__gte=now - datetime.timedelta(days=7)).values('id')),
+        ]
+
+    def explain_all(self, heading):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n=== {heading} ==="))
+        analyze = connection.vendor == 'postgresql'
+        for label, queryset in self.queries():
+            plan = queryset.explain(analyze=True) if analyze else queryset.explain()
+            self.stdout.write(self.style.SUCCESS(f"\n-- {label}"))
+            self.stdout.write(plan)
+
+    def seed(self, rng, students, courses, per_student):
+        password = make_password('explain-password')
+        existing = User.objects.filter(email__startswith=EXPLAIN_EMAIL_PREFIX).count()
+        joined = timezone.now() - datetime.timedelta(days=4 * 365)
+        created = User.objects.bulk_create(
+            (
+                User(
+                    email=f'{EXPLAIN_EMAIL_PREFIX}{i}@ttu.edu.gh',
+                    full_name=f'Explain Student {i}',
+                    index_number=f'{EXPLAIN_CODE_PREFIX}{i:07d}',
+                    role='STUDENT' if i % 200 else 'ADMIN',
+                    is_verified=rng.random() < 0.8,
+                    password=password,
+                )
+                for i in range(existing, students)
+            ),
+            batch_size=5000,
+        )
+        # date_joined is auto_now_add, so spread it out afterwards.
+        for user in created:
+            user.date_joined = joined + datetime.timedelta(minutes=rng.randrange(4 * 365 * 24 * 60))
+        User.objects.bulk_update(created, ['date_joined'], batch_size=5000)
+
+        existing = Course.objects.filter(code__startswith=EXPLAIN_CODE_PREFIX).count()
+        new_courses = Course.objects.bulk_create(
+            (Course(code=f'{EXPLAIN_CODE_PREFIX}{i:05d}', title=f'Explain course {i}', level=str(100 * (1 + i % 4)))
+             for i in range(existing, courses)),
+            batch_size=5000,
+        )
+        entries = Timetable.objects.bulk_create(
+            (
+                Timetable(
+                    course=course,
+                    day_of_week=DAYS[(course.pk + slot) % len(DAYS)],
+                    start_time=datetime.time(7 + (course.pk + slot) % 11),
+                    end_time=datetime.time(8 + (course.pk + slot) % 11),
+                    venue=f'Hall {course.pk % 40}',
+                )
+                for course in new_courses for slot in range(2)
+            ),
+            batch_size=5000,
+        )
+        record_catalogue_change()
+        log_changes('course', new_courses)
+        log_changes('timetable', entries)
+
+        course_ids = list(Course.objects.filter(code__startswith=EXPLAIN_CODE_PREFIX).values_list('id', flat=True))
+        # ignore_conflicts leaves the new rows without ids; find them for the sync log afterwards.
+        last_id = CourseRegistration.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        CourseRegistration.objects.bulk_create(
+            (
+                CourseRegistration(student=user, course_id=course_id)
+                for user in created if user.role == 'STUDENT'
+                for course_id in rng.sample(course_ids, min(per_student, len(course_ids)))
+            ),
+            batch_size=5000,
+            ignore_conflicts=True,
+        )
+        log_changes('registration', CourseRegistration.objects.filter(id__gt=last_id).only('id', 'student_id'))
+        PasswordReset.objects.bulk_create(
+            (
+                PasswordReset(user=user, expires_at=joined + datetime.timedelta(days=rng.randrange(4 * 365 + 30)))
+                for user in rng.sample(created, len(created) // 10)
+            ),
+            batch_size=5000,
+        )
+        # Bulk inserts skip the signals that maintain seats_taken and the summary tables.
+        analytics.rebuild()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                for table in ('accounts_user', 'accounts_passwordreset', 'admin_panel_course',
+                              'admin_panel_timetable', 'students_courseregistration'):
+                    cursor.execute(f'ANALYZE {table}')
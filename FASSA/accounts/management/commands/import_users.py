@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.bulk import BulkUserImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk-create student/admin accounts from a CSV or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV with full_name,email,role,index_number,position columns, or a JSON list.")
+        parser.add_argument('--format', choices=['csv', 'json'], help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--no-email', action='store_true', help="Do not queue credential emails.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('json' if path.lower().endswith('.json') else 'csv')
+        try:
+            with open(path, 'rb') as fileobj:
+                rows = read_rows(fileobj, fmt)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {path}: {exc}")
+
+        importer = BulkUserImporter(batch_size=options['batch_size'], send_emails=not options['no_email'])
+        results = importer.run(rows)
+
+        created = 0
+        for result in results:
+            if result['status'] == 'created':
+                created += 1
+            else:
+                self.stderr.write(f"Row {result['row']} ({result['email']}): {result['errors']}")
+        self.stdout.write(self.style.SUCCESS(f"Created {created} of {len(results)} account(s)."))
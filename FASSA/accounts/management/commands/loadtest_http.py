@@ -0,0 +1,105 @@
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+from itertools import count
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(ordered, q):
+    """q-th quantile of an ascending list of seconds, in milliseconds."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Open many concurrent HTTP connections against a running server and report throughput, "
+        "latency and failures per concurrency level. Run it once against a WSGI server "
+        "(gunicorn FASSA.wsgi) and once against an ASGI server (uvicorn FASSA.asgi with "
+        "ACCOUNTS_ASYNC_VIEWS=True) on the same machine to compare capacity. "
+        "Raise the password_reset throttle rates first, or 429s will dominate."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="e.g. http://127.0.0.1:8000/api/accounts/password-reset/")
+        parser.add_argument('--method', default='POST')
+        parser.add_argument('--body', default='{"email": "loadtest{n}@ttu.edu.gh"}',
+                            help="JSON body; {n} is replaced with a per-request counter.")
+        parser.add_argument('--header', action='append', default=[], help="Extra 'Name: value' header.")
+        parser.add_argument('--concurrency', default='10,50,200,800', help="Comma-separated connection counts.")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per concurrency level.")
+        parser.add_argument('--timeout', type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http':
+            raise CommandError("Only plain http:// URLs are supported.")
+        self.target = (url.hostname, url.port or 80, (url.path or '/') + (f'?{url.query}' if url.query else ''))
+        self.options = options
+        self.counter = count()
+
+        self.stdout.write(f"{'conns':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+        for concurrency in (int(value) for value in options['concurrency'].split(',')):
+            latencies, statuses, elapsed = asyncio.run(self.run_level(concurrency))
+            latencies.sort()
+            self.stdout.write(
+                f"{concurrency:>6} {len(latencies) / elapsed:>8.1f} {percentile(latencies, 0.5):>8.1f} "
+                f"{percentile(latencies, 0.95):>8.1f} {percentile(latencies, 0.99):>8.1f}  "
+                f"{dict(sorted(statuses.items(), key=str))}"
+            )
+            if latencies:
+                self.stdout.write(f"{'':>6} mean {statistics.mean(latencies) * 1000:.1f} ms over {len(latencies)} requests")
+
+    def build_request(self):
+        host, port, path = self.target
+        body = self.options['body'].replace('{n}', str(next(self.counter))).encode()
+        if body:
+            json.loads(body)  # fail fast on a malformed --body
+        headers = [
+            f"{self.options['method']} {path} HTTP/1.1",
+            f"Host: {host}:{port}",
+            "Connection: close",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            *self.options['header'],
+        ]
+        return ("\r\n".join(headers) + "\r\n\r\n").encode() + body
+
+    async def request_once(self):
+        host, port, _ = self.target
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(self.build_request())
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+        return int(response.split(b' ', 2)[1]) if response.startswith(b'HTTP/') else 'bad response'
+
+    async def run_level(self, concurrency):
+        latencies, statuses = [], Counter()
+        deadline = time.perf_counter() + self.options['duration']
+
+        async def connection_loop():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    status = await asyncio.wait_for(self.request_once(), self.options['timeout'])
+                except asyncio.TimeoutError:
+                    statuses['timeout'] += 1
+                    continue
+                except OSError as exc:
+                    statuses[type(exc).__name__] += 1
+                    await asyncio.sleep(0.05)
+                    continue
+                latencies.append(time.perf_counter() - start)
+                statuses[status] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(connection_loop() for _ in range(concurrency)))
+        return latencies, statuses, time.perf_counter() - start
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.sweeper import clear_verification_tokens, purge_password_resets
+
+
+class Command(BaseCommand):
+    help = "Delete expired password reset rows and stale verification tokens in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.05, help="Seconds to sleep between batches.")
+        parser.add_argument('--loop', action='store_true', help="Keep sweeping instead of exiting after one pass.")
+        parser.add_argument('--interval', type=float, default=600.0, help="Seconds between passes with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            resets = purge_password_resets(options['batch_size'], options['pause'])
+            tokens = clear_verification_tokens(options['batch_size'], options['pause'])
+            if resets or tokens:
+                self.stdout.write(f"Deleted {resets} expired password resets, cleared {tokens} verification tokens.")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.mailqueue import purge_sent, send_pending
+
+# With --loop, delete old SENT rows at most this often (seconds).
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbound emails in batches over a single mail connection, then purge old sent rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--backend', help="Override EMAIL_BACKEND, e.g. django.core.mail.backends.locmem.EmailBackend.")
+        parser.add_argument('--loop', action='store_true', help="Keep polling the outbox instead of exiting when it is empty.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to sleep between polls with --loop.")
+        parser.add_argument('--keep-days', type=int, help="Keep SENT rows this many days (default EMAIL_QUEUE_RETENTION_DAYS).")
+
+    def handle(self, *args, **options):
+        purged_at = None
+        while True:
+            sent, failed = send_pending(batch_size=options['batch_size'], backend=options['backend'])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}.")
+            if purged_at is None or time.monotonic() - purged_at >= PURGE_INTERVAL:
+                purged = purge_sent(options['keep_days'])
+                purged_at = time.monotonic()
+                if purged:
+                    self.stdout.write(f"Purged {purged} sent emails.")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-17 10:02
+
+from django.db import migrations
+
+# PostgreSQL-only expression indexes. They are not declared in User.Meta so
+# that SQLite test databases migrate cleanly; RankedSearchFilter falls back
+# to icontains there.
+
+
+def search_indexes():
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+    from django.contrib.postgres.search import SearchVector
+    from django.db.models import Index
+    from django.db.models.functions import Upper
+
+    return [
+        GinIndex(SearchVector('full_name', 'email', config='simple'), name='user_search_gin'),
+        Index(OpClass(Upper('index_number'), name='text_pattern_ops'), name='user_index_number_prefix'),
+    ]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    User = apps.get_model('accounts', 'User')
+    for index in search_indexes():
+        schema_editor.add_index(User, index)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    User = apps.get_model('accounts', 'User')
+    for index in search_indexes():
+        schema_editor.remove_index(User, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_outboundemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='verification_token',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -65,13 +65,26 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
     is_verified = models.BooleanField(default=False)
-    verification_token = models.UUIDField(default=uuid.uuid4, editable=False)
+    # Legacy: only accounts emailed a UUID link before signed tokens still carry one.
+    verification_token = models.UUIDField(null=True, blank=True, editable=False)
 
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['full_name']
 
+    class Meta:
+        indexes = [
+            # Student list keyset pages: WHERE role='STUDENT' ORDER BY date_joined DESC, id DESC.
+            models.Index(
+                fields=['-date_joined', '-id'],
+                condition=models.Q(role='STUDENT'),
+                name='user_student_joined_idx',
+            ),
+            models.Index(fields=['role'], name='user_role_idx'),
+            models.Index(fields=['verification_token'], name='user_verification_token_idx'),
+        ]
+
     def __str__(self):
         return f"{self.full_name} ({self.role})"
 
@@ -90,6 +103,11 @@ class PasswordReset(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='passwordreset_expires_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.expires_at:
             self.expires_at = timezone.now() + timedelta(hours=1)  # token valid for 1 hour
@@ -99,4 +117,35 @@ class PasswordReset(models.Model):
         return timezone.now() > self.expires_at
 
     def __str__(self):
-        return f"{self.user.email} - {self.token}"
\ No newline at end of file
+        return f"{self.user.email} - {self.token}"
+
+
+class OutboundEmail(models.Model):
+    """
+    Outbox row for a message waiting to be delivered by `manage.py send_queued_mail`.
+    Requests only insert rows here; they never talk to SMTP.
+    """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
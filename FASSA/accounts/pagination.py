@@ -0,0 +1,121 @@
+import base64
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def cached_count(queryset, timeout=60):
+    """
+    Return queryset.count(), cached per SQL statement for `timeout` seconds.
+    Good enough for dashboard totals, which do not need to be exact.
+    """
+    sql, params = queryset.query.sql_with_params()
+    key = 'count:' + hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+    return cache.get_or_set(key, queryset.count, timeout)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on (ordering_field, id), newest first.
+    Every page is a single range scan on the index; no OFFSET is issued.
+    Pagination only kicks in when the client sends `cursor` or `page_size`,
+    so existing clients keep receiving the full list. Pages have a fixed
+    order, so asking for one together with ?search= (ranked) or ?ordering=
+    is a 400 rather than a silently reordered result.
+    """
+    ordering_field = 'date_joined'
+    results_key = 'results'
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor.'
+    ordered_params = (api_settings.SEARCH_PARAM, api_settings.ORDERING_PARAM)
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, row):
+        if isinstance(row, dict):
+            value, pk = row[self.ordering_field], row['id']
+        else:
+            value, pk = getattr(row, self.ordering_field), row.pk
+        raw = f"{value.isoformat()}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            value, pk = raw.rsplit('|', 1)
+            value = parse_datetime(value)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        reordering = [param for param in self.ordered_params if request.query_params.get(param)]
+        if reordering:
+            raise ValidationError({
+                param: f"Cannot be combined with {self.cursor_query_param}/{self.page_size_query_param}; "
+                       f"pages are ordered by {self.ordering_field}."
+                for param in reordering
+            })
+
+        self.request = request
+        self.count = cached_count(queryset)
+
+        field = self.ordering_field
+        queryset = queryset.order_by(f'-{field}', '-id')
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': pk})
+            )
+
+        page_size = self.get_page_size(request)
+        rows = list(queryset[:page_size + 1])
+        self.next_cursor = self.encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "next": self.get_next_link(),
+            self.results_key: data,
+        })
+
+
+class StudentKeysetPagination(KeysetPagination):
+    ordering_field = 'date_joined'
+    results_key = 'students'
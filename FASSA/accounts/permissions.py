@@ -22,3 +22,20 @@ class ReadOnly(BasePermission):
     """Allows read-only access for unauthenticated users (GET, HEAD, OPTIONS)."""
     def has_permission(self, request, view):
         return request.method in SAFE_METHODS
+
+
+class CanCreateAccount(BasePermission):
+    """
+    Superadmins create any account, admins student accounts only. Checked
+    against the requested role before the serializer runs, so nobody else can
+    use its unique-email errors to find out which accounts exist.
+    """
+    def has_permission(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        role = getattr(request.user, 'role', None)
+        if role == 'ADMIN':
+            self.message = "Admins can only create student accounts."
+            return hasattr(request.data, 'get') and request.data.get('role') == 'STUDENT'
+        self.message = "You do not have permission to create accounts."
+        return role == 'SUPERADMIN'
@@ -0,0 +1,52 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Upper
+from rest_framework import filters
+
+TERM_RE = re.compile(r'[\w@.]+')
+
+
+class RankedSearchFilter(filters.SearchFilter):
+    """
+    Ranked full-text search on PostgreSQL, plain SearchFilter everywhere else.
+
+    Views declare `search_vector_fields`, matched word-by-word with prefix
+    tsqueries against the GIN index built in migrations, and optionally
+    `search_prefix_fields`, matched as upper-cased prefixes against a
+    text_pattern_ops index (index numbers are typed from the start). Prefixes
+    are the search terms as typed: "BC/ICT/22" must not become "BC".
+    """
+    search_config = 'simple'
+
+    def get_terms(self, request):
+        terms = []
+        for term in self.get_search_terms(request):
+            terms.extend(TERM_RE.findall(term))
+        return terms
+
+    def filter_queryset(self, request, queryset, view):
+        vector_fields = getattr(view, 'search_vector_fields', None)
+        if not vector_fields or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_terms(request)
+        if not terms:
+            return queryset
+
+        # Imported lazily: these modules need psycopg, which SQLite setups lack.
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector(*vector_fields, config=self.search_config)
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=self.search_config)
+        queryset = queryset.annotate(search_document=vector, search_rank=SearchRank(vector, query))
+        match = Q(search_document=query)
+
+        for field in getattr(view, 'search_prefix_fields', []):
+            alias = f'{field}_upper'
+            queryset = queryset.alias(**{alias: Upper(field)})
+            for term in self.get_search_terms(request):
+                match |= Q(**{f'{alias}__startswith': term.upper()})
+
+        return queryset.filter(match).order_by('-search_rank', 'pk')
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from .tokens import make_verification_token
 from .utils import (
     generate_temporary_password,
     send_account_email,
@@ -47,12 +48,45 @@ class StudentRegistrationSerializer(serializers.ModelSerializer):
         send_student_verification_email(
             user_email=user.email,
             full_name=user.full_name,
-            verification_token=str(user.verification_token),
+            verification_token=make_verification_token(user),
         )
 
         return user
 
 
+def validate_role_fields(attrs):
+    """Role-specific rules shared by single and bulk account creation."""
+    role = attrs.get('role')
+    index_number = attrs.get('index_number')
+    position = attrs.get('position')
+
+    if role == 'STUDENT':
+        if not index_number:
+            raise serializers.ValidationError(
+                {"index_number": "Index number is required for student accounts."}
+            )
+        if not attrs['email'].endswith('@ttu.edu.gh'):
+            raise serializers.ValidationError(
+                {"email": "Students must use a valid TTU email (e.g., bcict22153@ttu.edu.gh)."}
+            )
+        if position:
+            raise serializers.ValidationError(
+                {"position": "Students should not have a position field."}
+            )
+
+    elif role == 'ADMIN':
+        if not position:
+            raise serializers.ValidationError(
+                {"position": "Position is required for admin accounts."}
+            )
+        if index_number:
+            raise serializers.ValidationError(
+                {"index_number": "Admins should not have an index number."}
+            )
+
+    return attrs
+
+
 class SuperAdminUserSerializer(serializers.ModelSerializer):
     index_number = serializers.CharField(required=False, allow_blank=True)
     position = serializers.CharField(required=False, allow_blank=True)
@@ -63,35 +97,7 @@ class SuperAdminUserSerializer(serializers.ModelSerializer):
         fields = ['full_name', 'email', 'role', 'index_number', 'position']
 
     def validate(self, attrs):
-        role = attrs.get('role')
-        index_number = attrs.get('index_number')
-        position = attrs.get('position')
-
-        if role == 'STUDENT':
-            if not index_number:
-                raise serializers.ValidationError(
-                    {"index_number": "Index number is required for student accounts."}
-                )
-            if not attrs['email'].endswith('@ttu.edu.gh'):
-                raise serializers.ValidationError(
-                    {"email": "Students must use a valid TTU email (e.g., bcict22153@ttu.edu.gh)."}
-                )
-            if position:
-                raise serializers.ValidationError(
-                    {"position": "Students should not have a position field."}
-                )
-
-        elif role == 'ADMIN':
-            if not position:
-                raise serializers.ValidationError(
-                    {"position": "Position is required for admin accounts."}
-                )
-            if index_number:
-                raise serializers.ValidationError(
-                    {"index_number": "Admins should not have an index number."}
-                )
-
-        return attrs
+        return validate_role_fields(attrs)
 
     def create(self, validated_data):
         role = validated_data.get('role')
@@ -116,6 +122,21 @@ class SuperAdminUserSerializer(serializers.ModelSerializer):
         return user
 
 
+class BulkUserRowSerializer(serializers.Serializer):
+    """
+    One row of a bulk import. Deliberately not a ModelSerializer: uniqueness
+    is checked for the whole file in a single query by accounts.bulk.
+    """
+    full_name = serializers.CharField(max_length=150)
+    email = serializers.EmailField()
+    role = serializers.ChoiceField(choices=[('STUDENT', 'Student'), ('ADMIN', 'Admin')], default='STUDENT')
+    index_number = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True)
+    position = serializers.CharField(max_length=100, required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, attrs):
+        return validate_role_fields(attrs)
+
+
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
@@ -132,7 +153,7 @@ class PasswordResetRequestSerializer(serializers.Serializer):
 
 
 class PasswordResetConfirmSerializer(serializers.Serializer):
-    token = serializers.UUIDField()
+    token = serializers.CharField(max_length=255)  # signed token, or a legacy PasswordReset UUID
     new_password = serializers.CharField(write_only=True, validators=[validate_password])
     confirm_password = serializers.CharField(write_only=True)
 
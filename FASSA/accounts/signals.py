@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .tokens import revoke_user_tokens
+
+User = get_user_model()
+
+TOKEN_CLAIM_FIELDS = ('role', 'is_active', 'is_verified')
+
+
+def token_claims(user):
+    return tuple(user.__dict__.get(field) for field in TOKEN_CLAIM_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_token_claims(sender, instance, **kwargs):
+    instance._token_claims = token_claims(instance)
+
+
+@receiver(post_save, sender=User)
+def revoke_on_claim_change(sender, instance, created, **kwargs):
+    # On commit, so tokens issued from the old row before then are covered too.
+    if not created and token_claims(instance) != instance._token_claims:
+        user_id = instance.pk
+        transaction.on_commit(lambda: revoke_user_tokens(user_id))
+    instance._token_claims = token_claims(instance)
+
+
+@receiver(post_delete, sender=User)
+def revoke_on_delete(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: revoke_user_tokens(user_id))
@@ -0,0 +1,35 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+STREAM_CHUNK_SIZE = 2000
+
+
+def iter_values(queryset, fields, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield plain dicts straight from the database cursor, no model instances."""
+    return queryset.values(*fields).iterator(chunk_size=chunk_size)
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def json_document(rows, results_key):
+    """
+    Stream `{"<results_key>": [...], "count": n}`.
+    The count is emitted last so it comes for free from the rows streamed.
+    """
+    yield '{"%s": [' % results_key
+    count = 0
+    for row in rows:
+        yield ("," if count else "") + json.dumps(row, cls=DjangoJSONEncoder)
+        count += 1
+    yield '], "count": %d}' % count
+
+
+def streaming_response(rows, fmt, results_key='results'):
+    if fmt == 'ndjson':
+        return StreamingHttpResponse(ndjson_lines(rows), content_type='application/x-ndjson')
+    return StreamingHttpResponse(json_document(rows, results_key), content_type='application/json')
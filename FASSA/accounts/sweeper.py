@@ -0,0 +1,38 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import PasswordReset
+
+User = get_user_model()
+
+
+def in_batches(queryset, apply, batch_size=1000, pause=0.0):
+    """
+    Call apply(queryset.filter(pk__in=ids)) for successive batches of primary keys,
+    each in its own short autocommit statement so no lock is held for long.
+    Returns the number of rows touched.
+    """
+    total = 0
+    while True:
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return total
+        total += apply(queryset.model.objects.filter(pk__in=ids))
+        if len(ids) < batch_size:
+            return total
+        if pause:
+            time.sleep(pause)
+
+
+def purge_password_resets(batch_size=1000, pause=0.0):
+    """Delete expired reset rows left over from the table-backed reset flow."""
+    expired = PasswordReset.objects.filter(expires_at__lt=timezone.now())
+    return in_batches(expired, lambda batch: batch.delete()[0], batch_size, pause)
+
+
+def clear_verification_tokens(batch_size=1000, pause=0.0):
+    """Drop the stored UUID of accounts that no longer need one (already verified)."""
+    stale = User.objects.filter(is_verified=True, verification_token__isnull=False)
+    return in_batches(stale, lambda batch: batch.update(verification_token=None), batch_size, pause)
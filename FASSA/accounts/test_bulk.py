@@ -0,0 +1,82 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import OutboundEmail, User
+from .testing import log_in, make_user
+
+
+def student(n, **fields):
+    return {'full_name': f'Imported {n}', 'email': f'imported{n}@ttu.edu.gh', 'role': 'STUDENT',
+            'index_number': f'BC/ICT/24/{n:03d}', **fields}
+
+
+def admin(n, **fields):
+    return {'full_name': f'Staff {n}', 'email': f'staff{n}@ttu.edu.gh', 'role': 'ADMIN', 'position': 'Registrar',
+            **fields}
+
+
+class BulkImportTests(TestCase):
+    def setUp(self):
+        self.superadmin = make_user('bulk-root@ttu.edu.gh', role='SUPERADMIN')
+        self.existing = make_user('taken@ttu.edu.gh', index_number='BC/ICT/24/999')
+        self.url = reverse('bulk-user-import')
+
+    def post(self, data, user=None):
+        log_in(self.client, user or self.superadmin)
+        return self.client.post(self.url, data, content_type='application/json')
+
+    def test_reports_every_row(self):
+        response = self.post([student(1), {'full_name': 'No Email', 'role': 'STUDENT'}, admin(1)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 1))
+        self.assertEqual([(r['row'], r['status']) for r in response.data['results']],
+                         [(1, 'created'), (2, 'error'), (3, 'created')])
+        self.assertIn('email', response.data['results'][1]['errors'])
+
+        created = User.objects.get(email='imported1@ttu.edu.gh')
+        self.assertEqual((created.role, created.index_number), ('STUDENT', 'BC/ICT/24/001'))
+        self.assertTrue(created.has_usable_password())
+        self.assertEqual(OutboundEmail.objects.filter(to=['imported1@ttu.edu.gh']).count(), 1)
+
+    def test_duplicates_in_the_file_and_in_the_database(self):
+        response = self.post({'users': [
+            student(1),
+            student(2, email='imported1@TTU.edu.gh'),           # row 1's email, domain case aside
+            student(3, index_number='BC/ICT/24/001'),          # same index number as row 1
+            student(4, email=self.existing.email),             # existing account
+            student(5, index_number=self.existing.index_number),
+        ]})
+        results = response.data['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'error', 'error', 'error', 'error'])
+        self.assertEqual(set(results[1]['errors']), {'email'})
+        self.assertEqual(set(results[2]['errors']), {'index_number'})
+        self.assertEqual(set(results[3]['errors']), {'email'})
+        self.assertEqual(set(results[4]['errors']), {'index_number'})
+        self.assertEqual(User.objects.filter(email__startswith='imported').count(), 1)
+
+    def test_admins_import_students_only(self):
+        staff = make_user('bulk-admin@ttu.edu.gh', role='ADMIN', position='Registrar')
+        response = self.post([student(1), admin(1)], user=staff)
+        self.assertEqual([r['status'] for r in response.data['results']], ['created', 'error'])
+        self.assertIn('role', response.data['results'][1]['errors'])
+        self.assertFalse(User.objects.filter(email='staff1@ttu.edu.gh').exists())
+
+    def test_students_cannot_import(self):
+        self.assertEqual(self.post([student(1)], user=self.existing).status_code, 403)
+
+    def test_csv_upload(self):
+        upload = SimpleUploadedFile('users.csv', (
+            '\ufefffull_name,email,role,index_number,position\n'
+            ' Imported 1 , imported1@ttu.edu.gh ,STUDENT,BC/ICT/24/001,\n'
+            'Staff 1,staff1@ttu.edu.gh,ADMIN,,Registrar\n'
+        ).encode())
+        log_in(self.client, self.superadmin)
+        response = self.client.post(self.url, {'file': upload})
+        self.assertEqual(response.data['created'], 2, response.data)
+        self.assertEqual(User.objects.get(email='imported1@ttu.edu.gh').full_name, 'Imported 1')
+
+    def test_unparseable_upload_is_rejected(self):
+        log_in(self.client, self.superadmin)
+        response = self.client.post(self.url, {'file': SimpleUploadedFile('users.json', b'{not json')})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,107 @@
+import datetime
+import uuid
+from unittest import mock
+
+from django.contrib.auth.tokens import default_token_generator
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import PasswordReset
+from .sweeper import clear_verification_tokens, purge_password_resets
+from .testing import make_user
+from .tokens import make_password_reset_token, make_verification_token, read_password_reset_token
+
+NEW_PASSWORD = 'Another-Secret-77'
+
+
+class PasswordResetTokenTests(TestCase):
+    def setUp(self):
+        self.user = make_user('reset@ttu.edu.gh')
+        self.user.set_password('Old-Secret-11')
+        self.user.save()
+
+    def confirm(self, token):
+        return self.client.post(reverse('password-reset-confirm'), {
+            'token': str(token), 'new_password': NEW_PASSWORD, 'confirm_password': NEW_PASSWORD,
+        })
+
+    def test_token_resets_the_password_once(self):
+        token = make_password_reset_token(self.user)
+        self.assertEqual(self.confirm(token).status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password(NEW_PASSWORD))
+        # The new password hash invalidates the token.
+        self.assertEqual(self.confirm(token).status_code, 400)
+
+    def test_password_change_invalidates_earlier_tokens(self):
+        token = make_password_reset_token(self.user)
+        self.user.set_password('Changed-Elsewhere-22')
+        self.user.save()
+        self.assertIsNone(read_password_reset_token(token))
+
+    def test_expired_and_malformed_tokens(self):
+        token = make_password_reset_token(self.user)
+        later = default_token_generator._now() + datetime.timedelta(hours=2)
+        with mock.patch.object(default_token_generator, '_now', return_value=later):
+            self.assertIsNone(read_password_reset_token(token))
+        for bad in ('', 'no-dot', 'AAAA.abc-123', token.replace('.', '.x')):
+            self.assertIsNone(read_password_reset_token(bad), bad)
+        self.assertEqual(self.confirm('not-a-token').status_code, 400)
+
+    def test_legacy_uuid_tokens(self):
+        reset = PasswordReset.objects.create(user=self.user)
+        self.assertEqual(self.confirm(reset.token).status_code, 200)
+        self.assertFalse(PasswordReset.objects.exists())
+
+        expired = PasswordReset.objects.create(user=self.user, expires_at=timezone.now() - datetime.timedelta(minutes=1))
+        self.assertEqual(self.confirm(expired.token).status_code, 400)
+        self.assertEqual(self.confirm(uuid.uuid4()).status_code, 404)
+
+
+class VerificationTokenTests(TestCase):
+    def setUp(self):
+        self.user = make_user('verify@ttu.edu.gh', is_active=False, is_verified=False)
+
+    def verify(self, token, name='verify-student'):
+        return self.client.get(reverse(name, args=[token]))
+
+    def assertVerified(self):
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.is_active, self.user.is_verified, self.user.verification_token), (True, True, None))
+
+    def test_signed_token_verifies(self):
+        token = make_verification_token(self.user)
+        self.assertEqual(self.verify(token).status_code, 200)
+        self.assertVerified()
+        self.assertEqual(self.verify(token).data['message'], "Account already verified.")
+
+    def test_forged_and_expired_tokens_are_rejected(self):
+        token = make_verification_token(self.user)
+        self.assertEqual(self.verify(token[:-1] + ('A' if token[-1] != 'A' else 'B')).status_code, 400)
+        with override_settings(VERIFICATION_TOKEN_MAX_AGE=-1):
+            self.assertEqual(self.verify(token).status_code, 400)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_verified)
+
+    def test_legacy_uuid_link(self):
+        self.user.verification_token = uuid.uuid4()
+        self.user.save()
+        self.assertEqual(self.verify(self.user.verification_token, name='verify-student-legacy').status_code, 200)
+        self.assertVerified()
+        self.assertEqual(self.verify(uuid.uuid4(), name='verify-student-legacy').status_code, 404)
+
+
+class TokenSweeperTests(TestCase):
+    def test_sweeps_only_what_is_no_longer_needed(self):
+        user = make_user('sweep@ttu.edu.gh')
+        live = PasswordReset.objects.create(user=user)
+        PasswordReset.objects.create(user=user, expires_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(purge_password_resets(batch_size=1), 1)
+        self.assertEqual(list(PasswordReset.objects.all()), [live])
+
+        pending = make_user('pending@ttu.edu.gh', is_verified=False, verification_token=uuid.uuid4())
+        make_user('done@ttu.edu.gh', verification_token=uuid.uuid4())
+        self.assertEqual(clear_verification_tokens(), 1)
+        pending.refresh_from_db()
+        self.assertIsNotNone(pending.verification_token)
@@ -0,0 +1,66 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+
+from admin_panel.models import Course
+from .search import RankedSearchFilter
+from .testing import log_in, make_user
+
+
+class RankedSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('searcher@ttu.edu.gh', role='ADMIN')
+        make_user('kwame.asante@ttu.edu.gh', full_name='Kwame Asante', index_number='BC/ICT/22/153')
+        make_user('k.owusu@ttu.edu.gh', full_name='Kwame Owusu', index_number='BC/ICT/23/007')
+        make_user('kofi.mensah@ttu.edu.gh', full_name='Kofi Mensah', index_number='BC/EEE/22/011')
+        Course.objects.create(code='ICT201', title='Data Structures', lecturer='Dr. Owusu')
+        Course.objects.create(code='ICT305', title='Databases', lecturer='Dr. Asante')
+        Course.objects.create(code='EEE101', title='Circuits', lecturer='Dr. Mensah')
+
+    def setUp(self):
+        cache.clear()
+
+    def students(self, search):
+        log_in(self.client, self.admin)
+        response = self.client.get(reverse('student-list'), {'search': search})
+        self.assertEqual(response.status_code, 200)
+        return [row['email'] for row in response.data['students']]
+
+    def courses(self, search):
+        log_in(self.client, make_user(f'course-search-{search}@ttu.edu.gh'))
+        response = self.client.get(reverse('available-courses'), {'search': search})
+        self.assertEqual(response.status_code, 200)
+        return [row['code'] for row in response.data]
+
+    def test_terms_keep_emails_and_drop_punctuation(self):
+        request = Request(APIRequestFactory().get('/', {'search': 'kwame.asante@ttu.edu.gh, "data"  (struct'}))
+        self.assertEqual(RankedSearchFilter().get_terms(request),
+                         ['kwame.asante@ttu.edu.gh', 'data', 'struct'])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(sorted(self.students('kwame')), ['k.owusu@ttu.edu.gh', 'kwame.asante@ttu.edu.gh'])
+        self.assertEqual(self.students('kwame asante'), ['kwame.asante@ttu.edu.gh'])
+        self.assertEqual(self.students('nobody'), [])
+
+    def test_index_numbers_match_by_prefix(self):
+        self.assertEqual(sorted(self.students('BC/ICT/2')), ['k.owusu@ttu.edu.gh', 'kwame.asante@ttu.edu.gh'])
+
+    def test_courses(self):
+        self.assertEqual(sorted(self.courses('data')), ['ICT201', 'ICT305'])
+        self.assertEqual(self.courses('mensah'), ['EEE101'])
+
+    def test_empty_search_lists_everything(self):
+        self.assertEqual(len(self.students('')), 3)
+
+    @skipUnless(connection.vendor == 'postgresql', "Ranking needs PostgreSQL full-text search.")
+    def test_ranked_on_postgresql(self):
+        # "kwame" starts both the name and the email of one student, only the name of the other.
+        self.assertEqual(self.students('kwame'), ['kwame.asante@ttu.edu.gh', 'k.owusu@ttu.edu.gh'])
+        # Prefix queries: "datab" only finds Databases.
+        self.assertEqual(self.courses('datab'), ['ICT305'])
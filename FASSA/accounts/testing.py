@@ -0,0 +1,27 @@
+"""Helpers for the API tests in each app's tests.py."""
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from .tokens import ClaimsRefreshToken
+
+User = get_user_model()
+
+
+def make_user(email, role='STUDENT', **fields):
+    fields.setdefault('full_name', email.split('@')[0])
+    fields.setdefault('is_active', True)
+    fields.setdefault('is_verified', True)
+    return User.objects.create(email=email, role=role, **fields)
+
+
+def log_in(client, user):
+    """Send the user's access token with every request the test client makes."""
+    client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {ClaimsRefreshToken.for_user(user).access_token}'
+
+
+def shared_cache(test_class):
+    """
+    Let stateless_auth views trust token claims, as they do in production with
+    a shared cache. The test run is a single process, so locmem is shared here.
+    """
+    return override_settings(SHARED_CACHE=True)(test_class)
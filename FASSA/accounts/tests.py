@@ -1,3 +1,324 @@
-from django.test import TestCase
+import datetime
+import json
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path, reverse
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from FASSA.instrumentation import QueryBudgetTestMixin
+from . import async_views
+from .admin import OutboundEmailAdmin
+from .authentication import StatelessReadJWTAuthentication
+from .mailqueue import enqueue, purge_sent, send_pending
+from .models import OutboundEmail, User
+from .testing import log_in, make_user
+from .throttling import IPTokenBucketThrottle
+from .tokens import ClaimsRefreshToken, revoked_key
+
+THROTTLED = {'DEFAULT_THROTTLE_RATES': {'test_ip': '5/min'}}
+
+
+class ThrottledView:
+    throttle_scope = 'test'
+
+
+class SlowCache:
+    """The default cache with a delay between reading a bucket and writing it back."""
+
+    def __getattr__(self, name):
+        return getattr(cache, name)
+
+    def get(self, *args, **kwargs):
+        value = cache.get(*args, **kwargs)
+        time.sleep(0.005)
+        return value
+
+
+@override_settings(REST_FRAMEWORK=THROTTLED)
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().post('/login/', REMOTE_ADDR='10.0.0.1')
+
+    def test_burst_then_refused(self):
+        results = [IPTokenBucketThrottle().allow_request(self.request, ThrottledView()) for _ in range(6)]
+        self.assertEqual(results, [True] * 5 + [False])
+
+    def test_parallel_requests_cannot_share_a_token(self):
+        allowed = []
+        barrier = threading.Barrier(40)
+
+        def attempt():
+            barrier.wait(timeout=5)
+            if IPTokenBucketThrottle().allow_request(self.request, ThrottledView()):
+                allowed.append(1)
+
+        threads = [threading.Thread(target=attempt) for _ in range(40)]
+        with mock.patch('accounts.throttling.cache', SlowCache()):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertLessEqual(len(allowed), 5)
+
+
+class AccountsQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('root@ttu.edu.gh', role='SUPERADMIN')
+        for i in range(3):
+            make_user(f'student{i}@ttu.edu.gh')
+            make_user(f'admin{i}@ttu.edu.gh', role='ADMIN')
+
+    def setUp(self):
+        cache.clear()
+        log_in(self.client, self.superadmin)
+
+    def test_profile(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('profile')))
+
+    def test_student_list(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('student-list')))
+
+    def test_student_list_keyset_page(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('student-list'), {'page_size': 2}))
+
+    def test_admin_list(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('admin-list')))
+
+
+class RevocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_user('revoked@ttu.edu.gh')
+        self.token = ClaimsRefreshToken.for_user(self.student).access_token
+
+    def validate(self):
+        return StatelessReadJWTAuthentication().validate(str(self.token))
+
+    def test_tokens_issued_after_a_revocation_in_the_same_second_stay_valid(self):
+        cache.set(revoked_key(self.student.id), self.token['iat_ms'] - 1)
+        self.validate()
+        cache.set(revoked_key(self.student.id), self.token['iat_ms'])
+        with self.assertRaises(AuthenticationFailed):
+            self.validate()
+
+    def test_claim_change_revokes_once_committed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.role = 'ADMIN'
+            self.student.save()
+            self.validate()
+        with self.assertRaises(AuthenticationFailed):
+            self.validate()
+
+    def test_claims_are_only_trusted_with_a_shared_cache(self):
+        # Stands in for a revocation recorded in another process's cache.
+        User.objects.filter(pk=self.student.pk).update(is_active=False)
+        log_in(self.client, self.student)
+        with override_settings(SHARED_CACHE=True):
+            self.assertEqual(self.client.get(reverse('available-courses')).status_code, 200)
+        with override_settings(SHARED_CACHE=False):
+            self.assertEqual(self.client.get(reverse('available-courses')).status_code, 401)
+
+
+class StudentListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('pager@ttu.edu.gh', role='SUPERADMIN')
+        joined = timezone.now() - datetime.timedelta(days=1)
+        for i in range(7):
+            student = make_user(f'paged{i}@ttu.edu.gh', full_name=f'Paged {i}')
+            # Pairs share a timestamp, so pages must break ties on id.
+            User.objects.filter(pk=student.pk).update(date_joined=joined + datetime.timedelta(minutes=i // 2))
+        cls.expected = list(User.objects.filter(role='STUDENT').order_by('-date_joined', '-id')
+                            .values_list('id', flat=True))
+
+    def setUp(self):
+        cache.clear()
+        log_in(self.client, self.superadmin)
+        self.url = reverse('student-list')
+
+    def stream(self, **params):
+        response = self.client.get(self.url, params)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_cursor_pages_cover_every_student_once_in_order(self):
+        seen, url, params = [], self.url, {'page_size': 3}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['count'], 7)
+            seen += [row['id'] for row in response.data['students']]
+            url, params = response.data['next'], None
+        self.assertEqual(seen, self.expected)
+
+    def test_bad_cursor_is_not_found(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, 404)
+
+    def test_pages_cannot_be_reordered(self):
+        for params in ({'page_size': 2, 'search': 'Paged'}, {'cursor': '', 'ordering': 'full_name'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+        self.assertEqual(self.client.get(self.url, {'search': 'Paged'}).data['count'], 7)
+
+    def test_count_is_cached(self):
+        self.assertEqual(self.client.get(self.url, {'page_size': 2}).data['count'], 7)
+        make_user('late@ttu.edu.gh')
+        self.assertEqual(self.client.get(self.url, {'page_size': 2}).data['count'], 7)
+        cache.clear()
+        self.assertEqual(self.client.get(self.url, {'page_size': 2}).data['count'], 8)
+
+    def test_stream_json_and_ndjson(self):
+        response, body = self.stream(stream='json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        document = json.loads(body)
+        self.assertEqual(document['count'], 7)
+        self.assertEqual({row['id'] for row in document['students']}, set(self.expected))
+
+        response, body = self.stream(stream='ndjson', search='paged3@ttu.edu.gh')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([json.loads(line)['email'] for line in body.splitlines()], ['paged3@ttu.edu.gh'])
+
+    def test_stream_edges(self):
+        self.assertEqual(json.loads(self.stream(stream='json', search='nobody-here')[1]), {'students': [], 'count': 0})
+        self.assertEqual(self.stream(stream='ndjson', search='nobody-here')[1], '')
+        # Streaming ignores page parameters; an unknown format falls back to the normal response.
+        self.assertEqual(json.loads(self.stream(stream='json', page_size=2)[1])['count'], 7)
+        response = self.client.get(self.url, {'stream': 'xml'})
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.data['count'], 7)
+
+
+LOCMEM_EMAIL = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+class OutboxTests(TestCase):
+    def queue(self, body='Your temporary password is hunter2.'):
+        return enqueue([EmailMessage('Welcome', body, 'noreply@ttu.edu.gh', ['new@ttu.edu.gh'])])[0]
+
+    def test_body_is_blanked_once_sent(self):
+        row = self.queue()
+        self.assertEqual(send_pending(backend=LOCMEM_EMAIL), (1, 0))
+        self.assertIn('hunter2', mail.outbox[0].body)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.body), ('SENT', ''))
+
+    @override_settings(EMAIL_QUEUE_MAX_ATTEMPTS=1)
+    def test_body_is_blanked_when_delivery_gives_up(self):
+        row = self.queue()
+        with mock.patch.object(EmailMessage, 'send', side_effect=OSError("connection refused")), \
+                self.assertLogs('accounts.mailqueue', 'WARNING'):
+            self.assertEqual(send_pending(backend=LOCMEM_EMAIL), (0, 1))
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.body), ('FAILED', ''))
+
+    def make_due(self):
+        OutboundEmail.objects.filter(status='PENDING').update(next_attempt_at=timezone.now())
+
+    def test_sent_messages_are_not_resent_after_a_later_failure(self):
+        self.queue('first'), self.queue('second')
+        with mock.patch.object(EmailMessage, 'send', side_effect=[1, OSError("connection reset")]), \
+                self.assertLogs('accounts.mailqueue', 'WARNING'):
+            self.assertEqual(send_pending(backend=LOCMEM_EMAIL), (1, 1))
+        self.make_due()
+        self.assertEqual(send_pending(backend=LOCMEM_EMAIL), (1, 0))
+        self.assertEqual([message.body for message in mail.outbox], ['second'])
+
+    def test_sent_messages_are_not_resent_after_a_crash(self):
+        first, _ = self.queue('first'), self.queue('second')
+        with mock.patch.object(EmailMessage, 'send', side_effect=[1, SystemExit]), self.assertRaises(SystemExit):
+            send_pending(backend=LOCMEM_EMAIL)
+        first.refresh_from_db()
+        self.assertEqual(first.status, 'SENT')
+        self.make_due()  # the crashed worker's lease has run out
+        self.assertEqual(send_pending(backend=LOCMEM_EMAIL), (1, 0))
+        self.assertEqual([message.body for message in mail.outbox], ['second'])
+
+    def test_rows_left_when_the_lease_runs_out_are_not_sent(self):
+        self.queue()
+        with mock.patch('accounts.mailqueue.CLAIM_LEASE', datetime.timedelta(0)):
+            self.assertEqual(send_pending(backend=LOCMEM_EMAIL), (0, 0))
+        self.assertEqual(mail.outbox, [])
+
+    def test_old_sent_rows_are_purged(self):
+        old, recent, pending = self.queue(), self.queue(), self.queue()
+        OutboundEmail.objects.filter(pk__in=[old.pk, recent.pk]).update(status='SENT', sent_at=timezone.now())
+        OutboundEmail.objects.filter(pk=old.pk).update(sent_at=timezone.now() - datetime.timedelta(days=30))
+        self.assertEqual(purge_sent(days=7), 1)
+        self.assertEqual(set(OutboundEmail.objects.values_list('pk', flat=True)), {recent.pk, pending.pk})
+
+    def test_admin_form_leaves_out_the_body(self):
+        form = OutboundEmailAdmin(OutboundEmail, admin.site).get_form(request=None)
+        self.assertNotIn('body', form.base_fields)
+
+
+urlpatterns = [
+    path('register/', async_views.AsyncStudentRegisterView.as_view()),
+    path('password-reset/', async_views.AsyncPasswordResetRequestView.as_view()),
+    path('users/', async_views.AsyncSuperAdminUserCreateView.as_view()),
+]
+
+
+@override_settings(ROOT_URLCONF='accounts.tests')
+class AsyncAccountViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('async-root@ttu.edu.gh', role='SUPERADMIN')
+        cls.admin = make_user('async-admin@ttu.edu.gh', role='ADMIN')
+        cls.student = make_user('async-student@ttu.edu.gh')
+
+    async def post(self, url, data, user=None):
+        headers = {'authorization': f'Bearer {ClaimsRefreshToken.for_user(user).access_token}'} if user else {}
+        return await self.async_client.post(url, data, content_type='application/json', headers=headers)
+
+    def account(self, email, role):
+        extra = {'index_number': 'BC/ICT/22/999'} if role == 'STUDENT' else {'position': 'Registrar'}
+        return {'full_name': 'New Account', 'email': email, 'role': role, **extra}
+
+    async def test_register_creates_an_inactive_student_and_queues_verification(self):
+        response = await self.post('/register/', {
+            'full_name': 'New Student', 'index_number': 'BC/ICT/22/001', 'email': 'new-student@ttu.edu.gh',
+            'password': 'Correct-Horse-42', 'confirm_password': 'Correct-Horse-42',
+        })
+        self.assertEqual(response.status_code, 201, response.content)
+        user = await User.objects.aget(email='new-student@ttu.edu.gh')
+        self.assertEqual((user.role, user.is_active), ('STUDENT', False))
+        self.assertTrue(user.check_password('Correct-Horse-42'))
+        self.assertTrue(await OutboundEmail.objects.filter(to=['new-student@ttu.edu.gh']).aexists())
+
+    async def test_register_reports_validation_errors(self):
+        response = await self.post('/register/', {
+            'full_name': 'New Student', 'index_number': 'BC/ICT/22/002', 'email': 'new-student@gmail.com',
+            'password': 'Correct-Horse-42', 'confirm_password': 'Correct-Horse-43',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json())
+        self.assertFalse(await User.objects.filter(email='new-student@gmail.com').aexists())
+
+    async def test_superadmin_creates_an_account_with_a_temporary_password_mail(self):
+        response = await self.post('/users/', self.account('new-admin@ttu.edu.gh', 'ADMIN'), self.superadmin)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual((await User.objects.aget(email='new-admin@ttu.edu.gh')).role, 'ADMIN')
+        self.assertEqual(await OutboundEmail.objects.filter(to=['new-admin@ttu.edu.gh']).acount(), 1)
+
+    async def test_forbidden_before_validation(self):
+        # An existing email would be a 400 if the serializer ran first.
+        taken = self.account(self.student.email, 'STUDENT')
+        self.assertEqual((await self.post('/users/', taken, self.student)).status_code, 403)
+        self.assertEqual((await self.post('/users/', {**taken, 'role': 'ADMIN'}, self.admin)).status_code, 403)
+        self.assertEqual((await self.post('/users/', taken, self.admin)).status_code, 400)
+        self.assertFalse(await OutboundEmail.objects.aexists())
+
+    async def test_password_reset_queues_mail_only_for_known_emails(self):
+        for email in (self.student.email, 'nobody@ttu.edu.gh'):
+            self.assertEqual((await self.post('/password-reset/', {'email': email})).status_code, 200)
+        self.assertEqual([row.to async for row in OutboundEmail.objects.all()], [[self.student.email]])
@@ -0,0 +1,93 @@
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# How long a request waits for another request of the same client to finish
+# with the bucket, and how long a lock left by a crashed worker survives.
+LOCK_WAIT = 0.05
+LOCK_TIMEOUT = 2
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket kept in the default cache. A rate of "5/min" allows a burst
+    of 5 requests and refills one token every 12 seconds.
+
+    The read-modify-write of a bucket runs under a per-bucket lock taken with
+    cache.add (atomic on every backend), so parallel requests cannot all spend
+    the same token. A request that cannot get the lock within LOCK_WAIT is
+    refused: it is part of exactly the kind of burst being throttled.
+
+    The rate is looked up in DEFAULT_THROTTLE_RATES under
+    "<view.throttle_scope>_<kind>", e.g. "login_ip".
+    """
+    kind = None
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def parse_rate(self, rate):
+        num, period = rate.split('/')
+        capacity = int(num)
+        return capacity, capacity / PERIODS[period[0]]
+
+    def allow_request(self, request, view):
+        scope = f"{getattr(view, 'throttle_scope', None)}_{self.kind}"
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        ident = self.get_ident_value(request)
+        if rate is None or not ident:
+            return True
+
+        capacity, refill = self.parse_rate(rate)
+        key = f'throttle:{scope}:{ident}'
+        if not self.acquire(f'{key}:lock'):
+            self.wait_seconds = 1 / refill
+            return False
+        try:
+            return self.take_token(key, capacity, refill)
+        finally:
+            cache.delete(f'{key}:lock')
+
+    def acquire(self, lock_key):
+        deadline = time.monotonic() + LOCK_WAIT
+        while not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.002)
+        return True
+
+    def take_token(self, key, capacity, refill):
+        now = time.time()
+        tokens, stamp = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - stamp) * refill)
+        timeout = int(capacity / refill) + 1
+
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill
+            cache.set(key, (tokens, now), timeout)
+            return False
+
+        cache.set(key, (tokens - 1, now), timeout)
+        return True
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    kind = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailTokenBucketThrottle(TokenBucketThrottle):
+    kind = 'email'
+
+    def get_ident_value(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return email.strip().lower() if isinstance(email, str) else None
@@ -0,0 +1,85 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core import signing
+from django.core.cache import cache
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from rest_framework_simplejwt.tokens import RefreshToken
+
+VERIFICATION_SALT = 'accounts.verify-account'
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token whose claims (and therefore its access tokens) carry the
+    user's role, is_active and is_verified, so read endpoints can authorise
+    without loading the user.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['role'] = user.role
+        token['is_active'] = user.is_active
+        token['is_verified'] = user.is_verified
+        # `iat` has one-second resolution; revocations compare against this instead.
+        token['iat_ms'] = int(token.current_time.timestamp() * 1000)
+        return token
+
+
+def revoked_key(user_id):
+    return f'accounts:revoked:{user_id}'
+
+
+def revoke_user_tokens(user_id):
+    """Reject every token issued to this user up to now, for as long as access tokens live."""
+    lifetime = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()
+    cache.set(revoked_key(user_id), int(time.time() * 1000), int(lifetime))
+
+
+def issued_at_ms(token):
+    if 'iat_ms' in token:
+        return token['iat_ms']
+    # Tokens from before iat_ms: count them from the start of their second.
+    return token['iat'] * 1000 if 'iat' in token else None
+
+
+def is_revoked(user_id, issued_at):
+    """`issued_at` in milliseconds (issued_at_ms)."""
+    revoked_at = cache.get(revoked_key(user_id))
+    return revoked_at is not None and (issued_at is None or issued_at <= revoked_at)
+
+
+# Stateless email tokens: nothing is written when one is issued. Reset tokens
+# are `<uidb64>.<token>` from Django's PasswordResetTokenGenerator, valid for
+# PASSWORD_RESET_TIMEOUT and dead once the password or last_login changes.
+# Verification tokens are the user id signed with a timestamp.
+
+def make_password_reset_token(user):
+    return f"{urlsafe_base64_encode(force_bytes(user.pk))}.{default_token_generator.make_token(user)}"
+
+
+def read_password_reset_token(token):
+    """The user a reset token was issued to, or None if it is malformed, expired or already used."""
+    User = get_user_model()
+    uidb64, _, token = token.partition('.')
+    try:
+        user = User.objects.get(pk=force_str(urlsafe_base64_decode(uidb64)))
+    except (ValueError, TypeError, OverflowError, User.DoesNotExist):
+        return None
+    return user if default_token_generator.check_token(user, token) else None
+
+
+def make_verification_token(user):
+    return signing.dumps(user.pk, salt=VERIFICATION_SALT)
+
+
+def read_verification_token(token):
+    """The user id a verification token was issued for, or None if it is forged or expired."""
+    try:
+        return signing.loads(token, salt=VERIFICATION_SALT, max_age=settings.VERIFICATION_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
@@ -1,18 +1,32 @@
+from django.conf import settings
 from django.urls import path
+from . import async_views
 from .views import LoginView, UserProfileView, StudentRegisterView, SuperAdminUserView, VerifyStudentAccountView
 from .views import PasswordResetRequestView, PasswordResetConfirmView
 from .views import StudentListView, StudentDetailView
 from .views import AdminListView, AdminDetailView
+from .views import BulkUserImportView
 
+# Under an ASGI server the I/O-bound endpoints switch to their async variants;
+# the sync views stay the default for WSGI.
+if settings.ACCOUNTS_ASYNC_VIEWS:
+    register_view = async_views.AsyncStudentRegisterView.as_view()
+    password_reset_request_view = async_views.AsyncPasswordResetRequestView.as_view()
+else:
+    register_view = StudentRegisterView.as_view()
+    password_reset_request_view = PasswordResetRequestView.as_view()
 
 
 urlpatterns = [
-    path('register/', StudentRegisterView.as_view(), name='register'),
+    path('register/', register_view, name='register'),
     path('login/', LoginView.as_view(), name='login'),
     path('profile/', UserProfileView.as_view(), name='profile'),
     path('users/', SuperAdminUserView.as_view(), name='superadmin-users'),
-    path('verify/<uuid:token>/', VerifyStudentAccountView.as_view(), name='verify-student'),
-    path('password-reset/', PasswordResetRequestView.as_view(), name='password-reset-request'),
+    path('users/async/', async_views.AsyncSuperAdminUserCreateView.as_view(), name='superadmin-users-async'),
+    path('users/bulk/', BulkUserImportView.as_view(), name='bulk-user-import'),
+    path('verify/<uuid:token>/', VerifyStudentAccountView.as_view(), name='verify-student-legacy'),
+    path('verify/<str:token>/', VerifyStudentAccountView.as_view(), name='verify-student'),
+    path('password-reset/', password_reset_request_view, name='password-reset-request'),
     path('password-reset/confirm/', PasswordResetConfirmView.as_view(), name='password-reset-confirm'),
     path('students/', StudentListView.as_view(), name='student-list'),
     path('students/<int:pk>/', StudentDetailView.as_view(), name='student-detail'),
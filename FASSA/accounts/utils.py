@@ -1,14 +1,18 @@
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.conf import settings
+from . import mailqueue
 import string
 import random
 
+# The send_* helpers only queue mail in the outbox (accounts.OutboundEmail);
+# `manage.py send_queued_mail` delivers it.
+
 def generate_temporary_password(length=10):
     """Generate a random temporary password."""
     chars = string.ascii_letters + string.digits + string.punctuation
     return ''.join(random.choice(chars) for _ in range(length))
 
-def send_account_email(user_email, full_name, role, temp_password):
+def account_email_message(user_email, full_name, role, temp_password):
     role_text = "Faculty Admin" if role == 'ADMIN' else "Student"
     subject = "Your FASSA Account Has Been Created"
     message = f"""
@@ -28,10 +32,14 @@ Regards,
 FASSA
 """
     from_email = f"FASSA <{settings.EMAIL_HOST_USER}>"
-    send_mail(subject, message, from_email, [user_email], fail_silently=False)
+    return EmailMessage(subject, message, from_email, [user_email])
 
 
-def send_student_verification_email(user_email, full_name, verification_token):
+def send_account_email(user_email, full_name, role, temp_password):
+    mailqueue.enqueue([account_email_message(user_email, full_name, role, temp_password)])
+
+
+def verification_email_message(user_email, full_name, verification_token):
     subject = "Verify Your FASSA Account"
     verification_link = f"http://127.0.0.1:8000/api/accounts/verify/{verification_token}/"
     message = f"""
@@ -47,10 +55,14 @@ Regards,
 FASSA
 """
     from_email = f"FASSA <{settings.EMAIL_HOST_USER}>"
-    send_mail(subject, message, from_email, [user_email], fail_silently=False)
+    return EmailMessage(subject, message, from_email, [user_email])
 
 
-def send_password_reset_email(email, token):
+def send_student_verification_email(user_email, full_name, verification_token):
+    mailqueue.enqueue([verification_email_message(user_email, full_name, verification_token)])
+
+
+def password_reset_email_message(email, token):
     reset_link = f"http://127.0.0.1:8000/api/accounts/password-reset/confirm/?token={token}"
     subject = "Reset Your FASSA Password"
     message = f"""
@@ -66,4 +78,8 @@ Regards,
 FASSA
 """
     from_email = f"FASSA <{settings.EMAIL_HOST_USER}>"
-    send_mail(subject, message, from_email, [email], fail_silently=False)
+    return EmailMessage(subject, message, from_email, [email])
+
+
+def send_password_reset_email(email, token):
+    mailqueue.enqueue([password_reset_email_message(email, token)])
@@ -1,9 +1,10 @@
+import uuid
+
 from rest_framework import generics, status, filters, permissions
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth import authenticate, get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import PermissionDenied
 from .models import PasswordReset
@@ -15,8 +16,14 @@ from .serializers import (
     LoginSerializer,
     UserProfileSerializer,
 )
-from .permissions import IsSuperAdmin
+from .permissions import CanCreateAccount, IsSuperAdmin
+from .tokens import ClaimsRefreshToken, make_password_reset_token, read_password_reset_token, read_verification_token
+from .throttling import EmailTokenBucketThrottle, IPTokenBucketThrottle
 from .utils import send_password_reset_email
+from .pagination import StudentKeysetPagination
+from .search import RankedSearchFilter
+from .bulk import BulkUserImporter, read_rows
+from .streaming import iter_values, streaming_response
 
 
 User = get_user_model()
@@ -31,19 +38,26 @@ class VerifyStudentAccountView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, token):
-        user = get_object_or_404(User, verification_token=token)
+        if isinstance(token, uuid.UUID):  # link sent before verification tokens were signed
+            user = get_object_or_404(User, verification_token=token)
+        else:
+            user_id = read_verification_token(token)
+            if user_id is None:
+                return Response({"detail": "Invalid or expired verification link."}, status=status.HTTP_400_BAD_REQUEST)
+            user = get_object_or_404(User, pk=user_id)
         if user.is_verified:
             return Response({"message": "Account already verified."}, status=status.HTTP_200_OK)
 
         user.is_verified = True
         user.is_active = True
+        user.verification_token = None
         user.save()
         return Response({"message": "Account verified successfully. You can now log in."}, status=status.HTTP_200_OK)
 
 
 class SuperAdminUserView(generics.ListCreateAPIView):
     serializer_class = SuperAdminUserSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, CanCreateAccount]
     queryset = User.objects.all()
 
     def perform_create(self, serializer):
@@ -69,6 +83,8 @@ class SuperAdminUserView(generics.ListCreateAPIView):
 class LoginView(APIView):
     permission_classes = [AllowAny]
     serializer_class = LoginSerializer
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'login'
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
@@ -81,7 +97,7 @@ class LoginView(APIView):
         if not user:
             return Response({"error": "Invalid email or password."}, status=status.HTTP_400_BAD_REQUEST)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response({
             "message": "Login successful.",
             "email": user.email,
@@ -95,12 +111,15 @@ class LoginView(APIView):
 class UserProfileView(generics.RetrieveAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
+    query_budget = 1
 
     def get_object(self):
         return self.request.user
 
 class PasswordResetRequestView(generics.GenericAPIView):
     serializer_class = PasswordResetRequestSerializer
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'password_reset'
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -112,8 +131,7 @@ class PasswordResetRequestView(generics.GenericAPIView):
         except User.DoesNotExist:
             return Response({"detail": "If this email exists, a reset link will be sent."}, status=status.HTTP_200_OK)
 
-        reset_obj = PasswordReset.objects.create(user=user)
-        send_password_reset_email(user.email, reset_obj.token)
+        send_password_reset_email(user.email, make_password_reset_token(user))
 
         return Response({"detail": "If this email exists, a reset link will be sent."}, status=status.HTTP_200_OK)
 
@@ -127,14 +145,21 @@ class PasswordResetConfirmView(generics.GenericAPIView):
         token = serializer.validated_data['token']
         new_password = serializer.validated_data['new_password']
 
-        reset_obj = get_object_or_404(PasswordReset, token=token)
-        if reset_obj.is_expired():
-            return Response({"detail": "Token expired."}, status=status.HTTP_400_BAD_REQUEST)
+        user = read_password_reset_token(token)
+        if user is None:
+            try:
+                legacy_token = uuid.UUID(token)
+            except ValueError:
+                return Response({"detail": "Invalid or expired token."}, status=status.HTTP_400_BAD_REQUEST)
+            # Links emailed before reset tokens became stateless.
+            reset_obj = get_object_or_404(PasswordReset.objects.select_related('user'), token=legacy_token)
+            if reset_obj.is_expired():
+                return Response({"detail": "Token expired."}, status=status.HTTP_400_BAD_REQUEST)
+            user = reset_obj.user
+            reset_obj.delete()
 
-        user = reset_obj.user
         user.set_password(new_password)
         user.save()
-        reset_obj.delete()
 
         return Response({"detail": "Password has been reset successfully."}, status=status.HTTP_200_OK)
 
@@ -145,22 +170,43 @@ class IsAdminUser(permissions.BasePermission):
         return request.user.is_authenticated and request.user.role in ['ADMIN', 'SUPERADMIN']
 
 class StudentListView(generics.ListAPIView):
-    """List all students or filter/search"""
+    """
+    List all students or filter/search.
+    `?cursor=`/`?page_size=` switch to keyset pages ordered by (date_joined, id),
+    and cannot be combined with ?search= or ?ordering=;
+    `?stream=json|ndjson` streams every matching row without building models.
+    """
     serializer_class = StudentManagementSerializer
     permission_classes = [IsAdminUser]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    query_budget = 3
+    filter_backends = [RankedSearchFilter, filters.OrderingFilter]
     search_fields = ['full_name', 'email', 'index_number']
+    search_vector_fields = ['full_name', 'email']
+    search_prefix_fields = ['index_number']
+    pagination_class = StudentKeysetPagination
+    stream_formats = ('json', 'ndjson')
 
     def get_queryset(self):
         return User.objects.filter(role='STUDENT')
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
+
+        fmt = request.query_params.get('stream')
+        if fmt in self.stream_formats:
+            rows = iter_values(queryset, StudentManagementSerializer.Meta.fields)
+            return streaming_response(rows, fmt, results_key='students')
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
-        count = queryset.count()
+        data = serializer.data
         return Response({
-            "count": count,
-            "students": serializer.data
+            "count": len(data),
+            "students": data
         })
 
 
@@ -176,6 +222,7 @@ class AdminListView(generics.ListAPIView):
     """List all admins or filter/search"""
     serializer_class = SuperAdminUserSerializer
     permission_classes = [IsSuperAdmin]
+    query_budget = 2
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['full_name', 'email', 'position']
 
@@ -184,11 +231,10 @@ class AdminListView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        count = queryset.count()
+        data = self.get_serializer(queryset, many=True).data
         return Response({
-            "count": count,
-            "admins": serializer.data
+            "count": len(data),
+            "admins": data
         })
 
 
@@ -198,4 +244,37 @@ class AdminDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsSuperAdmin]
 
     def get_queryset(self):
-        return User.objects.filter(role='ADMIN')
\ No newline at end of file
+        return User.objects.filter(role='ADMIN')
+
+
+class BulkUserImportView(APIView):
+    """
+    Create many accounts from a JSON list (or {"users": [...]}) or an uploaded CSV `file`.
+    Returns a per-row report; credential emails are sent after the import commits.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is not None:
+            fmt = 'json' if upload.name.lower().endswith('.json') else 'csv'
+            try:
+                rows = read_rows(upload, fmt)
+            except (ValueError, UnicodeDecodeError):
+                return Response({"detail": "Could not parse the uploaded file."}, status=status.HTTP_400_BAD_REQUEST)
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            rows = request.data.get('users')
+
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return Response({"detail": "Provide a list of users or a CSV file."}, status=status.HTTP_400_BAD_REQUEST)
+
+        allowed_roles = ('STUDENT', 'ADMIN') if request.user.role == 'SUPERADMIN' else ('STUDENT',)
+        results = BulkUserImporter(allowed_roles=allowed_roles).run(rows)
+        created = sum(1 for result in results if result['status'] == 'created')
+        return Response({
+            "created": created,
+            "failed": len(results) - created,
+            "results": results,
+        }, status=status.HTTP_200_OK)
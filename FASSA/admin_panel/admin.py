@@ -1,3 +1,17 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Course, Timetable
+
+
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_display = ('code', 'title', 'program', 'level', 'semester', 'capacity', 'seats_taken')
+    list_filter = ('program', 'level', 'semester')
+    search_fields = ('code', 'title')
+
+
+@admin.register(Timetable)
+class TimetableAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'venue')
+    list_filter = ('day_of_week',)
+    list_select_related = ('course',)
@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from students.models import CourseRegistration
+from .models import CohortEnrollmentStat, Course, DailyRegistrationStat, StudentStat
+
+User = get_user_model()
+
+
+def add_to(model, field, delta, **lookup):
+    """Atomically add `delta` to one summary row, creating it on first use."""
+    if not delta:
+        return
+    if model.objects.filter(**lookup).update(**{field: F(field) + delta}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **{field: delta})
+    except IntegrityError:
+        # Created concurrently; fall back to the update.
+        model.objects.filter(**lookup).update(**{field: F(field) + delta})
+
+
+def cohort_of(course):
+    return {'program': course.program, 'level': course.level, 'semester': course.semester}
+
+
+def registration_added(registration, delta=1, cohort=None):
+    if cohort is None:
+        cohort = cohort_of(registration.course)
+    add_to(CohortEnrollmentStat, 'registrations', delta, **cohort)
+    add_to(
+        DailyRegistrationStat, 'registrations', delta,
+        date=timezone.localdate(registration.date_registered),
+    )
+
+
+def students_added(users):
+    """Count new student accounts, grouped so bulk imports cost at most two UPDATEs."""
+    verified = unverified = 0
+    for user in users:
+        if user.role == 'STUDENT':
+            if user.is_verified:
+                verified += 1
+            else:
+                unverified += 1
+    add_to(StudentStat, 'students', verified, is_verified=True)
+    add_to(StudentStat, 'students', unverified, is_verified=False)
+
+
+def student_state_changed(before, after):
+    """before/after are (role, is_verified) tuples; None for a missing account."""
+    if before == after:
+        return
+    if before and before[0] == 'STUDENT':
+        add_to(StudentStat, 'students', -1, is_verified=before[1])
+    if after and after[0] == 'STUDENT':
+        add_to(StudentStat, 'students', 1, is_verified=after[1])
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute every summary (and Course.seats_taken) from the source tables."""
+    seats = CourseRegistration.objects.filter(course=OuterRef('pk')).values('course').annotate(n=Count('id')).values('n')
+    Course.objects.update(seats_taken=Coalesce(Subquery(seats), Value(0)))
+
+    CohortEnrollmentStat.objects.all().delete()
+    CohortEnrollmentStat.objects.bulk_create(
+        CohortEnrollmentStat(program=row['course__program'], level=row['course__level'],
+                             semester=row['course__semester'], registrations=row['n'])
+        for row in CourseRegistration.objects.values('course__program', 'course__level', 'course__semester')
+        .annotate(n=Count('id')).order_by()
+    )
+
+    StudentStat.objects.all().delete()
+    StudentStat.objects.bulk_create(
+        StudentStat(is_verified=row['is_verified'], students=row['n'])
+        for row in User.objects.filter(role='STUDENT').values('is_verified').annotate(n=Count('id')).order_by()
+    )
+
+    DailyRegistrationStat.objects.all().delete()
+    DailyRegistrationStat.objects.bulk_create(
+        DailyRegistrationStat(date=row['day'], registrations=row['n'])
+        for row in CourseRegistration.objects.annotate(day=TruncDate('date_registered'))
+        .values('day').annotate(n=Count('id')).order_by()
+    )
+
+
+def dashboard(days=90):
+    """Every figure comes from a summary table, so cost grows with groups, not rows."""
+    students = {row.is_verified: row.students for row in StudentStat.objects.all()}
+    since = timezone.localdate() - timedelta(days=days)
+    return {
+        "students": {
+            "total": sum(students.values()),
+            "verified": students.get(True, 0),
+            "unverified": students.get(False, 0),
+        },
+        # "registrations" is also Course's reverse relation, so it cannot be a values() alias.
+        "enrollment_per_course": [
+            {'id': id, 'code': code, 'title': title, 'capacity': capacity, 'registrations': seats}
+            for id, code, title, capacity, seats in Course.objects.order_by('code').values_list(
+                'id', 'code', 'title', 'capacity', 'seats_taken'
+            )
+        ],
+        "enrollment_per_cohort": list(
+            CohortEnrollmentStat.objects.filter(registrations__gt=0)
+            .order_by('program', 'level', 'semester')
+            .values('program', 'level', 'semester', 'registrations')
+        ),
+        "registrations_over_time": list(
+            DailyRegistrationStat.objects.filter(date__gte=since).order_by('date').values('date', 'registrations')
+        ),
+    }
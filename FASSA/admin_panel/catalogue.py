@@ -0,0 +1,54 @@
+import datetime
+import time
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from FASSA.routers import pin_to_primary
+from .models import CatalogueStamp
+
+CATALOGUE_VERSION_KEY = 'catalogue:version'
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def get_catalogue_version():
+    """
+    Version stamp of the course catalogue (courses + timetables), for cache keys.
+    It is a nanosecond timestamp of the last write.
+    """
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOGUE_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def bump_catalogue_version():
+    previous = cache.get(CATALOGUE_VERSION_KEY) or 0
+    cache.set(CATALOGUE_VERSION_KEY, max(time.time_ns(), previous + 1), None)
+    pin_to_primary('catalogue')
+
+
+def record_catalogue_change():
+    """
+    Call after any Course/Timetable write that bypasses model signals (e.g.
+    bulk_create), inside the writing transaction if there is one. The
+    database stamp moves with the transaction; the cache version once it
+    has committed.
+    """
+    now = timezone.now()
+    if not CatalogueStamp.objects.filter(pk=1).update(version=F('version') + 1, changed_at=now):
+        try:
+            with transaction.atomic():
+                CatalogueStamp.objects.create(pk=1, version=1, changed_at=now)
+        except IntegrityError:
+            # Created concurrently; fall back to the update.
+            CatalogueStamp.objects.filter(pk=1).update(version=F('version') + 1, changed_at=now)
+    transaction.on_commit(bump_catalogue_version)
+
+
+def catalogue_stamp():
+    """(version, changed_at) of the last committed catalogue write."""
+    return CatalogueStamp.objects.filter(pk=1).values_list('version', 'changed_at').first() or (0, EPOCH)
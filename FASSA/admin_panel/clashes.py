@@ -0,0 +1,108 @@
+"""
+Clash checks for timetable slots. Slots are half-open [start, end): one that
+ends at 10:00 does not clash with one starting at 10:00. The overlap test runs
+in SQL against timetable_venue_slot_idx (venue and day lowercased, then start
+time), so a check reads only the bookings it could clash with.
+"""
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .models import Timetable
+
+# Venues matched per query in batch_venue_clashes.
+VENUE_CHUNK = 500
+
+
+def normalize(value):
+    """Lowercase with runs of whitespace collapsed; stored venues are already collapsed (TimetableSerializer)."""
+    return ' '.join((value or '').split()).lower()
+
+
+def slots():
+    return Timetable.objects.alias(venue_key=Lower('venue'), day_key=Lower('day_of_week'))
+
+
+def overlapping(day_of_week, start_time, end_time):
+    return Q(day_key=normalize(day_of_week), start_time__lt=end_time, end_time__gt=start_time)
+
+
+def overlaps(entry, other):
+    return (normalize(entry.day_of_week) == normalize(other.day_of_week)
+            and entry.start_time < other.end_time and other.start_time < entry.end_time)
+
+
+def registration_clashes(student, courses):
+    """
+    Return (new_entry, clashing_entry) pairs between the timetables of `courses`
+    and the student's current timetable, including clashes among `courses` themselves.
+    """
+    course_ids = [course.pk for course in courses]
+    new_entries = list(Timetable.objects.filter(course_id__in=course_ids).select_related('course'))
+    if not new_entries:
+        return []
+
+    # Only the registered slots that overlap one of the new ones come back.
+    existing = list(
+        slots().filter(course__registrations__student=student)
+        .filter(reduce(or_, (overlapping(e.day_of_week, e.start_time, e.end_time) for e in new_entries)))
+        .select_related('course')
+    )
+    clashes = [(entry, other) for entry in new_entries for other in existing if overlaps(entry, other)]
+    for i, entry in enumerate(new_entries):
+        for other in new_entries[i + 1:]:
+            if other.course_id != entry.course_id and overlaps(entry, other):
+                clashes.append((entry, other))
+    return clashes
+
+
+def venue_clashes(venue, day_of_week, start_time, end_time, exclude_pk=None):
+    """Timetable entries already booked in `venue` that overlap the given slot."""
+    if not normalize(venue):
+        return []
+    booked = slots().filter(overlapping(day_of_week, start_time, end_time), venue_key=normalize(venue))
+    if exclude_pk is not None:
+        booked = booked.exclude(pk=exclude_pk)
+    return list(booked.select_related('course').order_by('start_time'))
+
+
+def batch_venue_clashes(entries):
+    """
+    Validate a whole timetable import at once.
+    `entries` are dicts with day_of_week/start_time/end_time/venue; the result
+    lists {"row", "conflicts_with"} for rows that overlap an existing booking
+    or another row of the same import in the same venue.
+    """
+    groups = defaultdict(list)
+    for row, entry in enumerate(entries):
+        venue = normalize(entry.get('venue'))
+        if venue:
+            groups[(venue, normalize(entry['day_of_week']))].append((entry['start_time'], entry['end_time'], ('row', row)))
+
+    # Existing bookings of the import's venues only, on its days, through the index.
+    venues = sorted({venue for venue, _ in groups})
+    days = {day for _, day in groups}
+    for i in range(0, len(venues), VENUE_CHUNK):
+        booked = slots().filter(venue_key__in=venues[i:i + VENUE_CHUNK], day_key__in=days).values_list(
+            'pk', 'venue', 'day_of_week', 'start_time', 'end_time',
+        )
+        for pk, venue, day, start, end in booked.iterator(chunk_size=2000):
+            key = (normalize(venue), normalize(day))
+            if key in groups:
+                groups[key].append((start, end, ('timetable', pk)))
+
+    clashes = []
+    for group in groups.values():
+        group.sort(key=lambda slot: (slot[0], slot[1]))
+        active = []  # slots whose end is still ahead of the sweep line
+        for start, end, ref in group:
+            active = [slot for slot in active if slot[1] > start]
+            for _, _, other in active:
+                if ref[0] == 'row' or other[0] == 'row':
+                    row, conflict = (ref, other) if ref[0] == 'row' else (other, ref)
+                    clashes.append({"row": row[1], "conflicts_with": f"{conflict[0]} {conflict[1]}"})
+            active.append((start, end, ref))
+    return sorted(clashes, key=lambda clash: clash['row'])
@@ -0,0 +1,44 @@
+import hashlib
+
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .catalogue import catalogue_stamp
+
+
+class CatalogueConditionalMixin:
+    """
+    Conditional GET for list views whose content only changes with the catalogue.
+    The ETag comes from the committed CatalogueStamp (one small query, on the
+    same database as the list) and the request path, so a matching
+    If-None-Match / If-Modified-Since is answered with 304 before the queryset
+    or serializer is touched.
+    """
+
+    def catalogue_etag(self, request, version):
+        raw = f"{version}:{request.get_full_path()}"
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or etag in etags
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+        return if_modified_since is not None and last_modified <= if_modified_since
+
+    def list(self, request, *args, **kwargs):
+        version, changed_at = catalogue_stamp()
+        etag = self.catalogue_etag(request, version)
+        last_modified = int(changed_at.timestamp())
+
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().list(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -0,0 +1,198 @@
+import csv
+import json
+import os
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from students.models import CourseRegistration
+from .models import ExportJob, Timetable
+
+User = get_user_model()
+
+CHUNK_SIZE = 2000
+ROW_GROUP_SIZE = 10000
+
+# A running job renews its heartbeat every JOB_HEARTBEAT; one silent for
+# JOB_LEASE is requeued, up to JOB_MAX_ATTEMPTS runs in all.
+JOB_HEARTBEAT = timedelta(minutes=1)
+JOB_LEASE = timedelta(minutes=10)
+JOB_MAX_ATTEMPTS = 3
+
+# Spreadsheets run cells starting with these as formulas.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# dataset -> (column names, function(params) -> queryset)
+DATASETS = {
+    'students': (
+        ['id', 'full_name', 'email', 'index_number', 'is_active', 'is_verified', 'date_joined'],
+        lambda params: User.objects.filter(role='STUDENT').order_by('id'),
+    ),
+    'registrations': (
+        ['id', 'student_id', 'student__full_name', 'student__email', 'student__index_number',
+         'course_id', 'course__code', 'course__title', 'date_registered'],
+        lambda params: (
+            CourseRegistration.objects.filter(course_id=params['course'])
+            if params.get('course') else CourseRegistration.objects.all()
+        ).order_by('course_id', 'id'),
+    ),
+    'timetables': (
+        ['id', 'course_id', 'course__code', 'course__title', 'day_of_week', 'start_time', 'end_time', 'venue'],
+        lambda params: Timetable.objects.order_by('course__code', 'day_of_week', 'start_time'),
+    ),
+}
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'columnar': ('application/gzip', 'columnar.json.gz'),
+}
+
+
+def export_queryset(dataset, params):
+    columns, build = DATASETS[dataset]
+    return columns, build(params)
+
+
+def iter_rows(queryset, columns):
+    """Tuples straight off the cursor (server-side on PostgreSQL); no model instances."""
+    return queryset.values_list(*columns).iterator(chunk_size=CHUNK_SIZE)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_chunks(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
+
+
+def ndjson_chunks(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def columnar_chunks(columns, rows):
+    """
+    Gzip stream of JSON lines, one per row group of up to ROW_GROUP_SIZE rows:
+    {"columns": [...], "rows": n, "data": {column: [values, ...]}}.
+    Column-wise groups compress far better than row-wise JSON and load
+    directly into dataframe libraries.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+
+    def group(batch):
+        data = {column: [row[i] for row in batch] for i, column in enumerate(columns)}
+        line = json.dumps({"columns": columns, "rows": len(batch), "data": data}, cls=DjangoJSONEncoder) + "\n"
+        return compressor.compress(line.encode())
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == ROW_GROUP_SIZE:
+            chunk = group(batch)
+            batch = []
+            if chunk:
+                yield chunk
+    if batch:
+        yield group(batch)
+    yield compressor.flush()
+
+
+WRITERS = {'csv': csv_chunks, 'ndjson': ndjson_chunks, 'columnar': columnar_chunks}
+
+
+def export_chunks(dataset, fmt, params):
+    columns, queryset = export_queryset(dataset, params)
+    return WRITERS[fmt](columns, iter_rows(queryset, columns))
+
+
+def export_filename(dataset, fmt):
+    return f"{dataset}-{timezone.now():%Y%m%d-%H%M%S}.{FORMATS[fmt][1]}"
+
+
+class LeaseLost(Exception):
+    pass
+
+
+def requeue_stale_jobs():
+    """Put RUNNING jobs whose worker went quiet back in the queue, or fail them after JOB_MAX_ATTEMPTS."""
+    now = timezone.now()
+    stale = ExportJob.objects.filter(status='RUNNING').filter(
+        Q(heartbeat_at__lt=now - JOB_LEASE) | Q(heartbeat_at__isnull=True)  # claimed before heartbeats
+    )
+    failed = stale.filter(attempts__gte=JOB_MAX_ATTEMPTS).update(
+        status='FAILED', error="The export worker stopped responding.", finished_at=now,
+    )
+    return stale.update(status='PENDING') + failed
+
+
+def claim_job():
+    requeue_stale_jobs()
+    with transaction.atomic():
+        pending = ExportJob.objects.filter(status='PENDING').order_by('created_at')
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        job = pending.first()
+        if job is not None:
+            now = timezone.now()
+            ExportJob.objects.filter(pk=job.pk).update(
+                status='RUNNING', started_at=now, heartbeat_at=now, attempts=F('attempts') + 1,
+            )
+            job.refresh_from_db()
+    return job
+
+
+def owned(job):
+    """The job's row, as long as this run still holds it."""
+    return ExportJob.objects.filter(pk=job.pk, status='RUNNING', attempts=job.attempts)
+
+
+def run_job(job):
+    """Write one export to EXPORT_ROOT with constant memory."""
+    os.makedirs(settings.EXPORT_ROOT, exist_ok=True)
+    path = os.path.join(settings.EXPORT_ROOT, f"{job.pk}-{export_filename(job.dataset, job.fmt)}")
+    beat = timezone.now()
+    try:
+        with open(path, 'wb') as out:
+            for chunk in export_chunks(job.dataset, job.fmt, job.params):
+                out.write(chunk.encode() if isinstance(chunk, str) else chunk)
+                if timezone.now() - beat >= JOB_HEARTBEAT:
+                    beat = timezone.now()
+                    if not owned(job).update(heartbeat_at=beat):
+                        raise LeaseLost
+    except LeaseLost:
+        # Requeued meanwhile; whichever run holds the job now writes its own file.
+        os.remove(path)
+        job.refresh_from_db()
+        return job
+    except Exception as exc:
+        job.status = 'FAILED'
+        job.error = str(exc)[:1000]
+        if os.path.exists(path):
+            os.remove(path)
+    else:
+        job.status = 'DONE'
+        job.file_path = path
+    job.finished_at = timezone.now()
+    if not owned(job).update(status=job.status, error=job.error, file_path=job.file_path, finished_at=job.finished_at):
+        if job.status == 'DONE':
+            os.remove(path)
+        job.refresh_from_db()
+    return job
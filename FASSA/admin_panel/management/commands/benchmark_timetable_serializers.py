@@ -0,0 +1,74 @@
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from admin_panel.catalogue import record_catalogue_change
+from admin_panel.models import Course, Timetable
+from admin_panel.serializers import TimetableSerializer, TimetableValuesSerializer
+from students.sync import log_changes
+
+BENCH_CODE_PREFIX = 'ZZT'
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+
+class Command(BaseCommand):
+    help = "Seed timetable rows and compare query counts/timings of the timetable serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000)
+        parser.add_argument('--courses', type=int, default=2_000)
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--cleanup', action='store_true', help="Delete the synthetic rows afterwards.")
+
+    def handle(self, *args, **options):
+        self.seed(options['rows'], options['courses'])
+        timetable = Timetable.objects.filter(course__code__startswith=BENCH_CODE_PREFIX).order_by('course__code', 'id')
+
+        cases = [
+            ('ModelSerializer', lambda: TimetableSerializer(timetable, many=True).data),
+            ('ModelSerializer + select_related', lambda: TimetableSerializer(timetable.select_related('course'), many=True).data),
+            ('ValuesSerializer', lambda: TimetableValuesSerializer(timetable).data),
+        ]
+        for label, serialize in cases:
+            timings = []
+            for _ in range(options['runs']):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    rows = serialize()
+                    timings.append(time.perf_counter() - start)
+            self.stdout.write(
+                f"{label:<34} {len(rows):>6} rows  {len(queries):>6} queries  "
+                f"median {statistics.median(timings) * 1000:8.1f} ms"
+            )
+
+        if options['cleanup']:
+            Course.objects.filter(code__startswith=BENCH_CODE_PREFIX).delete()
+
+    def seed(self, rows, courses):
+        existing = Course.objects.filter(code__startswith=BENCH_CODE_PREFIX).count()
+        new_courses = Course.objects.bulk_create(
+            (Course(code=f'{BENCH_CODE_PREFIX}{i:05d}', title=f'Benchmark course {i}') for i in range(existing, courses)),
+            batch_size=5000,
+        )
+        course_ids = list(Course.objects.filter(code__startswith=BENCH_CODE_PREFIX).order_by('id').values_list('id', flat=True))
+        existing = Timetable.objects.filter(course_id__in=course_ids).count()
+        entries = Timetable.objects.bulk_create(
+            (
+                Timetable(
+                    course_id=course_ids[i % len(course_ids)],
+                    day_of_week=DAYS[i % len(DAYS)],
+                    start_time=datetime.time(7 + i % 10),
+                    end_time=datetime.time(8 + i % 10),
+                    venue=f'Bench Hall {i % 50}',
+                )
+                for i in range(existing, rows)
+            ),
+            batch_size=5000,
+        )
+        record_catalogue_change()
+        log_changes('course', new_courses)
+        log_changes('timetable', entries)
@@ -0,0 +1,117 @@
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from admin_panel.catalogue import record_catalogue_change
+from admin_panel.models import Course, Timetable
+from admin_panel.scheduler import (
+    SchedulingError, TimetableProblem, cohort_collisions, shared_student_counts, slot_clashes, solve,
+)
+from realtime.events import timetables_replaced
+from students.models import CourseRegistration
+from students.sync import log_changes
+
+DEFAULT_DAYS = 'Monday,Tuesday,Wednesday,Thursday,Friday'
+DEFAULT_PERIODS = '08:00-10:00,10:30-12:30,13:30-15:30,16:00-18:00'
+
+
+def parse_periods(value):
+    periods = []
+    for period in value.split(','):
+        start, end = period.strip().split('-')
+        periods.append((datetime.strptime(start, '%H:%M').time(), datetime.strptime(end, '%H:%M').time()))
+    return periods
+
+
+class Command(BaseCommand):
+    help = "Generate a clash-minimising weekly timetable for the course catalogue."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--venues', help="Comma-separated venues. Defaults to the venues already in use.")
+        parser.add_argument('--days', default=DEFAULT_DAYS)
+        parser.add_argument('--periods', default=DEFAULT_PERIODS, help="Comma-separated HH:MM-HH:MM teaching periods.")
+        parser.add_argument('--semester', help="Only schedule courses of this semester.")
+        parser.add_argument('--restarts', type=int, default=8)
+        parser.add_argument('--workers', type=int, help="Processes for parallel restarts. Defaults to CPU count.")
+        parser.add_argument('--time-limit', type=float, default=5.0, help="Seconds of local search per restart.")
+        parser.add_argument('--seed', type=int)
+        parser.add_argument('--commit', action='store_true',
+                            help="Replace the timetable of the scheduled courses. Without it this is a dry run.")
+
+    def handle(self, *args, **options):
+        courses = Course.objects.all()
+        if options['semester']:
+            courses = courses.filter(semester=options['semester'])
+        rows = list(courses.values_list('id', 'program', 'level', 'semester'))
+        if not rows:
+            raise CommandError("No courses to schedule.")
+        course_ids = [row[0] for row in rows]
+        # Courses of one program, level and semester are taken together; keep them apart.
+        cohorts = defaultdict(list)
+        for course_id, program, level, semester in rows:
+            if program and level:
+                cohorts[(program, level, semester)].append(course_id)
+        cohorts = list(cohorts.values())
+
+        if options['venues']:
+            venues = [venue.strip() for venue in options['venues'].split(',') if venue.strip()]
+        else:
+            venues = sorted(set(Timetable.objects.exclude(venue='').values_list('venue', flat=True)))
+        if not venues:
+            raise CommandError("No venues given and none found in the existing timetable; pass --venues.")
+
+        try:
+            periods = parse_periods(options['periods'])
+        except ValueError:
+            raise CommandError("Periods must look like 08:00-10:00,10:30-12:30.")
+        days = [day.strip() for day in options['days'].split(',') if day.strip()]
+        slots = [(day, start, end) for day in days for start, end in periods]
+
+        registrations = (
+            CourseRegistration.objects.filter(course_id__in=course_ids)
+            .order_by('student_id')
+            .values_list('student_id', 'course_id')
+            .iterator(chunk_size=5000)
+        )
+        shared = shared_student_counts(registrations)
+
+        try:
+            problem = TimetableProblem(course_ids, slots, venues, shared, cohorts)
+        except SchedulingError as exc:
+            raise CommandError(str(exc))
+
+        started = time.perf_counter()
+        _, assignment = solve(
+            problem,
+            restarts=options['restarts'],
+            workers=options['workers'],
+            time_limit=options['time_limit'],
+            seed=options['seed'],
+        )
+        self.stdout.write(
+            f"Scheduled {len(assignment)} courses into {len(slots)} slots x {len(venues)} venues "
+            f"in {time.perf_counter() - started:.2f}s with {slot_clashes(assignment, shared)} student clash(es)."
+        )
+        collisions = cohort_collisions(assignment, cohorts)
+        if collisions:
+            self.stdout.write(self.style.WARNING(
+                f"{collisions} pair(s) of courses of the same program level share a slot; add slots or venues."
+            ))
+
+        if not options['commit']:
+            self.stdout.write("Dry run; pass --commit to write the timetable.")
+            return
+
+        with transaction.atomic():
+            Timetable.objects.filter(course_id__in=course_ids).delete()
+            entries = Timetable.objects.bulk_create(
+                Timetable(course_id=course_id, day_of_week=day, start_time=start, end_time=end, venue=venue)
+                for course_id, ((day, start, end), venue) in assignment.items()
+            )
+            log_changes('timetable', entries)
+            record_catalogue_change()
+            timetables_replaced(course_ids)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(assignment)} timetable entries."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from admin_panel.analytics import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the analytics summary tables and Course.seats_taken from scratch. "
+        "Signals keep them current between runs; schedule this periodically to repair drift."
+    )
+
+    def handle(self, *args, **options):
+        rebuild()
+        self.stdout.write(self.style.SUCCESS("Analytics rebuilt."))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_panel.exports import claim_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued admin exports, writing files to EXPORT_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new jobs.")
+        parser.add_argument('--interval', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_job()
+            if job is not None:
+                job = run_job(job)
+                self.stdout.write(f"Export {job.pk} ({job.dataset}.{job.fmt}): {job.status}")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
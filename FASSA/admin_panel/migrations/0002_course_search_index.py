@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-17 10:02
+
+from django.db import migrations
+
+# PostgreSQL-only GIN index matching RankedSearchFilter's SearchVector on
+# AvailableCoursesView; skipped on SQLite.
+
+
+def search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector('title', 'code', 'lecturer', config='simple'), name='course_search_gin')
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(apps.get_model('admin_panel', 'Course'), search_index())
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('admin_panel', 'Course'), search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0003_course_capacity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortEnrollmentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('program', models.CharField(blank=True, max_length=120)),
+                ('level', models.CharField(blank=True, max_length=20)),
+                ('semester', models.CharField(blank=True, max_length=10)),
+                ('registrations', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('program', 'level', 'semester')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRegistrationStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('registrations', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StudentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_verified', models.BooleanField(unique=True)),
+                ('students', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0005_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(fields=['course', 'day_of_week', 'start_time'], name='timetable_course_slot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(fields=['day_of_week', 'start_time'], name='timetable_slot_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-17 23:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def collapse_venues(apps, schema_editor):
+    Timetable = apps.get_model('admin_panel', 'Timetable')
+    for pk, venue in Timetable.objects.exclude(venue='').values_list('pk', 'venue').iterator():
+        collapsed = ' '.join(venue.split())
+        if collapsed != venue:
+            Timetable.objects.filter(pk=pk).update(venue=collapsed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0008_cataloguestamp'),
+    ]
+
+    operations = [
+        migrations.RunPython(collapse_venues, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(django.db.models.functions.text.Lower('venue'), django.db.models.functions.text.Lower('day_of_week'), models.F('start_time'), name='timetable_venue_slot_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 class Course(models.Model):
     code = models.CharField(max_length=20, unique=True)
@@ -7,6 +10,27 @@ class Course(models.Model):
     level = models.CharField(max_length=20, blank=True)
     semester = models.CharField(max_length=10, blank=True)
     lecturer = models.CharField(max_length=255, blank=True)
+    capacity = models.PositiveIntegerField(null=True, blank=True, help_text="Leave empty for unlimited seats.")
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(capacity__isnull=True) | models.Q(seats_taken__lte=models.F('capacity')),
+                name='course_not_overbooked',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # seats_taken only ever changes through F() updates (students.services,
+        # analytics.rebuild); saving an edit must not write back the count loaded earlier.
+        if not self._state.adding and self.pk is not None and not kwargs.get('force_insert'):
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                update_fields = [field.name for field in self._meta.concrete_fields if not field.primary_key]
+            kwargs['update_fields'] = [name for name in update_fields if name != 'seats_taken']
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.code} — {self.title}"
@@ -18,9 +42,88 @@ class Timetable(models.Model):
     start_time = models.TimeField()
     end_time = models.TimeField()
     venue = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['day_of_week', 'start_time']
+        indexes = [
+            models.Index(fields=['course', 'day_of_week', 'start_time'], name='timetable_course_slot_idx'),
+            models.Index(fields=['day_of_week', 'start_time'], name='timetable_slot_idx'),
+            # Venue clash checks (admin_panel.clashes).
+            models.Index(Lower('venue'), Lower('day_of_week'), models.F('start_time'), name='timetable_venue_slot_idx'),
+        ]
 
     def __str__(self):
         return f"{self.course.code} | {self.day_of_week} {self.start_time}-{self.end_time}"
+
+
+class CatalogueStamp(models.Model):
+    """
+    A single row counting catalogue (Course/Timetable) writes. It is updated
+    inside the writing transaction, so every process and replica sees the
+    change exactly when it commits; conditional GETs validate against it.
+    """
+    version = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Catalogue v{self.version} ({self.changed_at})"
+
+
+class CohortEnrollmentStat(models.Model):
+    """Registrations per (program, level, semester), kept current by admin_panel.analytics."""
+    program = models.CharField(max_length=120, blank=True)
+    level = models.CharField(max_length=20, blank=True)
+    semester = models.CharField(max_length=10, blank=True)
+    registrations = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('program', 'level', 'semester')
+
+    def __str__(self):
+        return f"{self.program} L{self.level} S{self.semester}: {self.registrations}"
+
+
+class StudentStat(models.Model):
+    """Student accounts split by verification state."""
+    is_verified = models.BooleanField(unique=True)
+    students = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{'Verified' if self.is_verified else 'Unverified'}: {self.students}"
+
+
+class DailyRegistrationStat(models.Model):
+    """Course registrations made per day."""
+    date = models.DateField(unique=True)
+    registrations = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.date}: {self.registrations}"
+
+
+class ExportJob(models.Model):
+    """Large export written to EXPORT_ROOT by `manage.py run_export_jobs`."""
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='export_jobs')
+    dataset = models.CharField(max_length=20)
+    fmt = models.CharField(max_length=10)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    file_path = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # A RUNNING job whose heartbeat is older than exports.JOB_LEASE lost its worker.
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.dataset}.{self.fmt} ({self.status})"
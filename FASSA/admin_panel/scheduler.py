@@ -0,0 +1,202 @@
+"""
+Weekly timetable generator.
+
+Each course gets one (slot, venue) pair. Two courses may never share a venue in
+the same slot (hard constraint); every student registered for two courses in the
+same slot counts as one clash (soft constraint, minimised), and two courses of
+one cohort (say, a program's level) in the same slot count as COHORT_WEIGHT
+clashes, so they only share a slot when nothing else fits. The solver builds a
+greedy assignment, hardest courses first, then runs min-conflicts local search.
+Independent restarts with different seeds can run on several CPU cores.
+
+Everything in this module is plain Python data so it can cross process
+boundaries; the Django side lives in the generate_timetable command.
+"""
+import itertools
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Cost of two courses of one cohort sharing a slot, in student clashes.
+COHORT_WEIGHT = 10_000
+
+
+class SchedulingError(Exception):
+    pass
+
+
+class TimetableProblem:
+    def __init__(self, course_ids, slots, venues, shared_students, cohorts=()):
+        """
+        course_ids: ids of the courses to place.
+        slots: list of opaque slot descriptions, e.g. (day, start, end).
+        venues: list of venue names.
+        shared_students: {(course_a, course_b): number of students taking both}.
+        cohorts: groups of course ids that should never share a slot.
+        """
+        self.course_ids = list(course_ids)
+        self.slots = list(slots)
+        self.venues = list(venues)
+        if len(self.course_ids) > len(self.slots) * len(self.venues):
+            raise SchedulingError(
+                f"{len(self.course_ids)} courses do not fit in {len(self.slots)} slots x {len(self.venues)} venues."
+            )
+        self.neighbours = defaultdict(dict)
+        for (a, b), weight in shared_students.items():
+            if a != b and weight:
+                self.neighbours[a][b] = self.neighbours[a].get(b, 0) + weight
+                self.neighbours[b][a] = self.neighbours[b].get(a, 0) + weight
+        for cohort in cohorts:
+            for a, b in itertools.combinations(sorted(set(cohort)), 2):
+                self.neighbours[a][b] = self.neighbours[a].get(b, 0) + COHORT_WEIGHT
+                self.neighbours[b][a] = self.neighbours[b].get(a, 0) + COHORT_WEIGHT
+
+
+def shared_student_counts(registrations):
+    """Count co-registrations from (student_id, course_id) pairs sorted by student."""
+    counts = Counter()
+    for _, rows in itertools.groupby(registrations, key=lambda row: row[0]):
+        courses = sorted({course_id for _, course_id in rows})
+        counts.update(itertools.combinations(courses, 2))
+    return counts
+
+
+def slot_clashes(assignment, shared_students):
+    """Students clashing under `assignment` ({course: (slot, venue)}), recounted from scratch."""
+    return sum(
+        weight for (a, b), weight in shared_students.items()
+        if a != b and a in assignment and b in assignment and assignment[a][0] == assignment[b][0]
+    )
+
+
+def cohort_collisions(assignment, cohorts):
+    """Pairs of courses of one cohort placed in the same slot."""
+    return sum(
+        1 for cohort in cohorts for a, b in itertools.combinations(sorted(set(cohort)), 2)
+        if a in assignment and b in assignment and assignment[a][0] == assignment[b][0]
+    )
+
+
+class _Search:
+    def __init__(self, problem, seed):
+        self.problem = problem
+        self.rng = random.Random(seed)
+        self.slot_of = {}
+        self.venue_of = {}
+        self.free_venues = [set(range(len(problem.venues))) for _ in problem.slots]
+        # clash_in[c][s]: students of course c clashing if c sat in slot s.
+        self.clash_in = {c: [0] * len(problem.slots) for c in problem.course_ids}
+
+    def cost(self):
+        return sum(
+            weight
+            for c, neighbours in self.problem.neighbours.items()
+            for o, weight in neighbours.items()
+            if c < o and c in self.slot_of and self.slot_of.get(o) == self.slot_of[c]
+        )
+
+    def place(self, course, slot, venue):
+        self.slot_of[course] = slot
+        self.venue_of[course] = venue
+        self.free_venues[slot].discard(venue)
+        for other, weight in self.problem.neighbours[course].items():
+            if other in self.clash_in:
+                self.clash_in[other][slot] += weight
+
+    def remove(self, course):
+        slot = self.slot_of.pop(course)
+        venue = self.venue_of.pop(course)
+        self.free_venues[slot].add(venue)
+        for other, weight in self.problem.neighbours[course].items():
+            if other in self.clash_in:
+                self.clash_in[other][slot] -= weight
+        return slot, venue
+
+    def best_open_slot(self, course, exclude=None):
+        options = [s for s, free in enumerate(self.free_venues) if free and s != exclude]
+        if not options:
+            return None
+        best = min(self.clash_in[course][s] for s in options)
+        return self.rng.choice([s for s in options if self.clash_in[course][s] == best])
+
+    def greedy(self):
+        order = sorted(
+            self.problem.course_ids,
+            key=lambda c: (-sum(self.problem.neighbours[c].values()), self.rng.random()),
+        )
+        for course in order:
+            slot = self.best_open_slot(course)
+            self.place(course, slot, self.rng.choice(sorted(self.free_venues[slot])))
+
+    def improve(self, deadline, max_steps):
+        cost = self.cost()
+        best_cost, best = cost, (dict(self.slot_of), dict(self.venue_of))
+        courses = self.problem.course_ids
+
+        for _ in range(max_steps):
+            if cost == 0 or time.monotonic() > deadline:
+                break
+            clashing = [c for c in courses if self.clash_in[c][self.slot_of[c]]]
+            if not clashing:
+                break
+            course = self.rng.choice(clashing)
+            current = self.slot_of[course]
+            before = self.clash_in[course][current]
+
+            target = self.best_open_slot(course, exclude=current)
+            if target is not None and (self.clash_in[course][target] < before or self.rng.random() < 0.05):
+                self.remove(course)
+                cost += self.clash_in[course][target] - before
+                self.place(course, target, self.rng.choice(sorted(self.free_venues[target])))
+            else:
+                # Every other slot is full or worse: try swapping slots with a random course.
+                other = self.rng.choice(courses)
+                other_slot = self.slot_of[other]
+                if other == course or other_slot == current:
+                    continue
+                delta = self.swap_delta(course, other)
+                if delta <= 0 or self.rng.random() < 0.02:
+                    slot_a, venue_a = self.remove(course)
+                    slot_b, venue_b = self.remove(other)
+                    self.place(course, slot_b, venue_b)
+                    self.place(other, slot_a, venue_a)
+                    cost += delta
+
+            if cost < best_cost:
+                best_cost, best = cost, (dict(self.slot_of), dict(self.venue_of))
+
+        return best_cost, best
+
+    def swap_delta(self, a, b):
+        slot_a, slot_b = self.slot_of[a], self.slot_of[b]
+        shared = self.problem.neighbours[a].get(b, 0)
+        # Moving a into b's slot no longer counts b there, and vice versa.
+        return (
+            (self.clash_in[a][slot_b] - shared) - self.clash_in[a][slot_a]
+            + (self.clash_in[b][slot_a] - shared) - self.clash_in[b][slot_b]
+        )
+
+
+def solve_once(problem, seed, time_limit=5.0, max_steps=200_000):
+    """One greedy construction plus local search. Returns (cost, {course: (slot, venue)})."""
+    search = _Search(problem, seed)
+    search.greedy()
+    cost, (slot_of, venue_of) = search.improve(time.monotonic() + time_limit, max_steps)
+    return cost, {course: (problem.slots[slot_of[course]], problem.venues[venue_of[course]]) for course in slot_of}
+
+
+def solve(problem, restarts=1, workers=None, time_limit=5.0, seed=None):
+    """Run `restarts` independent searches, in parallel when workers > 1, and keep the best."""
+    base = random.Random(seed).randrange(2 ** 32)
+    seeds = [base + i for i in range(max(1, restarts))]
+    workers = min(workers or os.cpu_count() or 1, len(seeds))
+
+    if workers == 1:
+        results = [solve_once(problem, s, time_limit) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(solve_once, [problem] * len(seeds), seeds, [time_limit] * len(seeds)))
+    return min(results, key=lambda result: result[0])
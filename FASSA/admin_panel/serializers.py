@@ -1,10 +1,21 @@
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Course, Timetable
+from .clashes import venue_clashes
+from .models import Course, ExportJob, Timetable
+from .values import ValuesSerializer
 
 class CourseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
-        fields = ['id', 'code', 'title', 'program', 'level', 'semester', 'lecturer']
+        fields = ['id', 'code', 'title', 'program', 'level', 'semester', 'lecturer', 'capacity', 'seats_taken']
+        read_only_fields = ['seats_taken']
+
+    def validate_capacity(self, value):
+        if value is not None and self.instance is not None and value < self.instance.seats_taken:
+            raise serializers.ValidationError(
+                f"Capacity cannot be lower than the {self.instance.seats_taken} seats already taken."
+            )
+        return value
 
 class TimetableSerializer(serializers.ModelSerializer):
     course_code = serializers.CharField(source='course.code', read_only=True)
@@ -13,3 +24,59 @@ class TimetableSerializer(serializers.ModelSerializer):
     class Meta:
         model = Timetable
         fields = ['id', 'course', 'course_code', 'course_title', 'day_of_week', 'start_time', 'end_time', 'venue']
+
+    def validate_venue(self, value):
+        # Stored collapsed, so clash checks can compare venues case-insensitively in SQL.
+        return ' '.join(value.split())
+
+    def validate(self, attrs):
+        start_time = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        if start_time and end_time and end_time <= start_time:
+            raise serializers.ValidationError({"end_time": "End time must be after start time."})
+
+        # Batch imports check venues for all rows at once in the view.
+        if self.context.get('batch'):
+            return attrs
+
+        venue = attrs.get('venue', getattr(self.instance, 'venue', ''))
+        day_of_week = attrs.get('day_of_week', getattr(self.instance, 'day_of_week', ''))
+        booked = venue_clashes(venue, day_of_week, start_time, end_time, exclude_pk=getattr(self.instance, 'pk', None))
+        if booked:
+            raise serializers.ValidationError({
+                "venue": f"{venue} is already booked for {booked[0]} at that time."
+            })
+        return attrs
+
+
+class TimetableValuesSerializer(ValuesSerializer):
+    """Same output as TimetableSerializer, read straight from .values() with the course joined in."""
+    fields = {
+        'id': 'id',
+        'course': 'course_id',
+        'course_code': 'course__code',
+        'course_title': 'course__title',
+        'day_of_week': 'day_of_week',
+        'start_time': 'start_time',
+        'end_time': 'end_time',
+        'venue': 'venue',
+    }
+    formatters = {
+        'start_time': lambda value: value.isoformat(),
+        'end_time': lambda value: value.isoformat(),
+    }
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = ['id', 'dataset', 'fmt', 'params', 'status', 'error', 'created_at', 'finished_at', 'download_url']
+
+    def get_download_url(self, obj):
+        if obj.status != 'DONE':
+            return None
+        request = self.context.get('request')
+        url = reverse('admin-export-job-download', args=[obj.pk])
+        return request.build_absolute_uri(url) if request else url
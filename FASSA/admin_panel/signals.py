@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from students.models import CourseRegistration
+from . import analytics
+from .catalogue import record_catalogue_change
+from .models import CohortEnrollmentStat, Course, Timetable
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Timetable)
+def catalogue_changed(sender, **kwargs):
+    record_catalogue_change()
+
+
+# Analytics summaries. post_init snapshots let post_save see what changed
+# without re-reading the row.
+
+@receiver(post_init, sender=Course)
+def remember_cohort(sender, instance, **kwargs):
+    instance._analytics_cohort = analytics.cohort_of(instance)
+
+
+@receiver(post_save, sender=Course)
+def move_cohort(sender, instance, created, **kwargs):
+    cohort = analytics.cohort_of(instance)
+    if not created and cohort != instance._analytics_cohort:
+        # instance.seats_taken is as loaded; seats claimed since then are only in the row.
+        seats = Course.objects.filter(pk=instance.pk).values_list('seats_taken', flat=True).first()
+        if seats:
+            analytics.add_to(CohortEnrollmentStat, 'registrations', -seats, **instance._analytics_cohort)
+            analytics.add_to(CohortEnrollmentStat, 'registrations', seats, **cohort)
+    instance._analytics_cohort = cohort
+
+
+@receiver(post_save, sender=CourseRegistration)
+def registration_created(sender, instance, created, **kwargs):
+    # Counted after commit, so the shared per-day and per-cohort rows are locked
+    # only for their own UPDATE rather than for the rest of the registration.
+    if created:
+        cohort = analytics.cohort_of(instance.course)
+        transaction.on_commit(lambda: analytics.registration_added(instance, cohort=cohort))
+
+
+@receiver(post_delete, sender=CourseRegistration)
+def registration_deleted(sender, instance, **kwargs):
+    cohort = Course.objects.filter(pk=instance.course_id).values('program', 'level', 'semester').first()
+    if cohort is not None:
+        transaction.on_commit(lambda: analytics.registration_added(instance, delta=-1, cohort=cohort))
+
+
+def student_state(user):
+    return user.__dict__.get('role'), user.__dict__.get('is_verified')
+
+
+@receiver(post_init, sender=User)
+def remember_student_state(sender, instance, **kwargs):
+    instance._analytics_state = student_state(instance)
+
+
+@receiver(post_save, sender=User)
+def student_saved(sender, instance, created, **kwargs):
+    analytics.student_state_changed(None if created else instance._analytics_state, student_state(instance))
+    instance._analytics_state = student_state(instance)
+
+
+@receiver(post_delete, sender=User)
+def student_deleted(sender, instance, **kwargs):
+    analytics.student_state_changed(student_state(instance), None)
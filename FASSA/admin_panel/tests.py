@@ -1,3 +1,393 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+
+from accounts.testing import log_in, make_user
+from FASSA.instrumentation import QueryBudgetTestMixin
+from students.models import CourseRegistration, SyncChange
+from students.services import register_student
+from .catalogue import catalogue_stamp
+from .exports import JOB_LEASE, JOB_MAX_ATTEMPTS, claim_job, export_chunks, run_job
+from .clashes import batch_venue_clashes, registration_clashes, venue_clashes
+from .models import CohortEnrollmentStat, Course, DailyRegistrationStat, ExportJob, Timetable
+from .scheduler import (
+    COHORT_WEIGHT, SchedulingError, TimetableProblem, cohort_collisions, slot_clashes, solve, solve_once,
+)
+
+
+def make_timetable(courses, per_course=2):
+    return [
+        Timetable.objects.create(
+            course=course, day_of_week='Monday', start_time=datetime.time(8 + slot), end_time=datetime.time(9 + slot),
+            venue=f'Hall {course.pk}',
+        )
+        for course in courses for slot in range(per_course)
+    ]
+
+
+class AdminPanelQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@ttu.edu.gh', role='ADMIN')
+        courses = [Course.objects.create(code=f'BUD{i}', title=f'Budget {i}', program='ICT', level='100')
+                   for i in range(3)]
+        cls.entries = make_timetable(courses)
+        student = make_user('student@ttu.edu.gh')
+        CourseRegistration.objects.create(student=student, course=courses[0])
+
+    def setUp(self):
+        cache.clear()
+        log_in(self.client, self.admin)
+
+    def test_course_list(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('admin-courses-list-create')))
+
+    def test_timetable_list(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('admin-timetables-list-create')))
+
+    def test_timetable_detail(self):
+        url = reverse('admin-timetable-detail', args=[self.entries[0].pk])
+        self.assertWithinQueryBudget(self.client.get(url))
+
+    def test_analytics(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('admin-analytics')))
+
+
+class AdminPanelConstantQueryTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        log_in(self.client, make_user('admin@ttu.edu.gh', role='ADMIN'))
+        self.courses = [Course.objects.create(code=f'ROW{i}', title=f'Rows {i}') for i in range(10)]
+
+    def fetch(self):
+        cache.clear()
+        return self.client.get(reverse('admin-timetables-list-create'))
+
+    def test_timetable_list(self):
+        make_timetable(self.courses[:1], per_course=1)
+        self.assertQueriesDoNotGrow(self.fetch, lambda: make_timetable(self.courses[1:]))
+
+
+class CatalogueConditionalTests(TestCase):
+    def setUp(self):
+        log_in(self.client, make_user('student@ttu.edu.gh'))
+        self.course = Course.objects.create(code='ETAG1', title='Tags')
+        self.url = reverse('available-courses')
+
+    def etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_etag_comes_from_the_database_not_the_cache(self):
+        etag = self.etag()
+        cache.clear()  # another process, or an evicted key
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_catalogue_writes_change_the_etag(self):
+        etags = [self.etag()]
+        self.course.title = 'Renamed'
+        self.course.save()
+        etags.append(self.etag())
+        make_timetable([self.course], per_course=1)[0].delete()
+        etags.append(self.etag())
+        self.assertEqual(len(set(etags)), 3)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[0]).status_code, 200)
+
+
+class AnalyticsCounterTests(TestCase):
+    def cohort_count(self, program):
+        return CohortEnrollmentStat.objects.filter(program=program).values_list('registrations', flat=True).first()
+
+    def test_registrations_are_counted_on_commit(self):
+        course = Course.objects.create(code='STAT1', title='Stats', program='ICT')
+        with self.captureOnCommitCallbacks(execute=True):
+            register_student(make_user('counted@ttu.edu.gh'), [course])
+            self.assertIsNone(self.cohort_count('ICT'))
+            self.assertFalse(DailyRegistrationStat.objects.exists())
+        self.assertEqual(self.cohort_count('ICT'), 1)
+        self.assertEqual(DailyRegistrationStat.objects.get().registrations, 1)
+
+    def test_moving_a_course_moves_seats_claimed_after_it_was_loaded(self):
+        course = Course.objects.create(code='STAT2', title='Stats', program='ICT')
+        loaded = Course.objects.get(pk=course.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            register_student(make_user('early@ttu.edu.gh'), [course])
+            register_student(make_user('late@ttu.edu.gh'), [course])
+
+        loaded.program = 'Computer Science'
+        loaded.save()
+        self.assertEqual(self.cohort_count('ICT'), 0)
+        self.assertEqual(self.cohort_count('Computer Science'), 2)
+
+
+def slot(course, day, start, end, venue=''):
+    return Timetable.objects.create(course=course, day_of_week=day, start_time=datetime.time(*start),
+                                    end_time=datetime.time(*end), venue=venue)
+
+
+class ClashTests(TestCase):
+    def setUp(self):
+        self.student = make_user('clash@ttu.edu.gh')
+        self.taken, self.overlapping, self.touching, self.elsewhere = [
+            Course.objects.create(code=f'CLS{i}', title=f'Clash {i}') for i in range(4)
+        ]
+        self.booked = slot(self.taken, 'Monday', (8,), (10,), venue='Hall A')
+        CourseRegistration.objects.create(student=self.student, course=self.taken)
+        slot(self.overlapping, 'monday', (9, 30), (11,))
+        slot(self.touching, 'Monday', (10,), (12,))
+        slot(self.elsewhere, 'Tuesday', (8,), (10,))
+
+    def test_overlapping_slots_clash_and_touching_slots_do_not(self):
+        clashes = registration_clashes(self.student, [self.overlapping])
+        self.assertEqual([(entry.course, other) for entry, other in clashes], [(self.overlapping, self.booked)])
+        self.assertEqual(registration_clashes(self.student, [self.touching]), [])
+        self.assertEqual(registration_clashes(self.student, [self.elsewhere]), [])
+
+    def test_courses_in_one_bulk_registration_clash_with_each_other(self):
+        other = make_user('clash-other@ttu.edu.gh')
+        clashes = registration_clashes(other, [self.overlapping, self.touching])
+        self.assertEqual([{entry.course, other.course} for entry, other in clashes],
+                         [{self.overlapping, self.touching}])
+        with self.assertRaises(serializers.ValidationError):
+            register_student(other, [self.overlapping, self.touching])
+        self.assertFalse(CourseRegistration.objects.filter(student=other).exists())
+
+    def test_venue_names_differing_in_case_or_whitespace_clash(self):
+        nine, ten, eleven = datetime.time(9), datetime.time(10), datetime.time(11)
+        self.assertEqual(venue_clashes('  hall   A ', 'MONDAY', nine, eleven), [self.booked])
+        self.assertEqual(venue_clashes('Hall A', 'Monday', ten, eleven), [])
+        self.assertEqual(venue_clashes('Hall B', 'Monday', nine, eleven), [])
+        self.assertEqual(venue_clashes('Hall A', 'Monday', nine, eleven, exclude_pk=self.booked.pk), [])
+
+    def test_batch_import_reports_clashing_rows(self):
+        rows = [
+            {'day_of_week': 'Monday', 'start_time': datetime.time(9), 'end_time': datetime.time(10), 'venue': 'hall a'},
+            {'day_of_week': 'Monday', 'start_time': datetime.time(10), 'end_time': datetime.time(11), 'venue': 'Hall A'},
+            {'day_of_week': 'Friday', 'start_time': datetime.time(8), 'end_time': datetime.time(10), 'venue': 'Lab 1'},
+            {'day_of_week': 'friday', 'start_time': datetime.time(9), 'end_time': datetime.time(11), 'venue': 'LAB 1'},
+            {'day_of_week': 'Friday', 'start_time': datetime.time(9), 'end_time': datetime.time(11), 'venue': ''},
+        ]
+        self.assertEqual(batch_venue_clashes(rows), [
+            {'row': 0, 'conflicts_with': f'timetable {self.booked.pk}'},
+            {'row': 3, 'conflicts_with': 'row 2'},
+        ])
+
+
+class TimetableImportTests(TestCase):
+    def setUp(self):
+        log_in(self.client, make_user('importer@ttu.edu.gh', role='ADMIN'))
+        self.course = Course.objects.create(code='IMP1', title='Import')
+        self.url = reverse('admin-timetables-list-create')
+
+    def row(self, start, end, venue='Hall C'):
+        return {'course': self.course.pk, 'day_of_week': 'Wednesday', 'start_time': start, 'end_time': end,
+                'venue': venue}
+
+    def test_clashing_import_writes_nothing(self):
+        response = self.client.post(self.url, [self.row('08:00', '10:00'), self.row('09:00', '11:00', ' hall  c')],
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['clashes'], [{'row': 1, 'conflicts_with': 'row 0'}])
+        self.assertFalse(Timetable.objects.exists())
+
+    def test_import_commits_rows_stamp_and_sync_log_together(self):
+        version = catalogue_stamp()[0]
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, [self.row('08:00', '10:00'), self.row('10:00', '12:00', ' hall  c')],
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(sorted(Timetable.objects.values_list('venue', flat=True)), ['Hall C', 'hall c'])
+        self.assertGreater(catalogue_stamp()[0], version)
+        self.assertEqual(SyncChange.objects.filter(kind='timetable').count(), 2)
+        self.assertTrue(callbacks)
+
+    def test_failed_import_leaves_no_rows_behind(self):
+        version = catalogue_stamp()[0]
+        with mock.patch('admin_panel.views.log_changes', side_effect=RuntimeError("sync log down")), \
+                self.assertRaises(RuntimeError):
+            self.client.post(self.url, [self.row('08:00', '10:00')], content_type='application/json')
+        self.assertFalse(Timetable.objects.exists())
+        self.assertEqual(catalogue_stamp()[0], version)
+
+
+SLOTS = [(day, hour) for day in ('Monday', 'Tuesday') for hour in (8, 10)]
+
+
+class SchedulerTests(SimpleTestCase):
+    # A six-course ring of shared students: two slots apart would do, four are on offer.
+    shared = {(1, 2): 3, (2, 3): 2, (3, 4): 1, (4, 5): 4, (5, 6): 2, (1, 6): 1}
+    cohorts = [[1, 3], [2, 4]]
+
+    def problem(self, **kwargs):
+        return TimetableProblem(range(1, 7), SLOTS, ['Hall A', 'Hall B'], self.shared, self.cohorts, **kwargs)
+
+    def assertFeasible(self, assignment):
+        self.assertEqual(sorted(assignment), [1, 2, 3, 4, 5, 6])
+        placements = list(assignment.values())
+        self.assertEqual(len(set(placements)), len(placements), "A venue is double-booked.")
+        self.assertEqual(cohort_collisions(assignment, self.cohorts), 0)
+
+    def test_output_books_each_venue_and_cohort_once_per_slot(self):
+        cost, assignment = solve(self.problem(), restarts=2, workers=1, seed=1)
+        self.assertFeasible(assignment)
+        self.assertEqual(cost, slot_clashes(assignment, self.shared))
+
+    def test_reported_cost_matches_a_recount(self):
+        # Everyone shares students and only two slots exist, so clashes are unavoidable.
+        shared = {(a, b): a + b for a in range(1, 5) for b in range(a + 1, 5)}
+        cohorts = [[1, 2]]
+        problem = TimetableProblem(range(1, 5), SLOTS[:2], ['Hall A', 'Hall B'], shared, cohorts)
+        cost, assignment = solve_once(problem, seed=3, max_steps=2000)
+        self.assertGreater(cost, 0)
+        self.assertEqual(cost, slot_clashes(assignment, shared) + COHORT_WEIGHT * cohort_collisions(assignment, cohorts))
+
+    def test_more_courses_than_places_is_an_error(self):
+        with self.assertRaises(SchedulingError):
+            TimetableProblem(range(5), SLOTS[:2], ['Hall A', 'Hall B'], {})
+
+    def test_fixed_seed_gives_the_same_timetable(self):
+        self.assertEqual(solve(self.problem(), restarts=3, workers=1, seed=42),
+                         solve(self.problem(), restarts=3, workers=1, seed=42))
+
+
+class GenerateTimetableCommandTests(TestCase):
+    def setUp(self):
+        self.courses = [
+            Course.objects.create(code=f'GEN{i}', title=f'Generated {i}', program='ICT', level=level)
+            for i, level in enumerate(['100', '100', '200', '200'])
+        ]
+        student = make_user('generated@ttu.edu.gh')
+        for course in self.courses[::2]:
+            CourseRegistration.objects.create(student=student, course=course)
+
+    def generate(self, **options):
+        out = StringIO()
+        call_command('generate_timetable', venues='Hall A,Hall B', days='Monday', periods='08:00-10:00,10:30-12:30',
+                     restarts=1, workers=1, seed=5, stdout=out, **options)
+        return out.getvalue()
+
+    def test_dry_run_writes_nothing(self):
+        self.assertIn('0 student clash(es)', self.generate())
+        self.assertFalse(Timetable.objects.exists())
+
+    def test_commit_writes_the_timetable_and_bumps_the_catalogue(self):
+        version = catalogue_stamp()[0]
+        self.generate(commit=True)
+
+        entries = list(Timetable.objects.values_list('course_id', 'start_time', 'venue'))
+        self.assertEqual(sorted(course_id for course_id, _, _ in entries), [course.pk for course in self.courses])
+        self.assertEqual(len({(start, venue) for _, start, venue in entries}), 4)
+        starts = {course_id: start for course_id, start, _ in entries}
+        self.assertNotEqual(starts[self.courses[0].pk], starts[self.courses[1].pk])
+        self.assertNotEqual(starts[self.courses[0].pk], starts[self.courses[2].pk])
+        self.assertGreater(catalogue_stamp()[0], version)
+        self.assertEqual(SyncChange.objects.filter(kind='timetable').count(), 4)
+
+    def test_too_many_courses_is_a_command_error(self):
+        Course.objects.create(code='GEN9', title='One too many')
+        with self.assertRaises(CommandError):
+            self.generate()
+
+
+class ExportFormatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_user('plain@ttu.edu.gh', full_name='Ama Mensah')
+        make_user('formula@ttu.edu.gh', full_name='=HYPERLINK("http://evil.example","x")', index_number='-1+1')
+
+    def export(self, fmt):
+        return b''.join(chunk.encode() if isinstance(chunk, str) else chunk
+                        for chunk in export_chunks('students', fmt, {}))
+
+    def test_csv_escapes_formula_cells(self):
+        header, *rows = csv.reader(self.export('csv').decode().splitlines())
+        self.assertEqual(header[:3], ['id', 'full_name', 'email'])
+        by_email = {row[2]: row for row in rows}
+        self.assertEqual(by_email['plain@ttu.edu.gh'][1], 'Ama Mensah')
+        self.assertEqual(by_email['formula@ttu.edu.gh'][1], '\'=HYPERLINK("http://evil.example","x")')
+        self.assertEqual(by_email['formula@ttu.edu.gh'][3], "'-1+1")
+
+    def test_ndjson_has_one_object_per_row(self):
+        rows = [json.loads(line) for line in self.export('ndjson').decode().splitlines()]
+        self.assertEqual({row['email'] for row in rows}, {'plain@ttu.edu.gh', 'formula@ttu.edu.gh'})
+        self.assertTrue(rows[0]['full_name'])  # values as stored, no spreadsheet escaping
+
+    def test_columnar_splits_row_groups(self):
+        make_user('third@ttu.edu.gh')
+        with mock.patch('admin_panel.exports.ROW_GROUP_SIZE', 2):
+            groups = [json.loads(line) for line in gzip.decompress(self.export('columnar')).decode().splitlines()]
+        self.assertEqual([group['rows'] for group in groups], [2, 1])
+        self.assertEqual(sum(len(group['data']['email']) for group in groups), 3)
+        self.assertEqual(groups[0]['columns'][:2], ['id', 'full_name'])
+
+
+class ExportJobTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(EXPORT_ROOT=cls.root))
+        cls.addClassCleanup(shutil.rmtree, cls.root, ignore_errors=True)
+        super().setUpClass()
+
+    def setUp(self):
+        log_in(self.client, make_user('exporter@ttu.edu.gh', role='ADMIN'))
+        make_user('exported@ttu.edu.gh')
+
+    def queue(self):
+        response = self.client.get(reverse('admin-export', args=['students']), {'fmt': 'ndjson', 'background': 1})
+        self.assertEqual(response.status_code, 202)
+        return ExportJob.objects.get(pk=response.data['id'])
+
+    def test_queued_job_runs_and_downloads(self):
+        job = self.queue()
+        self.assertEqual(job.status, 'PENDING')
+        call_command('run_export_jobs', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('DONE', 1))
+        self.assertTrue(os.path.exists(job.file_path))
+        response = self.client.get(reverse('admin-export-job-download', args=[job.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'exported@ttu.edu.gh', b''.join(response.streaming_content))
+
+    def stall(self, job):
+        ExportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - JOB_LEASE - datetime.timedelta(seconds=1))
+
+    def test_job_of_a_dead_worker_is_requeued(self):
+        job = self.queue()
+        self.assertEqual(claim_job().pk, job.pk)
+        self.assertIsNone(claim_job())  # still leased
+        self.stall(job)
+        retried = claim_job()
+        self.assertEqual((retried.pk, retried.attempts), (job.pk, 2))
+        self.assertEqual(run_job(retried).status, 'DONE')
+
+    def test_job_fails_after_its_last_attempt(self):
+        job = self.queue()
+        ExportJob.objects.filter(pk=job.pk).update(status='RUNNING', attempts=JOB_MAX_ATTEMPTS)
+        self.stall(job)
+        self.assertIsNone(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertTrue(job.error)
+
+    def test_superseded_run_keeps_no_file(self):
+        job = self.queue()
+        stale = claim_job()
+        self.stall(job)
+        claim_job()  # another worker takes the job over
+        self.assertEqual(run_job(stale).status, 'RUNNING')
+        self.assertEqual(os.listdir(self.root), [])
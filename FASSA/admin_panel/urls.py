@@ -1,9 +1,14 @@
 from django.urls import path
 from .views import CourseListCreateView, CourseDetailView, TimetableListCreateView, TimetableDetailView
+from .views import AnalyticsView, ExportView, ExportJobDetailView, ExportJobDownloadView
 
 urlpatterns = [
     path('courses/', CourseListCreateView.as_view(), name='admin-courses-list-create'),
     path('courses/<int:pk>/', CourseDetailView.as_view(), name='admin-course-detail'),
     path('timetables/', TimetableListCreateView.as_view(), name='admin-timetables-list-create'),
     path('timetables/<int:pk>/', TimetableDetailView.as_view(), name='admin-timetable-detail'),
+    path('analytics/', AnalyticsView.as_view(), name='admin-analytics'),
+    path('exports/jobs/<int:pk>/', ExportJobDetailView.as_view(), name='admin-export-job-detail'),
+    path('exports/jobs/<int:pk>/download/', ExportJobDownloadView.as_view(), name='admin-export-job-download'),
+    path('exports/<str:dataset>/', ExportView.as_view(), name='admin-export'),
 ]
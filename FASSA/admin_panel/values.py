@@ -0,0 +1,38 @@
+from rest_framework.response import Response
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer over queryset.values() rows: one query, no model
+    instances. `fields` maps output keys to ORM lookups (joins included);
+    `formatters` optionally post-process a value, e.g. time -> isoformat().
+    """
+    fields = {}
+    formatters = {}
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @property
+    def data(self):
+        lookups = list(self.fields.values())
+        formatters = self.formatters
+        rows = []
+        for row in self.queryset.values(*lookups):
+            item = {}
+            for key, lookup in self.fields.items():
+                value = row[lookup]
+                if value is not None and key in formatters:
+                    value = formatters[key](value)
+                item[key] = value
+            rows.append(item)
+        return rows
+
+
+class ValuesListMixin:
+    """List action that goes through `values_serializer_class` instead of the ModelSerializer."""
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self.values_serializer_class(queryset).data)
@@ -1,24 +1,131 @@
-from rest_framework import generics, permissions
-from .models import Course, Timetable
-from .serializers import CourseSerializer, TimetableSerializer
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import Course, ExportJob, Timetable
+from .serializers import CourseSerializer, ExportJobSerializer, TimetableSerializer, TimetableValuesSerializer
+from .values import ValuesListMixin
+from accounts.pagination import cached_count
 from accounts.permissions import IsAdmin
+from .analytics import dashboard
+from .exports import DATASETS, FORMATS, export_chunks, export_filename, export_queryset
+from .catalogue import record_catalogue_change
+from .clashes import batch_venue_clashes
+from .conditional import CatalogueConditionalMixin
+from realtime.events import timetables_replaced
+from students.sync import log_changes
 
 class CourseListCreateView(generics.ListCreateAPIView):
     queryset = Course.objects.all().order_by('code')
     serializer_class = CourseSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    query_budget = 2
 
 class CourseDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdmin]
 
-class TimetableListCreateView(generics.ListCreateAPIView):
+class TimetableListCreateView(CatalogueConditionalMixin, ValuesListMixin, generics.ListCreateAPIView):
+    """POST a single entry, or a list to import a whole semester after one clash check"""
     queryset = Timetable.objects.all().order_by('course__code', 'day_of_week', 'start_time')
     serializer_class = TimetableSerializer
+    values_serializer_class = TimetableValuesSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    query_budget = 3
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        context = {**self.get_serializer_context(), 'batch': True}
+        serializer = self.get_serializer(data=request.data, many=True, context=context)
+        serializer.is_valid(raise_exception=True)
+
+        # One transaction: the rows, catalogue stamp and sync log land together,
+        # and the push (sent on commit by realtime.events.publish) only if they do.
+        with transaction.atomic():
+            clashes = batch_venue_clashes(serializer.validated_data)
+            if clashes:
+                return Response({"clashes": clashes}, status=status.HTTP_400_BAD_REQUEST)
+
+            entries = Timetable.objects.bulk_create(Timetable(**row) for row in serializer.validated_data)
+            record_catalogue_change()
+            log_changes('timetable', entries)
+            timetables_replaced(entry.course_id for entry in entries)
+        return Response(self.get_serializer(entries, many=True).data, status=status.HTTP_201_CREATED)
 
 class TimetableDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Timetable.objects.all()
+    queryset = Timetable.objects.select_related('course')
     serializer_class = TimetableSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    query_budget = 2
+
+class AnalyticsView(APIView):
+    """Enrollment and student figures read from the incrementally maintained summary tables"""
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    query_budget = 5
+
+    def get(self, request):
+        try:
+            days = max(1, min(int(request.query_params.get('days', 90)), 3650))
+        except ValueError:
+            days = 90
+        return Response(dashboard(days=days))
+
+
+class ExportView(APIView):
+    """
+    Stream students, registrations (optionally ?course=<id>) or timetables as
+    ?fmt=csv|ndjson|columnar. Exports over EXPORT_SYNC_ROW_LIMIT rows, or with
+    ?background=1, are queued as an ExportJob instead (202).
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+
+    def get(self, request, dataset):
+        if dataset not in DATASETS:
+            raise Http404
+        fmt = request.query_params.get('fmt', 'csv')
+        if fmt not in FORMATS:
+            return Response({"detail": f"fmt must be one of: {', '.join(FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        params = {}
+        if request.query_params.get('course'):
+            try:
+                params['course'] = int(request.query_params['course'])
+            except ValueError:
+                return Response({"detail": "course must be an id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        _, queryset = export_queryset(dataset, params)
+        if request.query_params.get('background') or cached_count(queryset) > settings.EXPORT_SYNC_ROW_LIMIT:
+            job = ExportJob.objects.create(requested_by=request.user, dataset=dataset, fmt=fmt, params=params)
+            return Response(ExportJobSerializer(job, context={'request': request}).data, status=status.HTTP_202_ACCEPTED)
+
+        response = StreamingHttpResponse(export_chunks(dataset, fmt, params), content_type=FORMATS[fmt][0])
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(dataset, fmt)}"'
+        return response
+
+
+class ExportJobDetailView(generics.RetrieveAPIView):
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+
+
+class ExportJobDownloadView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+
+    def get(self, request, pk):
+        job = generics.get_object_or_404(ExportJob, pk=pk, status='DONE')
+        if not os.path.exists(job.file_path):
+            raise Http404
+        return FileResponse(
+            open(job.file_path, 'rb'),
+            as_attachment=True,
+            filename=os.path.basename(job.file_path),
+            content_type=FORMATS[job.fmt][0],
+        )
@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Announcement
+
+
+@admin.register(Announcement)
+class AnnouncementAdmin(admin.ModelAdmin):
+    list_display = ('title', 'audience_key', 'author', 'created_at')
+    list_filter = ('audience',)
+    search_fields = ('title',)
+    list_select_related = ('author',)
+    raw_id_fields = ('course', 'author')
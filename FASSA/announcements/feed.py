@@ -0,0 +1,60 @@
+"""
+Student feeds, assembled on read. A student has no program or level of their
+own: PROGRAM and LEVEL announcements reach whoever is registered for a course
+of that program or level, so a student carrying a level-300 course over sees
+level-300 announcements, and one who drops a program's last course stops
+seeing that program's.
+"""
+from admin_panel.models import Course
+from students.cache import cached_for_user
+from .models import Announcement, AnnouncementWatermark, build_audience_key
+
+# Badges show "99+" beyond this, so the unread count never scans more rows.
+UNREAD_CAP = 99
+
+
+def audience_keys(user_id):
+    """
+    Audience keys a student belongs to, derived from their registered courses
+    (the programs and levels of those courses, and the courses themselves),
+    never from the student's account. Cached until the student's registrations
+    or the catalogue change.
+    """
+    def build():
+        keys = {build_audience_key('ALL')}
+        rows = Course.objects.filter(registrations__student_id=user_id).values_list('id', 'program', 'level')
+        for course_id, program, level in rows:
+            keys.add(build_audience_key('COURSE', course_id))
+            if program.strip():
+                keys.add(build_audience_key('PROGRAM', program.strip()))
+            if level.strip():
+                keys.add(build_audience_key('LEVEL', level.strip()))
+        return sorted(keys)
+
+    return cached_for_user('audience', user_id, build)
+
+
+def feed_for(user_id):
+    return Announcement.objects.filter(audience_key__in=audience_keys(user_id))
+
+
+def unread_count(user_id):
+    """(count, capped): announcements in the feed newer than the user's watermark, at most UNREAD_CAP."""
+    feed = feed_for(user_id)
+    seen = AnnouncementWatermark.objects.filter(user_id=user_id).values_list('last_seen_at', flat=True).first()
+    if seen is not None:
+        feed = feed.filter(created_at__gt=seen)
+    found = feed.values('id')[:UNREAD_CAP + 1].count()
+    return min(found, UNREAD_CAP), found > UNREAD_CAP
+
+
+def mark_seen(user_id):
+    """Move the watermark to the newest announcement in the feed."""
+    newest = feed_for(user_id).order_by('-created_at').values_list('created_at', flat=True).first()
+    if newest is None:
+        return None
+    watermark, created = AnnouncementWatermark.objects.get_or_create(user_id=user_id, defaults={'last_seen_at': newest})
+    if not created and watermark.last_seen_at < newest:
+        AnnouncementWatermark.objects.filter(user_id=user_id, last_seen_at__lt=newest).update(last_seen_at=newest)
+        watermark.last_seen_at = newest
+    return watermark.last_seen_at
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-17 16:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('admin_panel', '0006_timetable_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Announcement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('audience', models.CharField(choices=[('ALL', 'Everyone'), ('PROGRAM', 'Program'), ('LEVEL', 'Level'), ('COURSE', 'Course')], default='ALL', max_length=10)),
+                ('target', models.CharField(blank=True, help_text='Program or level for PROGRAM/LEVEL announcements.', max_length=120)),
+                ('audience_key', models.CharField(editable=False, max_length=150)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='announcements', to=settings.AUTH_USER_MODEL)),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='announcements', to='admin_panel.course')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['audience_key', '-created_at', '-id'], name='announcement_feed_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AnnouncementWatermark',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='announcement_watermark', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_seen_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -1,3 +1,63 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from admin_panel.models import Course
+
+
+def build_audience_key(audience, value=''):
+    """'ALL:', 'PROGRAM:<name>', 'LEVEL:<name>' or 'COURSE:<id>'; see announcements.feed."""
+    return f"{audience}:{value}"
+
+
+class Announcement(models.Model):
+    """
+    One row per announcement whatever the audience size: feeds are assembled
+    on read by matching audience_key against the reader's audience keys.
+    """
+    AUDIENCE_CHOICES = (
+        ('ALL', 'Everyone'),
+        ('PROGRAM', 'Program'),
+        ('LEVEL', 'Level'),
+        ('COURSE', 'Course'),
+    )
+
+    title = models.CharField(max_length=255)
+    body = models.TextField()
+    audience = models.CharField(max_length=10, choices=AUDIENCE_CHOICES, default='ALL')
+    target = models.CharField(max_length=120, blank=True, help_text="Program or level for PROGRAM/LEVEL announcements.")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, null=True, blank=True, related_name='announcements')
+    audience_key = models.CharField(max_length=150, editable=False)
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='announcements'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['audience_key', '-created_at', '-id'], name='announcement_feed_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.target = self.target.strip()
+        if self.audience == 'COURSE':
+            self.audience_key = build_audience_key('COURSE', self.course_id)
+        elif self.audience == 'ALL':
+            self.audience_key = build_audience_key('ALL')
+        else:
+            self.audience_key = build_audience_key(self.audience, self.target)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.title} ({self.audience_key})"
+
+
+class AnnouncementWatermark(models.Model):
+    """Per-user "seen everything up to" timestamp; unread = feed rows created after it."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='announcement_watermark'
+    )
+    last_seen_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user_id} seen up to {self.last_seen_at}"
@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+from .models import Announcement
+
+
+class AnnouncementSerializer(serializers.ModelSerializer):
+    author_name = serializers.CharField(source='author.full_name', read_only=True, default=None)
+
+    class Meta:
+        model = Announcement
+        fields = ['id', 'title', 'body', 'audience', 'target', 'course', 'audience_key', 'author_name', 'created_at']
+        read_only_fields = ['audience_key', 'created_at']
+
+    def validate(self, attrs):
+        audience = attrs.get('audience', getattr(self.instance, 'audience', 'ALL'))
+        target = attrs.get('target', getattr(self.instance, 'target', '')).strip()
+        course = attrs.get('course', getattr(self.instance, 'course', None))
+
+        if audience in ('PROGRAM', 'LEVEL') and not target:
+            raise serializers.ValidationError({"target": f"A {audience.lower()} is required for this audience."})
+        if audience == 'COURSE' and course is None:
+            raise serializers.ValidationError({"course": "A course is required for this audience."})
+        if audience != 'COURSE':
+            attrs['course'] = None
+        if audience in ('ALL', 'COURSE'):
+            attrs['target'] = ''
+        return attrs
+
+
+class FeedItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Announcement
+        fields = ['id', 'title', 'body', 'audience', 'target', 'course', 'created_at']
@@ -1,3 +1,58 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.testing import log_in, make_user, shared_cache
+from admin_panel.models import Course
+from FASSA.instrumentation import QueryBudgetTestMixin
+from students.models import CourseRegistration
+from .models import Announcement
+
+
+@shared_cache
+class AnnouncementsQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = make_user('feed@ttu.edu.gh')
+        course = Course.objects.create(code='FEED1', title='Feeds', program='Computer Science', level='200')
+        CourseRegistration.objects.create(student=cls.student, course=course)
+        for i in range(3):
+            Announcement.objects.create(title=f'Everyone {i}', body='...')
+            Announcement.objects.create(title=f'Program {i}', body='...', audience='PROGRAM', target='Computer Science')
+            Announcement.objects.create(title=f'Course {i}', body='...', audience='COURSE', course=course)
+
+    def setUp(self):
+        cache.clear()
+        log_in(self.client, self.student)
+
+    def test_feed(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('announcement-feed')))
+
+    def test_unread_count(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('announcement-unread')))
+
+
+class AudienceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_user('carry-over@ttu.edu.gh')
+        own = Course.objects.create(code='CS201', title='Algorithms', program='Computer Science', level='200')
+        self.carried = Course.objects.create(code='MA301', title='Analysis', program='Mathematics', level='300')
+        for course in (own, self.carried):
+            CourseRegistration.objects.create(student=self.student, course=course)
+        for audience, target in (('PROGRAM', 'Mathematics'), ('LEVEL', '300'), ('LEVEL', '200'),
+                                 ('PROGRAM', 'Physics'), ('LEVEL', '400')):
+            Announcement.objects.create(title=f'{audience} {target}', body='...', audience=audience, target=target)
+        log_in(self.client, self.student)
+
+    def feed(self):
+        response = self.client.get(reverse('announcement-feed'))
+        self.assertEqual(response.status_code, 200)
+        return sorted(item['title'] for item in response.data['announcements'])
+
+    def test_audience_follows_registered_courses(self):
+        self.assertEqual(self.feed(), ['LEVEL 200', 'LEVEL 300', 'PROGRAM Mathematics'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseRegistration.objects.filter(student=self.student, course=self.carried).delete()
+        self.assertEqual(self.feed(), ['LEVEL 200'])
@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import AnnouncementListCreateView, AnnouncementDetailView
+from .views import AnnouncementFeedView, UnreadCountView, MarkSeenView
+
+urlpatterns = [
+    path('', AnnouncementListCreateView.as_view(), name='announcement-list-create'),
+    path('<int:pk>/', AnnouncementDetailView.as_view(), name='announcement-detail'),
+    path('feed/', AnnouncementFeedView.as_view(), name='announcement-feed'),
+    path('feed/unread/', UnreadCountView.as_view(), name='announcement-unread'),
+    path('feed/seen/', MarkSeenView.as_view(), name='announcement-seen'),
+]
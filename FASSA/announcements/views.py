@@ -1,3 +1,67 @@
-from django.shortcuts import render
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from accounts.pagination import KeysetPagination
+from accounts.permissions import IsAdmin, IsStudent
+from .feed import feed_for, mark_seen, unread_count
+from .models import Announcement
+from .serializers import AnnouncementSerializer, FeedItemSerializer
+
+
+class FeedPagination(KeysetPagination):
+    ordering_field = 'created_at'
+    results_key = 'announcements'
+    page_size = 20
+    max_page_size = 100
+
+    def is_requested(self, request):
+        return True  # the feed is always paginated
+
+
+class AnnouncementListCreateView(generics.ListCreateAPIView):
+    """Admins post announcements to everyone, a program, a level or a course"""
+    queryset = Announcement.objects.select_related('author')
+    serializer_class = AnnouncementSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    pagination_class = FeedPagination
+
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user)
+
+
+class AnnouncementDetailView(generics.RetrieveUpdateDestroyAPIView):
+    queryset = Announcement.objects.select_related('author')
+    serializer_class = AnnouncementSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+
+
+class AnnouncementFeedView(generics.ListAPIView):
+    """Announcements addressed to the logged-in student, newest first"""
+    serializer_class = FeedItemSerializer
+    permission_classes = [permissions.IsAuthenticated, IsStudent]
+    pagination_class = FeedPagination
+    stateless_auth = True
+    query_budget = 3
+
+    def get_queryset(self):
+        return feed_for(self.request.user.id)
+
+
+class UnreadCountView(APIView):
+    """Badge count: announcements newer than the student's last-seen watermark"""
+    permission_classes = [permissions.IsAuthenticated, IsStudent]
+    stateless_auth = True
+    query_budget = 3
+
+    def get(self, request):
+        count, capped = unread_count(request.user.id)
+        return Response({"unread": count, "capped": capped})
+
+
+class MarkSeenView(APIView):
+    """Mark everything currently in the student's feed as read"""
+    permission_classes = [permissions.IsAuthenticated, IsStudent]
+
+    def post(self, request):
+        return Response({"last_seen_at": mark_seen(request.user.id)})
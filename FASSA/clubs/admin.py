@@ -1,3 +1,25 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Club, ClubMembership, JoinRequest
+
+
+@admin.register(Club)
+class ClubAdmin(admin.ModelAdmin):
+    list_display = ('name', 'requires_approval', 'created_at')
+    search_fields = ('name',)
+
+
+@admin.register(ClubMembership)
+class ClubMembershipAdmin(admin.ModelAdmin):
+    list_display = ('club', 'user', 'role', 'joined_at')
+    list_filter = ('role',)
+    list_select_related = ('club', 'user')
+    raw_id_fields = ('club', 'user')
+
+
+@admin.register(JoinRequest)
+class JoinRequestAdmin(admin.ModelAdmin):
+    list_display = ('club', 'user', 'status', 'created_at')
+    list_filter = ('status',)
+    list_select_related = ('club', 'user')
+    raw_id_fields = ('club', 'user', 'decided_by')
@@ -0,0 +1,151 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, Q
+from django.test.utils import CaptureQueriesContext
+
+from admin_panel.analytics import students_added
+from clubs.membership import club_role, invalidate_memberships
+from clubs.models import Club, ClubMembership
+
+User = get_user_model()
+
+BENCH_EMAIL_PREFIX = 'zzclub'
+BENCH_CLUB_PREFIX = 'ZZ Bench Club'
+
+
+class Command(BaseCommand):
+    help = "Seed students/clubs/memberships and time membership checks and member listings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=50_000)
+        parser.add_argument('--clubs', type=int, default=500)
+        parser.add_argument('--max-clubs-per-student', type=int, default=6)
+        parser.add_argument('--checks', type=int, default=20_000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--skip-seed', action='store_true')
+        parser.add_argument('--cleanup', action='store_true', help="Delete the synthetic rows afterwards.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(11)
+        if not options['skip_seed']:
+            self.seed(rng, options['students'], options['clubs'], options['max_clubs_per_student'])
+
+        user_ids = list(User.objects.filter(email__startswith=BENCH_EMAIL_PREFIX).values_list('id', flat=True))
+        club_ids = list(Club.objects.filter(name__startswith=BENCH_CLUB_PREFIX).values_list('id', flat=True))
+        self.stdout.write(f"Database vendor: {connection.vendor}; {len(user_ids)} students, {len(club_ids)} clubs, "
+                          f"{ClubMembership.objects.filter(club_id__in=club_ids).count()} memberships")
+
+        pairs = [(rng.choice(user_ids), rng.choice(club_ids)) for _ in range(options['checks'])]
+        invalidate_memberships(*{user_id for user_id, _ in pairs})
+        self.time_checks("DB query per check", pairs,
+                         lambda u, c: ClubMembership.objects.filter(user_id=u, club_id=c).exists())
+        self.time_checks("Cached map (cold)", pairs, club_role)
+        self.time_checks("Cached map (warm)", pairs, club_role)
+
+        biggest = (
+            Club.objects.filter(id__in=club_ids).annotate(n=Count('memberships')).order_by('-n').values('id', 'n').first()
+        )
+        if biggest:
+            self.stdout.write(f"\nListing every member of the largest club ({biggest['n']} members):")
+            members = ClubMembership.objects.filter(club_id=biggest['id']).select_related('user')
+            self.time_listing("OFFSET pages", lambda: self.offset_pages(members, options['page_size']))
+            self.time_listing("Keyset pages", lambda: self.keyset_pages(members, options['page_size']))
+
+        if options['cleanup']:
+            User.objects.filter(email__startswith=BENCH_EMAIL_PREFIX).delete()
+            Club.objects.filter(name__startswith=BENCH_CLUB_PREFIX).delete()
+
+    def time_checks(self, label, pairs, check):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for user_id, club_id in pairs:
+                check(user_id, club_id)
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label:<22} {elapsed / len(pairs) * 1e6:9.1f} us/check  {len(queries):>7} queries"
+        )
+
+    def time_listing(self, label, run):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            pages, slowest = run()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label:<22} {pages:>5} pages  total {elapsed * 1000:9.1f} ms  "
+            f"slowest page {slowest * 1000:7.2f} ms  {len(queries)} queries"
+        )
+
+    def offset_pages(self, members, page_size):
+        ordered = members.order_by('-joined_at', '-id')
+        pages = slowest = 0
+        offset = 0
+        while True:
+            start = time.perf_counter()
+            rows = list(ordered[offset:offset + page_size])
+            slowest = max(slowest, time.perf_counter() - start)
+            if not rows:
+                return pages, slowest
+            pages += 1
+            offset += page_size
+
+    def keyset_pages(self, members, page_size):
+        """Same filter KeysetPagination applies for a cursor."""
+        ordered = members.order_by('-joined_at', '-id')
+        pages = slowest = 0
+        last = None
+        while True:
+            page = ordered
+            if last is not None:
+                page = page.filter(Q(joined_at__lt=last.joined_at) | Q(joined_at=last.joined_at, id__lt=last.id))
+            start = time.perf_counter()
+            rows = list(page[:page_size])
+            slowest = max(slowest, time.perf_counter() - start)
+            if not rows:
+                return pages, slowest
+            pages += 1
+            last = rows[-1]
+
+    def seed(self, rng, students, clubs, max_per_student):
+        password = make_password('benchmark-password')
+        existing = User.objects.filter(email__startswith=BENCH_EMAIL_PREFIX).count()
+        created = User.objects.bulk_create(
+            (
+                User(
+                    email=f'{BENCH_EMAIL_PREFIX}{i}@ttu.edu.gh',
+                    full_name=f'Club Student {i}',
+                    index_number=f'ZZC{i:07d}',
+                    role='STUDENT',
+                    password=password,
+                )
+                for i in range(existing, students)
+            ),
+            batch_size=5000,
+        )
+        students_added(created)
+
+        existing = Club.objects.filter(name__startswith=BENCH_CLUB_PREFIX).count()
+        Club.objects.bulk_create(
+            (Club(name=f'{BENCH_CLUB_PREFIX} {i:04d}') for i in range(existing, clubs)),
+            batch_size=5000,
+        )
+        club_ids = list(Club.objects.filter(name__startswith=BENCH_CLUB_PREFIX).order_by('id').values_list('id', flat=True))
+        # Zipf-like popularity so a few clubs have thousands of members.
+        weights = [1 / (rank + 1) for rank in range(len(club_ids))]
+        ClubMembership.objects.bulk_create(
+            (
+                ClubMembership(user=user, club_id=club_id, role='ADMIN' if rng.random() < 0.01 else 'MEMBER')
+                for user in created
+                for club_id in set(rng.choices(club_ids, weights, k=rng.randint(0, max_per_student)))
+            ),
+            batch_size=5000,
+            ignore_conflicts=True,
+        )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE clubs_club')
+                cursor.execute('ANALYZE clubs_clubmembership')
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import ClubMembership
+
+MANAGER_ROLES = ('OFFICER', 'ADMIN')
+ROLE_RANKS = {'MEMBER': 0, 'OFFICER': 1, 'ADMIN': 2}
+
+
+def membership_key(user_id):
+    return f'clubs:memberships:{user_id}'
+
+
+def memberships(user_id):
+    """
+    {club_id: role} for one user, loaded with a single query and cached until
+    one of their memberships changes (see clubs.signals). Club-scoped
+    permission checks are a dict lookup on this map.
+    """
+    key = membership_key(user_id)
+    data = cache.get(key)
+    if data is None:
+        data = dict(ClubMembership.objects.filter(user_id=user_id).values_list('club_id', 'role'))
+        cache.set(key, data, getattr(settings, 'CLUB_MEMBERSHIP_CACHE_TIMEOUT', 3600))
+    return data
+
+
+def club_role(user_id, club_id):
+    return memberships(user_id).get(int(club_id))
+
+
+def invalidate_memberships(*user_ids):
+    """
+    Call after membership writes that bypass model signals (bulk_create,
+    queryset update/delete), after the transaction commits.
+    """
+    cache.delete_many([membership_key(user_id) for user_id in user_ids])
@@ -1,3 +1,69 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class Club(models.Model):
+    name = models.CharField(max_length=150, unique=True)
+    description = models.TextField(blank=True)
+    requires_approval = models.BooleanField(default=True, help_text="If off, students join without a request.")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='clubs_created'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ClubMembership(models.Model):
+    ROLE_CHOICES = (
+        ('MEMBER', 'Member'),
+        ('OFFICER', 'Officer'),
+        ('ADMIN', 'Club Admin'),
+    )
+
+    club = models.ForeignKey(Club, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='club_memberships')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='MEMBER')
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('club', 'user')
+        indexes = [
+            # Member listings: keyset pages on (joined_at, id) within a club.
+            models.Index(fields=['club', '-joined_at', '-id'], name='club_members_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in {self.club_id} ({self.role})"
+
+
+class JoinRequest(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('APPROVED', 'Approved'),
+        ('REJECTED', 'Rejected'),
+    )
+
+    club = models.ForeignKey(Club, on_delete=models.CASCADE, related_name='join_requests')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='club_join_requests')
+    message = models.CharField(max_length=500, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    created_at = models.DateTimeField(auto_now_add=True)
+    decided_at = models.DateTimeField(null=True, blank=True)
+    decided_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['club', 'user'], condition=models.Q(status='PENDING'), name='one_pending_join_request'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['club', 'status', 'created_at'], name='join_request_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.club_id} ({self.status})"
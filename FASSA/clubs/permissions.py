@@ -0,0 +1,33 @@
+from rest_framework.permissions import BasePermission, SAFE_METHODS
+
+from .membership import MANAGER_ROLES, club_role
+
+
+def is_faculty(user):
+    return user.role in ('ADMIN', 'SUPERADMIN')
+
+
+class IsClubMember(BasePermission):
+    """Any member of the club in the URL (faculty admins always pass)."""
+    def has_permission(self, request, view):
+        user = request.user
+        return user.is_authenticated and (is_faculty(user) or club_role(user.id, view.kwargs['club_id']) is not None)
+
+
+class IsClubManager(BasePermission):
+    """Club officers and admins (faculty admins always pass)."""
+    def has_permission(self, request, view):
+        user = request.user
+        return user.is_authenticated and (is_faculty(user) or club_role(user.id, view.kwargs['club_id']) in MANAGER_ROLES)
+
+
+class IsClubAdmin(BasePermission):
+    """Club admins (faculty admins always pass)."""
+    def has_permission(self, request, view):
+        user = request.user
+        return user.is_authenticated and (is_faculty(user) or club_role(user.id, view.kwargs['club_id']) == 'ADMIN')
+
+
+class IsClubAdminOrReadOnly(IsClubAdmin):
+    def has_permission(self, request, view):
+        return request.method in SAFE_METHODS or super().has_permission(request, view)
@@ -0,0 +1,48 @@
+from rest_framework import serializers
+
+from .models import Club, ClubMembership, JoinRequest
+
+
+class ClubSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Club
+        fields = ['id', 'name', 'description', 'requires_approval', 'created_at']
+        read_only_fields = ['created_at']
+
+
+class MyClubSerializer(ClubSerializer):
+    role = serializers.SerializerMethodField()
+
+    class Meta(ClubSerializer.Meta):
+        fields = ClubSerializer.Meta.fields + ['role']
+
+    def get_role(self, obj):
+        return self.context['roles'].get(obj.id)
+
+
+class MemberSerializer(serializers.ModelSerializer):
+    user_id = serializers.IntegerField(read_only=True)
+    full_name = serializers.CharField(source='user.full_name', read_only=True)
+    email = serializers.EmailField(source='user.email', read_only=True)
+    index_number = serializers.CharField(source='user.index_number', read_only=True)
+
+    class Meta:
+        model = ClubMembership
+        fields = ['user_id', 'full_name', 'email', 'index_number', 'role', 'joined_at']
+        read_only_fields = ['joined_at']
+
+
+class MemberRoleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ClubMembership
+        fields = ['role']
+
+
+class JoinRequestSerializer(serializers.ModelSerializer):
+    full_name = serializers.CharField(source='user.full_name', read_only=True)
+    email = serializers.EmailField(source='user.email', read_only=True)
+
+    class Meta:
+        model = JoinRequest
+        fields = ['id', 'user', 'full_name', 'email', 'message', 'status', 'created_at', 'decided_at']
+        read_only_fields = ['user', 'status', 'created_at', 'decided_at']
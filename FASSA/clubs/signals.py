@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .membership import invalidate_memberships
+from .models import ClubMembership
+
+
+@receiver([post_save, post_delete], sender=ClubMembership)
+def membership_changed(sender, instance, **kwargs):
+    # After commit: invalidating earlier lets a concurrent read cache the old role again.
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_memberships(user_id))
@@ -1,3 +1,92 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.testing import log_in, make_user, shared_cache
+from FASSA.instrumentation import QueryBudgetTestMixin
+from .membership import club_role
+from .models import Club, ClubMembership, JoinRequest
+
+
+@shared_cache
+class ClubsQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = make_user('officer@ttu.edu.gh')
+        cls.club = Club.objects.create(name='Chess')
+        Club.objects.create(name='Drama')
+        ClubMembership.objects.create(club=cls.club, user=cls.officer, role='OFFICER')
+        for i in range(3):
+            ClubMembership.objects.create(club=cls.club, user=make_user(f'member{i}@ttu.edu.gh'))
+            JoinRequest.objects.create(club=cls.club, user=make_user(f'applicant{i}@ttu.edu.gh'))
+
+    def setUp(self):
+        cache.clear()
+        log_in(self.client, self.officer)
+
+    def test_club_list(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('club-list-create')))
+
+    def test_my_clubs(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('my-clubs')))
+
+    def test_members(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('club-members', args=[self.club.pk])))
+
+    def test_join_requests(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('club-join-requests', args=[self.club.pk])))
+
+
+class ClubMemberManagementTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.club = Club.objects.create(name='Debate')
+        cls.users = {}
+        for name, role in [('admin', 'ADMIN'), ('officer', 'OFFICER'), ('officer2', 'OFFICER'), ('member', 'MEMBER')]:
+            cls.users[name] = make_user(f'{name}@ttu.edu.gh')
+            ClubMembership.objects.create(club=cls.club, user=cls.users[name], role=role)
+
+    def setUp(self):
+        cache.clear()
+
+    def as_user(self, name):
+        log_in(self.client, self.users[name])
+
+    def url(self, name):
+        return reverse('club-member-detail', args=[self.club.pk, self.users[name].pk])
+
+    def role(self, name):
+        return ClubMembership.objects.filter(club=self.club, user=self.users[name]).values_list('role', flat=True).first()
+
+    def test_officers_remove_only_plain_members(self):
+        self.as_user('officer')
+        self.assertEqual(self.client.delete(self.url('officer2')).status_code, 403)
+        self.assertEqual(self.client.delete(self.url('admin')).status_code, 403)
+        self.assertEqual(self.client.delete(self.url('member')).status_code, 204)
+
+    def test_admins_cannot_remove_or_demote_other_admins(self):
+        second = make_user('admin2@ttu.edu.gh')
+        ClubMembership.objects.create(club=self.club, user=second, role='ADMIN')
+        self.as_user('admin')
+        url = reverse('club-member-detail', args=[self.club.pk, second.pk])
+        self.assertEqual(self.client.delete(url).status_code, 403)
+        self.assertEqual(self.client.patch(url, {'role': 'MEMBER'}, content_type='application/json').status_code, 403)
+        self.assertEqual(self.client.delete(self.url('officer')).status_code, 204)
+
+    def test_the_last_admin_can_neither_leave_nor_step_down(self):
+        self.as_user('admin')
+        self.assertEqual(self.client.delete(self.url('admin')).status_code, 400)
+        response = self.client.patch(self.url('admin'), {'role': 'OFFICER'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.role('admin'), 'ADMIN')
+
+        self.client.patch(self.url('officer'), {'role': 'ADMIN'}, content_type='application/json')
+        self.assertEqual(self.client.delete(self.url('admin')).status_code, 204)
+
+    def test_roles_are_cached_again_only_after_commit(self):
+        self.assertEqual(club_role(self.users['member'].pk, self.club.pk), 'MEMBER')
+        with self.captureOnCommitCallbacks(execute=True):
+            ClubMembership.objects.filter(club=self.club, user=self.users['member']).get().delete()
+            # Not invalidated yet: other connections still read the old row until the commit.
+            self.assertEqual(club_role(self.users['member'].pk, self.club.pk), 'MEMBER')
+        self.assertIsNone(club_role(self.users['member'].pk, self.club.pk))
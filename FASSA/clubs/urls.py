@@ -0,0 +1,15 @@
+from django.urls import path
+from .views import ClubListCreateView, ClubDetailView, MyClubsView
+from .views import ClubMemberListView, ClubMemberDetailView
+from .views import JoinClubView, JoinRequestListView, JoinRequestDecisionView
+
+urlpatterns = [
+    path('', ClubListCreateView.as_view(), name='club-list-create'),
+    path('mine/', MyClubsView.as_view(), name='my-clubs'),
+    path('<int:club_id>/', ClubDetailView.as_view(), name='club-detail'),
+    path('<int:club_id>/members/', ClubMemberListView.as_view(), name='club-members'),
+    path('<int:club_id>/members/<int:user_id>/', ClubMemberDetailView.as_view(), name='club-member-detail'),
+    path('<int:club_id>/join/', JoinClubView.as_view(), name='club-join'),
+    path('<int:club_id>/requests/', JoinRequestListView.as_view(), name='club-join-requests'),
+    path('<int:club_id>/requests/<int:pk>/<str:decision>/', JoinRequestDecisionView.as_view(), name='club-join-decision'),
+]
@@ -1,3 +1,182 @@
-from django.shortcuts import render
+from django.db import IntegrityError, transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import filters, generics, permissions, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from accounts.pagination import KeysetPagination
+from accounts.permissions import IsAdmin, IsStudent, ReadOnly
+from .membership import ROLE_RANKS, club_role, memberships
+from .models import Club, ClubMembership, JoinRequest
+from .permissions import IsClubAdmin, IsClubAdminOrReadOnly, IsClubManager, is_faculty
+from .serializers import ClubSerializer, JoinRequestSerializer, MemberRoleSerializer, MemberSerializer
+from .serializers import MyClubSerializer
+
+
+class MemberPagination(KeysetPagination):
+    ordering_field = 'joined_at'
+    results_key = 'members'
+    page_size = 100
+
+    def is_requested(self, request):
+        return True  # clubs can have thousands of members
+
+
+class ClubListCreateView(generics.ListCreateAPIView):
+    """List clubs; faculty admins create them"""
+    queryset = Club.objects.order_by('name')
+    serializer_class = ClubSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdmin | ReadOnly]
+    filter_backends = [filters.SearchFilter]
+    search_fields = ['name']
+    stateless_auth = True
+    query_budget = 1
+
+    def perform_create(self, serializer):
+        serializer.save(created_by_id=self.request.user.id)
+
+
+class ClubDetailView(generics.RetrieveUpdateDestroyAPIView):
+    queryset = Club.objects.all()
+    serializer_class = ClubSerializer
+    permission_classes = [permissions.IsAuthenticated, IsClubAdminOrReadOnly]
+    lookup_url_kwarg = 'club_id'
+
+
+class MyClubsView(APIView):
+    """Clubs the logged-in user belongs to, with their role in each"""
+    permission_classes = [permissions.IsAuthenticated]
+    stateless_auth = True
+    query_budget = 2
+
+    def get(self, request):
+        roles = memberships(request.user.id)
+        clubs = Club.objects.filter(id__in=roles).order_by('name')
+        return Response(MyClubSerializer(clubs, many=True, context={'roles': roles}).data)
+
+
+class ClubMemberListView(generics.ListAPIView):
+    """Members of a club, newest first, in keyset pages (club officers/admins)"""
+    serializer_class = MemberSerializer
+    permission_classes = [permissions.IsAuthenticated, IsClubManager]
+    pagination_class = MemberPagination
+    stateless_auth = True
+    query_budget = 3
+
+    def get_queryset(self):
+        return ClubMembership.objects.filter(club_id=self.kwargs['club_id']).select_related('user')
+
+
+class ClubMemberDetailView(APIView):
+    """
+    PATCH a member's role (club admins); DELETE removes a member (officers/admins) or leaves the club (self).
+    Club officers and admins only act on members below their own role, and a club always keeps one admin.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def lock_membership(self, club_id, user_id):
+        """
+        Lock the club's admin rows, then the target row (always in that order, so
+        two requests cannot deadlock). Returns (membership, admin user ids).
+        """
+        admins = set(
+            ClubMembership.objects.select_for_update().filter(club_id=club_id, role='ADMIN')
+            .order_by('pk').values_list('user_id', flat=True)
+        )
+        membership = get_object_or_404(ClubMembership.objects.select_for_update(), club_id=club_id, user_id=user_id)
+        return membership, admins
+
+    def check_rank(self, request, membership):
+        if request.user.id == membership.user_id or is_faculty(request.user):
+            return
+        own_role = club_role(request.user.id, membership.club_id)
+        if ROLE_RANKS.get(own_role, -1) <= ROLE_RANKS[membership.role]:
+            raise PermissionDenied("You can only manage members below your own role.")
+
+    def check_admin_remains(self, membership, admins):
+        if membership.role == 'ADMIN' and not admins - {membership.user_id}:
+            raise ValidationError({"detail": "A club must keep at least one admin."})
+
+    def patch(self, request, club_id, user_id):
+        if not IsClubAdmin().has_permission(request, self):
+            raise PermissionDenied("Only club admins can change roles.")
+        with transaction.atomic():
+            membership, admins = self.lock_membership(club_id, user_id)
+            self.check_rank(request, membership)
+            serializer = MemberRoleSerializer(membership, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            if serializer.validated_data.get('role', membership.role) != 'ADMIN':
+                self.check_admin_remains(membership, admins)
+            serializer.save()
+        return Response(MemberSerializer(membership).data)
+
+    def delete(self, request, club_id, user_id):
+        is_self = request.user.id == user_id
+        if not is_self and not IsClubManager().has_permission(request, self):
+            raise PermissionDenied("Only club officers and admins can remove members.")
+        with transaction.atomic():
+            membership, admins = self.lock_membership(club_id, user_id)
+            self.check_rank(request, membership)
+            self.check_admin_remains(membership, admins)
+            membership.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class JoinClubView(APIView):
+    """Ask to join a club; open clubs admit the student straight away"""
+    permission_classes = [permissions.IsAuthenticated, IsStudent]
+
+    def post(self, request, club_id):
+        club = get_object_or_404(Club, pk=club_id)
+        if club_role(request.user.id, club.pk) is not None:
+            raise ValidationError({"detail": "You are already a member of this club."})
+
+        if not club.requires_approval:
+            ClubMembership.objects.get_or_create(club=club, user_id=request.user.id)
+            return Response({"detail": "Joined.", "status": "JOINED"}, status=status.HTTP_201_CREATED)
+
+        serializer = JoinRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                join_request = serializer.save(club=club, user_id=request.user.id)
+        except IntegrityError:
+            raise ValidationError({"detail": "You already have a pending request for this club."})
+        return Response(JoinRequestSerializer(join_request).data, status=status.HTTP_201_CREATED)
+
+
+class JoinRequestListView(generics.ListAPIView):
+    """Pending join requests, oldest first (club officers/admins)"""
+    serializer_class = JoinRequestSerializer
+    permission_classes = [permissions.IsAuthenticated, IsClubManager]
+    stateless_auth = True
+    query_budget = 2
+
+    def get_queryset(self):
+        return (
+            JoinRequest.objects.filter(club_id=self.kwargs['club_id'], status='PENDING')
+            .select_related('user').order_by('created_at')
+        )
+
+
+class JoinRequestDecisionView(APIView):
+    """POST .../approve/ or .../reject/ on a pending request (club officers/admins)"""
+    permission_classes = [permissions.IsAuthenticated, IsClubManager]
+    decisions = {'approve': 'APPROVED', 'reject': 'REJECTED'}
+
+    def post(self, request, club_id, pk, decision):
+        if decision not in self.decisions:
+            raise ValidationError({"detail": "Decision must be 'approve' or 'reject'."})
+        with transaction.atomic():
+            join_request = get_object_or_404(
+                JoinRequest.objects.select_for_update(), pk=pk, club_id=club_id, status='PENDING'
+            )
+            join_request.status = self.decisions[decision]
+            join_request.decided_at = timezone.now()
+            join_request.decided_by_id = request.user.id
+            join_request.save(update_fields=['status', 'decided_at', 'decided_by'])
+            if join_request.status == 'APPROVED':
+                ClubMembership.objects.get_or_create(club_id=club_id, user_id=join_request.user_id)
+        return Response(JoinRequestSerializer(join_request).data)
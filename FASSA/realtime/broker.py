@@ -0,0 +1,178 @@
+"""
+Pub/sub between the code that changes data and the push streams.
+
+A message is {"users": [ids], "audience": key or None, "event": {...}}: it is
+delivered to the open streams of those users, plus every stream subscribed to
+the announcement audience key. Publishing happens in sync code (signals,
+commands, worker threads); streams live on the ASGI event loop, so delivery
+always hops onto the subscriber's loop.
+
+InProcessBroker only reaches streams held by the publishing process, which is
+what tests and single-process servers need (see check_single_process).
+RedisBroker relays messages through a Redis channel so a write handled by any
+process reaches the streams of all of them.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'fassa:push'
+
+
+class Subscription:
+    """One open stream. Events wait in a bounded queue until the stream writes them."""
+
+    def __init__(self, user_id, audience_keys, loop):
+        self.user_id = user_id
+        self.audience_keys = tuple(audience_keys)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=settings.PUSH_QUEUE_SIZE)
+        self.overflowed = False
+        self.closed = False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client is not reading; it gets a "resync" and is disconnected.
+            self.overflowed = True
+
+    def close(self):
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class InProcessBroker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_user = defaultdict(set)
+        self.by_audience = defaultdict(set)
+
+    def subscribe(self, user_id, audience_keys=()):
+        """Call on the event loop that will read the subscription."""
+        subscription = Subscription(user_id, audience_keys, asyncio.get_running_loop())
+        with self.lock:
+            self.by_user[user_id].add(subscription)
+            for key in subscription.audience_keys:
+                self.by_audience[key].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            discard(self.by_user, subscription.user_id, subscription)
+            for key in subscription.audience_keys:
+                discard(self.by_audience, key, subscription)
+
+    def connections(self):
+        with self.lock:
+            return sum(len(subscriptions) for subscriptions in self.by_user.values())
+
+    def publish(self, message):
+        self.deliver(message)
+
+    def deliver(self, message):
+        """Hand the event to the matching streams of this process; safe to call from any thread."""
+        with self.lock:
+            targets = set()
+            for user_id in message.get('users') or ():
+                targets.update(self.by_user.get(user_id, ()))
+            if message.get('audience'):
+                targets.update(self.by_audience.get(message['audience'], ()))
+        event = message['event']
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:  # loop already closed (server shutting down)
+                pass
+
+
+class RedisBroker(InProcessBroker):
+    """Needs the `redis` package and PUSH_REDIS_URL."""
+
+    def __init__(self):
+        super().__init__()
+        import redis
+
+        self.client = redis.Redis.from_url(settings.PUSH_REDIS_URL)
+        self.listener = None
+
+    def publish(self, message):
+        self.client.publish(CHANNEL, json.dumps(message, cls=DjangoJSONEncoder))
+
+    def subscribe(self, user_id, audience_keys=()):
+        subscription = super().subscribe(user_id, audience_keys)
+        if self.listener is None or self.listener.done():
+            self.listener = subscription.loop.create_task(self.listen())
+        return subscription
+
+    async def listen(self):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(settings.PUSH_REDIS_URL)
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(CHANNEL)
+                async for item in pubsub.listen():
+                    if item['type'] == 'message':
+                        self.deliver(json.loads(item['data']))
+        except Exception:
+            # Restarted by the next subscribe(); streams resync when they reconnect.
+            logger.exception("Push listener lost its Redis connection.")
+        finally:
+            await client.aclose()
+
+
+def discard(index, key, subscription):
+    subscriptions = index.get(key)
+    if subscriptions is not None:
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del index[key]
+
+
+def check_single_process():
+    """
+    Run when the ASGI application starts. With InProcessBroker, events published
+    by any other process (another server worker, a WSGI server, a management
+    command) never reach this process's streams, so several workers are
+    refused outright and a single one logs a warning.
+    """
+    if import_string(settings.PUSH_BROKER) is not InProcessBroker:
+        return
+    workers = int(os.environ.get('WEB_CONCURRENCY') or 1)
+    if workers > 1:
+        raise ImproperlyConfigured(
+            f"PUSH_BROKER is InProcessBroker but WEB_CONCURRENCY is {workers}: events published in one worker "
+            "would never reach streams held by the others. Set PUSH_BROKER to realtime.broker.RedisBroker."
+        )
+    # Not gated on DEBUG, which settings.py leaves on in every environment.
+    logger.warning(
+        "Push events use InProcessBroker, so only writes made in this process reach its streams. "
+        "Run a single ASGI process that handles every write, or set PUSH_BROKER to realtime.broker.RedisBroker."
+    )
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.PUSH_BROKER)()
+    return _broker
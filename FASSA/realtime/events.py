@@ -0,0 +1,60 @@
+import logging
+
+from django.db import transaction
+
+from students.models import CourseRegistration
+from .broker import get_broker
+
+logger = logging.getLogger(__name__)
+
+
+def students_of(course_ids):
+    return list(
+        CourseRegistration.objects.filter(course_id__in=course_ids)
+        .values_list('student_id', flat=True).distinct()
+    )
+
+
+def publish(event_type, data, users=(), audience=None):
+    """Push `data` to the users' (or the audience's) streams once the current transaction commits."""
+    message = {'users': list(users), 'audience': audience, 'event': {'type': event_type, 'data': data}}
+    if not message['users'] and not audience:
+        return
+
+    def send():
+        try:
+            get_broker().publish(message)
+        except Exception:
+            # Pushes are best effort; clients resync from the API on reconnect.
+            logger.exception("Could not publish %s.", event_type)
+
+    transaction.on_commit(send)
+
+
+def timetable_entry(entry):
+    return {
+        'id': entry.pk,
+        'course': entry.course_id,
+        'day_of_week': entry.day_of_week,
+        'start_time': entry.start_time,
+        'end_time': entry.end_time,
+        'venue': entry.venue,
+    }
+
+
+def course_details(course):
+    return {
+        'id': course.pk,
+        'code': course.code,
+        'title': course.title,
+        'lecturer': course.lecturer,
+        'level': course.level,
+        'semester': course.semester,
+    }
+
+
+def timetables_replaced(course_ids):
+    """Call after bulk timetable writes (which skip signals); clients refetch those courses' slots."""
+    course_ids = sorted(set(course_ids))
+    if course_ids:
+        publish('timetable.replaced', {'courses': course_ids}, users=students_of(course_ids))
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from admin_panel.models import Course, Timetable
+from announcements.models import Announcement
+from .events import course_details, publish, students_of, timetable_entry
+
+
+@receiver(post_init, sender=Timetable)
+def remember_course(sender, instance, **kwargs):
+    instance._push_course_id = instance.__dict__.get('course_id')
+
+
+@receiver(post_save, sender=Timetable)
+def timetable_saved(sender, instance, created, **kwargs):
+    # Moving an entry to another course is a removal for the old course's students.
+    previous = instance._push_course_id
+    if not created and previous is not None and previous != instance.course_id:
+        publish('timetable.deleted', {'id': instance.pk, 'course': previous}, users=students_of([previous]))
+    publish('timetable.saved', timetable_entry(instance), users=students_of([instance.course_id]))
+    instance._push_course_id = instance.course_id
+
+
+# Registrations are gone by post_delete when a course delete cascades, so
+# the audience is captured before anything is deleted.
+
+@receiver(pre_delete, sender=Timetable)
+def timetable_deleting(sender, instance, **kwargs):
+    instance._push_students = students_of([instance.course_id])
+
+
+@receiver(post_delete, sender=Timetable)
+def timetable_deleted(sender, instance, **kwargs):
+    publish('timetable.deleted', {'id': instance.pk, 'course': instance.course_id},
+            users=getattr(instance, '_push_students', ()))
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, created, **kwargs):
+    if not created:
+        publish('course.updated', course_details(instance), users=students_of([instance.pk]))
+
+
+@receiver(pre_delete, sender=Course)
+def course_deleting(sender, instance, **kwargs):
+    instance._push_students = students_of([instance.pk])
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    publish('course.deleted', {'id': instance.pk}, users=getattr(instance, '_push_students', ()))
+
+
+@receiver(post_save, sender=Announcement)
+def announcement_posted(sender, instance, created, **kwargs):
+    if created:
+        publish('announcement.created', {
+            'id': instance.pk,
+            'title': instance.title,
+            'audience': instance.audience,
+            'course': instance.course_id,
+            'created_at': instance.created_at,
+        }, audience=instance.audience_key)
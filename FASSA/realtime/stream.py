@@ -0,0 +1,136 @@
+"""
+Server-sent events at PUSH_PATH (GET /api/push/?token=<access token>).
+
+The stream is a plain ASGI app mounted in front of Django (see FASSA.asgi).
+A Django request keeps a worker thread for as long as the response is open,
+so long-lived streams bypass it: authentication reads the JWT claims only
+(the user row too without SHARED_CACHE), the database lookups run on the
+default thread pool and give their connection back, and an idle stream is just
+a coroutine waiting on its queue. Holding ~10k of them needs the usual
+server limits raised (open files, uvicorn --limit-concurrency / --backlog).
+
+Events: `ready` on connect, then `timetable.saved`, `timetable.deleted`,
+`timetable.replaced`, `course.updated`, `course.deleted` and
+`announcement.created` as they happen, with a comment line every
+PUSH_HEARTBEAT_SECONDS so proxies keep the connection open. A `resync`
+event means the client fell behind and should reload from the API.
+"""
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from accounts.authentication import StatelessReadJWTAuthentication
+from announcements.feed import audience_keys
+from FASSA.instrumentation import RequestMetrics, registry
+from .broker import check_single_process, get_broker
+
+
+def stream_user(token):
+    try:
+        return StatelessReadJWTAuthentication().token_user(token)
+    finally:
+        connections.close_all()
+
+
+def stream_audiences(user_id):
+    try:
+        return audience_keys(user_id)
+    finally:
+        connections.close_all()
+
+
+def raw_token(scope):
+    token = parse_qs(scope.get('query_string', b'').decode()).get('token')
+    if token:
+        return token[0]
+    # EventSource cannot set headers, but other clients may.
+    for name, value in scope.get('headers', ()):
+        if name == b'authorization':
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0] == 'Bearer':
+                return parts[1]
+    return None
+
+
+def sse(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n".encode()
+
+
+async def plain_response(send, status, message):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': json.dumps({'detail': message}).encode()})
+
+
+async def push_stream(scope, receive, send):
+    if scope['method'] != 'GET':
+        return await plain_response(send, 405, "Method not allowed.")
+    token = raw_token(scope)
+    if token is None:
+        return await plain_response(send, 401, "Authentication credentials were not provided.")
+    try:
+        # is_revoked reads the cache, which may be a network round trip.
+        user = await sync_to_async(stream_user, thread_sensitive=False)(token)
+    except (InvalidToken, AuthenticationFailed) as exc:
+        return await plain_response(send, 401, str(exc.detail))
+    if user.role != 'STUDENT':
+        return await plain_response(send, 403, "Only students can subscribe to updates.")
+
+    keys = await sync_to_async(stream_audiences, thread_sensitive=False)(user.id)
+    broker = get_broker()
+    subscription = broker.subscribe(user.id, keys)
+    started = time.perf_counter()
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        subscription.close()
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),  # stop nginx from buffering the stream
+        ]})
+        await send({'type': 'http.response.body', 'body': b'retry: 5000\n\n' + sse('ready', {}), 'more_body': True})
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), settings.PUSH_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                chunk = b': ping\n\n'
+            else:
+                if event is None or subscription.closed:
+                    break
+                chunk = sse(event['type'], event['data'])
+            if subscription.overflowed:
+                chunk = sse('resync', {})
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': not subscription.overflowed})
+            if subscription.overflowed:
+                break
+    except OSError:  # client went away mid-write
+        pass
+    finally:
+        watcher.cancel()
+        broker.unsubscribe(subscription)
+        registry.record('push-stream', RequestMetrics(), time.perf_counter() - started, 0, False)
+
+
+class PushRouter:
+    """ASGI app sending PUSH_PATH to the event stream and everything else to Django."""
+
+    def __init__(self, django_application):
+        check_single_process()
+        self.django_application = django_application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == settings.PUSH_PATH:
+            return await push_stream(scope, receive, send)
+        return await self.django_application(scope, receive, send)
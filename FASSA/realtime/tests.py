@@ -0,0 +1,64 @@
+import asyncio
+import datetime
+import os
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from accounts.testing import make_user
+from admin_panel.models import Course, Timetable
+from students.models import CourseRegistration
+from .broker import check_single_process, get_broker
+
+
+class TimetablePushTests(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.course = Course.objects.create(code='PUSH1', title='Push')
+        self.registered = make_user('registered@ttu.edu.gh')
+        self.other = make_user('other@ttu.edu.gh')
+        CourseRegistration.objects.create(student=self.registered, course=self.course)
+
+    def subscribe(self, user):
+        async def subscribe():
+            return get_broker().subscribe(user.pk)
+
+        subscription = self.loop.run_until_complete(subscribe())
+        self.addCleanup(get_broker().unsubscribe, subscription)
+        return subscription
+
+    def test_saved_entry_reaches_only_registered_students(self):
+        registered, other = self.subscribe(self.registered), self.subscribe(self.other)
+        with self.captureOnCommitCallbacks(execute=True):
+            entry = Timetable.objects.create(course=self.course, day_of_week='Monday',
+                                             start_time=datetime.time(8), end_time=datetime.time(10))
+            # Nothing is pushed before the commit.
+            self.loop.run_until_complete(asyncio.sleep(0))
+            self.assertTrue(registered.queue.empty())
+        self.loop.run_until_complete(asyncio.sleep(0))  # run the hand-offs onto the loop
+
+        event = registered.queue.get_nowait()
+        self.assertEqual(event['type'], 'timetable.saved')
+        self.assertEqual(event['data']['id'], entry.pk)
+        self.assertTrue(registered.queue.empty())
+        self.assertTrue(other.queue.empty())
+
+
+class SingleProcessCheckTests(TestCase):
+    @override_settings(PUSH_BROKER='realtime.broker.InProcessBroker')
+    def test_several_workers_are_refused(self):
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '4'}):
+            with self.assertRaises(ImproperlyConfigured):
+                check_single_process()
+
+    @override_settings(PUSH_BROKER='realtime.broker.InProcessBroker')
+    def test_single_process_is_warned(self):
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '1'}), self.assertLogs('realtime.broker', 'WARNING'):
+            check_single_process()
+
+    @override_settings(PUSH_BROKER='realtime.broker.RedisBroker')
+    def test_redis_broker_passes(self):
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '4'}):
+            check_single_process()
@@ -1,3 +1,32 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Resource, ResourceText, StoredBlob, UploadSession
+
+
+@admin.register(Resource)
+class ResourceAdmin(admin.ModelAdmin):
+    list_display = ('title', 'course', 'kind', 'filename', 'created_at')
+    list_filter = ('kind',)
+    search_fields = ('title', 'filename')
+    list_select_related = ('course',)
+    raw_id_fields = ('course', 'blob', 'uploaded_by')
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'size', 'created_at')
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('filename', 'course', 'received', 'size', 'status', 'updated_at')
+    list_filter = ('status',)
+    list_select_related = ('course',)
+    raw_id_fields = ('course', 'resource', 'created_by')
+
+
+@admin.register(ResourceText)
+class ResourceTextAdmin(admin.ModelAdmin):
+    list_display = ('blob', 'status', 'extracted_at')
+    list_filter = ('status',)
+    readonly_fields = ('blob', 'status', 'text', 'error', 'extracted_at')
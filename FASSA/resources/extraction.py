@@ -0,0 +1,68 @@
+"""
+Text extraction for course resources. Plain functions over file paths so
+they can run in worker processes; the Django side is resources.indexing.
+
+PDFs need the optional `pypdf` package; without it they are marked
+UNSUPPORTED and picked up again by `index_resources --retry`.
+"""
+import re
+from collections import Counter
+
+TEXT_TYPES = ('text/',)
+TEXT_EXTENSIONS = ('.txt', '.md', '.csv', '.tex', '.rst', '.html', '.htm')
+TERM_RE = re.compile(r'[^\W_]{2,64}')
+
+
+def is_pdf(content_type, filename):
+    return content_type == 'application/pdf' or filename.lower().endswith('.pdf')
+
+
+def is_text(content_type, filename):
+    return content_type.startswith(TEXT_TYPES) or filename.lower().endswith(TEXT_EXTENSIONS)
+
+
+def read_text(path, max_chars):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read(max_chars)
+
+
+def read_pdf(path, max_chars):
+    from pypdf import PdfReader
+
+    parts, length = [], 0
+    for page in PdfReader(path).pages:
+        text = page.extract_text() or ''
+        parts.append(text)
+        length += len(text)
+        if length >= max_chars:
+            break
+    return '\n'.join(parts)[:max_chars]
+
+
+def clean(text):
+    # PostgreSQL text columns cannot hold NUL, which binary-ish files and some PDFs contain.
+    return text.replace('\x00', '')
+
+
+def extract(job):
+    """job = (sha256, path, content_type, filename, max_chars) -> (sha256, status, text, error)."""
+    sha256, path, content_type, filename, max_chars = job
+    try:
+        if is_text(content_type, filename):
+            return sha256, 'DONE', clean(read_text(path, max_chars)), ''
+        if is_pdf(content_type, filename):
+            try:
+                return sha256, 'DONE', clean(read_pdf(path, max_chars)), ''
+            except ImportError:
+                return sha256, 'UNSUPPORTED', '', 'pypdf is not installed.'
+        return sha256, 'UNSUPPORTED', '', f'No extractor for {content_type or filename}.'
+    except Exception as exc:
+        return sha256, 'FAILED', '', f'{type(exc).__name__}: {exc}'[:1000]
+
+
+def tokenize(text):
+    return [term.lower() for term in TERM_RE.findall(text)]
+
+
+def term_frequencies(text):
+    return Counter(tokenize(text))
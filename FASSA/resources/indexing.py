@@ -0,0 +1,76 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import OuterRef, Subquery
+
+from .extraction import extract, term_frequencies
+from .models import Resource, ResourceTerm, ResourceText, StoredBlob
+from .storage import blob_path
+
+logger = logging.getLogger(__name__)
+
+
+def uses_postings():
+    """PostgreSQL searches ResourceText with its GIN index; other databases use ResourceTerm."""
+    return connection.vendor != 'postgresql'
+
+
+def pending_jobs(limit):
+    """Extraction jobs for blobs that have never been indexed."""
+    first = Resource.objects.filter(blob_id=OuterRef('pk')).order_by('id')
+    blobs = StoredBlob.objects.filter(text__isnull=True).annotate(
+        content_type=Subquery(first.values('content_type')[:1]),
+        filename=Subquery(first.values('filename')[:1]),
+    ).filter(content_type__isnull=False).order_by('created_at')
+    max_chars = getattr(settings, 'RESOURCE_TEXT_MAX_CHARS', 2_000_000)
+    return [
+        (blob.sha256, blob_path(blob.sha256), blob.content_type, blob.filename, max_chars)
+        for blob in blobs[:limit]
+    ]
+
+
+def store_result(sha256, status, text, error):
+    with transaction.atomic():
+        ResourceText.objects.update_or_create(blob_id=sha256, defaults={'status': status, 'text': text, 'error': error})
+        if uses_postings():
+            ResourceTerm.objects.filter(blob_id=sha256).delete()
+            ResourceTerm.objects.bulk_create(
+                (ResourceTerm(blob_id=sha256, term=term, frequency=count)
+                 for term, count in term_frequencies(text).items()),
+                batch_size=2000,
+            )
+
+
+def forget_unindexable():
+    """Make UNSUPPORTED/FAILED blobs pending again, e.g. after installing pypdf."""
+    return ResourceText.objects.filter(status__in=['UNSUPPORTED', 'FAILED']).delete()[0]
+
+
+def index_pending(workers=1, batch_size=50):
+    """Extract and index one batch of blobs. Returns {status: count}."""
+    jobs = pending_jobs(batch_size)
+    counts = {}
+    if not jobs:
+        return counts
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(extract, jobs))
+    else:
+        results = [extract(job) for job in jobs]
+    for sha256, status, text, error in results:
+        try:
+            store_result(sha256, status, text, error)
+        except DatabaseError as exc:
+            # One file the database rejects must not stop the rest of the batch.
+            status = 'FAILED'
+            try:
+                store_result(sha256, status, '', f'{type(exc).__name__}: {exc}'[:1000])
+            except DatabaseError:
+                # E.g. the blob was deleted meanwhile. Not counted, so a batch of
+                # only these ends `index_resources` instead of repeating forever.
+                logger.exception("Could not record the indexing result for blob %s", sha256)
+                continue
+        counts[status] = counts.get(status, 0) + 1
+    return counts
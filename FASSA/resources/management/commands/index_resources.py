@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from resources.indexing import forget_unindexable, index_pending
+
+
+class Command(BaseCommand):
+    help = "Extract text from newly uploaded resources (in a process pool) and add it to the search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--retry', action='store_true', help="Re-process files that were unsupported or failed.")
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new uploads instead of exiting.")
+        parser.add_argument('--interval', type=float, default=30.0, help="Seconds to sleep between polls with --loop.")
+
+    def handle(self, *args, **options):
+        if options['retry']:
+            self.stdout.write(f"Queued {forget_unindexable()} files for another attempt.")
+        while True:
+            counts = index_pending(options['workers'], options['batch_size'])
+            if counts:
+                self.stdout.write(", ".join(f"{status.lower()} {count}" for status, count in sorted(counts.items())))
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
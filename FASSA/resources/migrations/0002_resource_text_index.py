@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The full-text GIN index is PostgreSQL-only and created here rather than in
+# ResourceText.Meta so other databases migrate cleanly; they search through
+# ResourceTerm postings instead.
+
+
+def search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector('text', config='english'), name='resource_text_search_gin')
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(apps.get_model('resources', 'ResourceText'), search_index())
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('resources', 'ResourceText'), search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceText',
+            fields=[
+                ('blob', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='text', serialize=False, to='resources.storedblob')),
+                ('status', models.CharField(choices=[('DONE', 'Done'), ('UNSUPPORTED', 'Unsupported'), ('FAILED', 'Failed')], max_length=12)),
+                ('text', models.TextField(blank=True)),
+                ('error', models.TextField(blank=True)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResourceTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('frequency', models.PositiveIntegerField()),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='resources.storedblob')),
+            ],
+            options={
+                'unique_together': {('term', 'blob')},
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
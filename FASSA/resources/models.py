@@ -1,3 +1,108 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from admin_panel.models import Course
+
+KIND_CHOICES = (
+    ('SLIDES', 'Lecture slides'),
+    ('PAST_QUESTIONS', 'Past questions'),
+    ('OTHER', 'Other'),
+)
+
+
+class StoredBlob(models.Model):
+    """File contents on disk, named by SHA-256 so identical uploads are stored once."""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    size = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]}… ({self.size} bytes)"
+
+
+class Resource(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='resources')
+    title = models.CharField(max_length=255)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='OTHER')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, default='application/octet-stream')
+    blob = models.ForeignKey(StoredBlob, on_delete=models.PROTECT, related_name='resources')
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='resources'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['course', '-created_at'], name='resource_course_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.filename})"
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload: the client PATCHes byte ranges at `received` until the
+    declared size is reached, then the file becomes a StoredBlob + Resource.
+    """
+    STATUS_CHOICES = (
+        ('OPEN', 'Open'),
+        ('COMPLETE', 'Complete'),
+        ('ABORTED', 'Aborted'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='upload_sessions')
+    title = models.CharField(max_length=255)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='OTHER')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, default='application/octet-stream')
+    size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Optional checksum the finished file must match.")
+    received = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='OPEN')
+    resource = models.ForeignKey(Resource, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename}: {self.received}/{self.size} ({self.status})"
+
+
+class ResourceText(models.Model):
+    """
+    Text extracted from one blob by `manage.py index_resources`. Blobs are
+    content-addressed, so a changed file is a new blob and only blobs without
+    a row here ever need extracting.
+    """
+    STATUS_CHOICES = (
+        ('DONE', 'Done'),
+        ('UNSUPPORTED', 'Unsupported'),
+        ('FAILED', 'Failed'),
+    )
+
+    blob = models.OneToOneField(StoredBlob, on_delete=models.CASCADE, primary_key=True, related_name='text')
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES)
+    text = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.blob_id[:12]}… ({self.status})"
+
+
+class ResourceTerm(models.Model):
+    """Inverted index postings (term -> blob, frequency) for databases without full-text search."""
+    blob = models.ForeignKey(StoredBlob, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=64)
+    frequency = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ('term', 'blob')
@@ -0,0 +1,51 @@
+from django.db import connection
+from django.db.models import CharField, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery, Sum, Value
+
+from .extraction import tokenize
+from .models import Resource, ResourceTerm, ResourceText
+
+
+def search_resources(query, resources=None, limit=20):
+    """
+    Resources whose extracted text matches `query`, best first, each annotated
+    with `rank` (and `snippet` on PostgreSQL). Pass an already filtered
+    `resources` queryset to restrict the courses searched.
+    """
+    resources = (resources if resources is not None else Resource.objects.all()).select_related('blob')
+    if not tokenize(query):
+        return resources.none()
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+
+        search_query = SearchQuery(query, config='english', search_type='websearch')
+        # Match on ResourceText with the exact expression of resource_text_search_gin so the
+        # GIN index finds the blobs; only the resources of those blobs are ranked.
+        matching = (
+            ResourceText.objects.annotate(search=SearchVector('text', config='english'))
+            .filter(search=search_query).values('blob_id')
+        )
+        return (
+            resources.filter(blob_id__in=matching)
+            .annotate(
+                rank=SearchRank(SearchVector('blob__text__text', config='english'), search_query),
+                snippet=SearchHeadline('blob__text__text', search_query, config='english', max_words=30),
+            )
+            .order_by('-rank', '-created_at')[:limit]
+        )
+
+    # Postings fallback: more distinct query terms first, then total term frequency.
+    terms = sorted(set(tokenize(query)))
+    postings = ResourceTerm.objects.filter(blob_id=OuterRef('blob_id'), term__in=terms).values('blob_id').order_by()
+    return (
+        resources.annotate(
+            matched=Subquery(postings.annotate(n=Count('id')).values('n')[:1]),
+            hits=Subquery(postings.annotate(total=Sum('frequency')).values('total')[:1]),
+        )
+        .filter(matched__gt=0)
+        .annotate(
+            rank=ExpressionWrapper(F('matched') + 1.0 - 1.0 / (F('hits') + 1.0), output_field=FloatField()),
+            snippet=Value(None, output_field=CharField()),
+        )
+        .order_by('-rank', '-created_at')[:limit]
+    )
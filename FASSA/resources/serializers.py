@@ -0,0 +1,56 @@
+import re
+
+from django.conf import settings
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import Resource, UploadSession
+
+
+class ResourceSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(source='blob.size', read_only=True)
+    sha256 = serializers.CharField(source='blob_id', read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Resource
+        fields = ['id', 'course', 'title', 'kind', 'filename', 'content_type', 'size', 'sha256',
+                  'download_url', 'created_at']
+        read_only_fields = ['filename', 'content_type', 'created_at']
+
+    def get_download_url(self, obj):
+        return reverse('resource-download', args=[obj.pk])
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    upload_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'course', 'title', 'kind', 'filename', 'content_type', 'size', 'sha256',
+                  'received', 'status', 'resource', 'upload_url', 'created_at']
+        read_only_fields = ['received', 'status', 'resource', 'created_at']
+
+    def get_upload_url(self, obj):
+        return reverse('resource-upload', args=[obj.pk])
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Size must be positive.")
+        if value > settings.RESOURCE_MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(f"Files are limited to {settings.RESOURCE_MAX_UPLOAD_SIZE} bytes.")
+        return value
+
+    def validate_sha256(self, value):
+        value = value.strip().lower()
+        if value and not re.fullmatch(r'[0-9a-f]{64}', value):
+            raise serializers.ValidationError("Expected a hex-encoded SHA-256 digest.")
+        return value
+
+
+class ResourceSearchResultSerializer(ResourceSerializer):
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta(ResourceSerializer.Meta):
+        fields = ResourceSerializer.Meta.fields + ['rank', 'snippet']
@@ -0,0 +1,73 @@
+from django.db import IntegrityError, transaction
+
+from .models import Resource, StoredBlob
+from .storage import UploadError, commit_upload, delete_blob, discard_upload, verify_upload
+
+
+def lock_blob(sha256, size=None):
+    """
+    The StoredBlob for `sha256`, locked until the transaction ends so
+    collect_blob cannot remove it while a resource is attached. With `size`
+    the row is created if missing; without, None is returned instead.
+    """
+    blob = StoredBlob.objects.select_for_update().filter(sha256=sha256).first()
+    if blob is None and size is not None:
+        try:
+            with transaction.atomic():
+                blob = StoredBlob.objects.create(sha256=sha256, size=size)
+        except IntegrityError:
+            # Created concurrently; wait for that transaction and use its row.
+            blob = StoredBlob.objects.select_for_update().get(sha256=sha256)
+    return blob
+
+
+def collect_blob(sha256):
+    """
+    Delete a blob's row and file once no resource points at it. Runs after the
+    resource delete commits; the row lock and the second look at the
+    references keep a concurrent upload of the same bytes from losing its file.
+    """
+    with transaction.atomic():
+        blob = lock_blob(sha256)
+        if blob is None or Resource.objects.filter(blob_id=sha256).exists():
+            return
+        blob.delete()
+        delete_blob(sha256)
+
+
+def create_resource(blob, **fields):
+    return Resource.objects.create(blob=blob, **fields)
+
+
+def resource_fields(session):
+    return {
+        'course_id': session.course_id,
+        'title': session.title,
+        'kind': session.kind,
+        'filename': session.filename,
+        'content_type': session.content_type,
+        'uploaded_by_id': session.created_by_id,
+    }
+
+
+def finish_upload(session):
+    """
+    Turn a fully received upload into a Resource, storing the bytes once per
+    distinct SHA-256. Raises UploadError (and aborts the session) on a checksum mismatch.
+    """
+    try:
+        sha256 = verify_upload(session)
+    except UploadError:
+        discard_upload(session)
+        session.status = 'ABORTED'
+        session.save(update_fields=['status', 'updated_at'])
+        raise
+
+    with transaction.atomic():
+        blob = lock_blob(sha256, session.received)
+        commit_upload(session, sha256)
+        resource = create_resource(blob, **resource_fields(session))
+        session.status = 'COMPLETE'
+        session.resource = resource
+        session.save(update_fields=['status', 'resource', 'updated_at'])
+    return resource
@@ -0,0 +1,102 @@
+"""
+Download responses for stored blobs. With RESOURCE_SENDFILE set, the web
+server sends the file (nginx X-Accel-Redirect, or X-Sendfile for Apache
+mod_xsendfile / lighttpd) and also answers Range requests itself; otherwise
+Django streams it, honouring a single `Range: bytes=` range.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from .storage import CHUNK_SIZE, blob_path, blob_relpath
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    Inclusive (start, end) for a single byte range, or None to send the whole
+    file (no header, multiple ranges or a malformed one).
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:  # suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(0, size - length), size - 1
+    start = int(first)
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(last), size - 1) if last else size - 1
+    return (start, end) if end >= start else None
+
+
+def iter_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def resource_response(request, resource):
+    blob = resource.blob
+    etag = f'"{blob.sha256}"'  # content-addressed, so the hash never changes for this URL
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    mode = getattr(settings, 'RESOURCE_SENDFILE', '')
+    if mode == 'nginx':
+        response = HttpResponse(content_type=resource.content_type)
+        prefix = settings.RESOURCE_ACCEL_PREFIX.rstrip('/')
+        response['X-Accel-Redirect'] = f"{prefix}/{blob_relpath(blob.sha256).replace(os.sep, '/')}"
+    elif mode == 'sendfile':
+        response = HttpResponse(content_type=resource.content_type)
+        response['X-Sendfile'] = blob_path(blob.sha256)
+    else:
+        response = streamed_response(request, resource, etag)
+
+    response['ETag'] = etag
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = 'private, max-age=86400'
+    response['Content-Disposition'] = content_disposition_header(True, resource.filename)
+    return response
+
+
+def streamed_response(request, resource, etag):
+    path = blob_path(resource.blob.sha256)
+    size = resource.blob.size
+
+    if_range = request.headers.get('If-Range')
+    try:
+        byte_range = parse_range(request.headers.get('Range'), size) if if_range in (None, etag) else None
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        # FileResponse hands the file to wsgi.file_wrapper (sendfile(2) on most servers).
+        return FileResponse(open(path, 'rb'), content_type=resource.content_type)
+
+    start, end = byte_range
+    response = StreamingHttpResponse(iter_range(path, start, end), status=206, content_type=resource.content_type)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    return response
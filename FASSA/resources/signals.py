@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Resource
+from .services import collect_blob
+
+
+@receiver(post_delete, sender=Resource)
+def resource_deleted(sender, instance, **kwargs):
+    """Drop the stored file once no resource points at it any more."""
+    sha256 = instance.blob_id
+    transaction.on_commit(lambda: collect_blob(sha256))
@@ -0,0 +1,136 @@
+"""
+Local filesystem store under RESOURCE_ROOT:
+
+    blobs/ab/cd/abcd…             finished files, named by their SHA-256
+    uploads/<uuid>.part           uploads in progress
+    uploads/<uuid>.<hex>.chunk    one PATCH body while it arrives
+
+Nothing here holds a whole file in memory; data moves in CHUNK_SIZE pieces.
+"""
+import hashlib
+import os
+import shutil
+import uuid
+
+from django.conf import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadError(Exception):
+    pass
+
+
+def root():
+    return settings.RESOURCE_ROOT
+
+
+def blob_relpath(sha256):
+    return os.path.join('blobs', sha256[:2], sha256[2:4], sha256)
+
+
+def blob_path(sha256):
+    return os.path.join(root(), blob_relpath(sha256))
+
+
+def upload_path(session_id):
+    return os.path.join(root(), 'uploads', f'{session_id}.part')
+
+
+def chunk_path(session_id):
+    return os.path.join(root(), 'uploads', f'{session_id}.{uuid.uuid4().hex}.chunk')
+
+
+def receive_chunk(session, offset, stream):
+    """
+    Write bytes from `stream` to a chunk file of their own, at most
+    session.size - offset of them, without holding any lock. Returns
+    (path, interrupted); what arrived before a disconnect is kept.
+    """
+    path = chunk_path(session.pk)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    interrupted = False
+    with open(path, 'wb') as out:
+        remaining = session.size - offset
+        try:
+            while remaining > 0:
+                chunk = stream.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                out.write(chunk)
+                remaining -= len(chunk)
+        except OSError:  # client went away mid-chunk
+            interrupted = True
+    return path, interrupted
+
+
+def append_chunk(session, path):
+    """
+    Append a received chunk file at session.received and remove it. Bytes
+    after `received` (from an interrupted request) are discarded first.
+    Updates session.received to what is durably in the upload file.
+    """
+    target = upload_path(session.pk)
+    with open(target, 'ab'):
+        pass
+    with open(target, 'r+b') as out, open(path, 'rb') as chunk:
+        out.truncate(session.received)
+        out.seek(session.received)
+        try:
+            shutil.copyfileobj(chunk, out, CHUNK_SIZE)
+        finally:
+            out.flush()
+            os.fsync(out.fileno())
+            session.received = out.tell()
+    discard_chunk(path)
+
+
+def discard_chunk(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_upload(session):
+    """SHA-256 of a finished upload; raises UploadError if it differs from the declared one."""
+    sha256 = file_sha256(upload_path(session.pk))
+    if session.sha256 and session.sha256.lower() != sha256:
+        raise UploadError("Checksum mismatch: the uploaded file does not match the declared sha256.")
+    return sha256
+
+
+def commit_upload(session, sha256):
+    """
+    Move a verified upload into the blob store. Call with the StoredBlob row
+    locked (resources.services.lock_blob), so the file cannot be collected meanwhile.
+    """
+    path = upload_path(session.pk)
+    target = blob_path(sha256)
+    if os.path.exists(target):
+        os.remove(path)  # already stored once
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+
+
+def discard_upload(session):
+    try:
+        os.remove(upload_path(session.pk))
+    except FileNotFoundError:
+        pass
+
+
+def delete_blob(sha256):
+    try:
+        os.remove(blob_path(sha256))
+    except FileNotFoundError:
+        pass
@@ -1,3 +1,178 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import DataError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.testing import log_in, make_user, shared_cache
+from admin_panel.models import Course
+from FASSA.instrumentation import QueryBudgetTestMixin
+from students.models import CourseRegistration
+from . import indexing
+from .indexing import index_pending, store_result
+from .models import Resource, ResourceText, StoredBlob
+from .storage import blob_path
+
+
+def store_blob(content):
+    """Write `content` under RESOURCE_ROOT the way a finished upload would."""
+    sha256 = hashlib.sha256(content).hexdigest()
+    path = blob_path(sha256)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return StoredBlob.objects.create(sha256=sha256, size=len(content))
+
+
+class TemporaryResourceRootMixin:
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(RESOURCE_ROOT=cls.root))
+        cls.addClassCleanup(shutil.rmtree, cls.root, ignore_errors=True)
+        super().setUpClass()
+
+
+class IndexingTests(TemporaryResourceRootMixin, TestCase):
+    def add_resource(self, content, filename='notes.txt'):
+        blob = store_blob(content)
+        course, _ = Course.objects.get_or_create(code='IDX1', defaults={'title': 'Indexing'})
+        Resource.objects.create(course=course, title=filename, filename=filename, content_type='text/plain', blob=blob)
+        return blob
+
+    def test_nul_bytes_are_stripped(self):
+        blob = self.add_resource(b'graph\x00 theory')
+        self.assertEqual(index_pending(), {'DONE': 1})
+        self.assertEqual(ResourceText.objects.get(blob=blob).text, 'graph theory')
+
+    def test_a_rejected_file_fails_alone(self):
+        bad = self.add_resource(b'rejected', filename='bad.txt')
+        good = self.add_resource(b'accepted', filename='good.txt')
+
+        def store(sha256, status, text, error):
+            if sha256 == bad.sha256 and status == 'DONE':
+                raise DataError("value too long")
+            return store_result(sha256, status, text, error)
+
+        with mock.patch.object(indexing, 'store_result', store):
+            self.assertEqual(index_pending(), {'DONE': 1, 'FAILED': 1})
+        self.assertEqual(ResourceText.objects.get(blob=bad).status, 'FAILED')
+        self.assertEqual(ResourceText.objects.get(blob=good).status, 'DONE')
+
+
+@shared_cache
+class ResourcesQueryBudgetTests(TemporaryResourceRootMixin, QueryBudgetTestMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = make_user('reader@ttu.edu.gh')
+        cls.course = Course.objects.create(code='RES1', title='Resources')
+        CourseRegistration.objects.create(student=cls.student, course=cls.course)
+        for i in range(3):
+            content = f'Lecture {i} notes on binary search trees.\n'.encode()
+            blob = store_blob(content)
+            store_result(blob.sha256, 'DONE', content.decode(), '')
+            cls.resource = Resource.objects.create(
+                course=cls.course, title=f'Lecture {i}', filename=f'lecture{i}.txt', content_type='text/plain', blob=blob
+            )
+
+    def setUp(self):
+        cache.clear()
+        log_in(self.client, self.student)
+
+    def test_list(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('resource-list')))
+
+    def test_list_for_one_course(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('resource-list'), {'course': self.course.pk}))
+
+    def test_search(self):
+        response = self.client.get(reverse('resource-search'), {'q': 'binary trees'})
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_download(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('resource-download', args=[self.resource.pk])))
+
+
+class UploadTests(TemporaryResourceRootMixin, TestCase):
+    content = b'0123456789' * 10
+
+    def setUp(self):
+        log_in(self.client, make_user('uploader@ttu.edu.gh', role='ADMIN'))
+        self.course = Course.objects.create(code='UPL1', title='Uploads')
+
+    def start(self, content=None, **fields):
+        content = self.content if content is None else content
+        data = {'course': self.course.pk, 'title': 'Notes', 'filename': 'notes.txt', 'content_type': 'text/plain',
+                'size': len(content), **fields}
+        response = self.client.post(reverse('resource-upload-create'), data, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+
+    def send(self, session, offset, body):
+        return self.client.patch(reverse('resource-upload', args=[session['id']]), body,
+                                 content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset))
+
+    def upload(self):
+        session = self.start()
+        self.assertEqual(self.send(session, 0, self.content[:40]).status_code, 200)
+        response = self.send(session, 40, self.content[40:])
+        self.assertEqual(response.status_code, 201)
+        return Resource.objects.get(pk=response.data['id'])
+
+    def test_resumable_upload(self):
+        resource = self.upload()
+        with open(blob_path(resource.blob_id), 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(os.listdir(os.path.join(self.root, 'uploads')), [])
+
+    def test_stale_offset_is_a_conflict(self):
+        session = self.start()
+        self.send(session, 0, self.content[:40])
+        response = self.send(session, 0, self.content[:40])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Upload-Offset'], '40')
+        self.assertEqual(os.listdir(os.path.join(self.root, 'uploads')), [f"{session['id']}.part"])
+
+    def test_known_bytes_are_deduplicated(self):
+        resource = self.upload()
+        response = self.client.post(reverse('resource-upload-create'), {
+            'course': self.course.pk, 'title': 'Copy', 'filename': 'copy.txt', 'size': len(self.content),
+            'sha256': resource.blob_id,
+        }, content_type='application/json')
+        self.assertTrue(response.data['deduplicated'])
+        self.assertEqual(Resource.objects.filter(blob_id=resource.blob_id).count(), 2)
+
+    def test_blob_is_collected_with_its_last_resource(self):
+        first = self.upload()
+        second = self.upload()
+        path = blob_path(first.blob_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(os.path.exists(path))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(StoredBlob.objects.exists())
+
+    def test_collection_rechecks_references(self):
+        resource = self.upload()
+        blob = resource.blob
+        with self.captureOnCommitCallbacks() as callbacks:
+            resource.delete()
+        # Re-uploaded before the collector ran.
+        Resource.objects.create(course=self.course, title='Again', filename='notes.txt', blob=blob)
+        for callback in callbacks:
+            callback()
+        self.assertTrue(os.path.exists(blob_path(blob.sha256)))
+        self.assertTrue(StoredBlob.objects.filter(pk=blob.pk).exists())
+
+    def test_course_filter_must_be_an_id(self):
+        response = self.client.get(reverse('resource-list'), {'course': 'abc'})
+        self.assertEqual(response.status_code, 400)
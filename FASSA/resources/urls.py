@@ -0,0 +1,12 @@
+from django.urls import path
+from .views import ResourceListView, ResourceSearchView, ResourceDetailView, ResourceDownloadView
+from .views import UploadSessionCreateView, UploadSessionView
+
+urlpatterns = [
+    path('', ResourceListView.as_view(), name='resource-list'),
+    path('search/', ResourceSearchView.as_view(), name='resource-search'),
+    path('<int:pk>/', ResourceDetailView.as_view(), name='resource-detail'),
+    path('<int:pk>/download/', ResourceDownloadView.as_view(), name='resource-download'),
+    path('uploads/', UploadSessionCreateView.as_view(), name='resource-upload-create'),
+    path('uploads/<uuid:pk>/', UploadSessionView.as_view(), name='resource-upload'),
+]
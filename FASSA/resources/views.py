@@ -1,3 +1,169 @@
-from django.shortcuts import render
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from accounts.permissions import IsAdmin
+from students.models import CourseRegistration
+from .models import Resource, UploadSession
+from .search import search_resources
+from .serializers import ResourceSearchResultSerializer, ResourceSerializer, UploadSessionSerializer
+from .serving import resource_response
+from .services import create_resource, finish_upload, lock_blob, resource_fields
+from .storage import UploadError, append_chunk, discard_chunk, discard_upload, receive_chunk
+
+
+def is_faculty(user):
+    return user.role in ('ADMIN', 'SUPERADMIN')
+
+
+class ResourceListView(generics.ListAPIView):
+    """Resources of the student's registered courses (admins see all); filter with ?course="""
+    serializer_class = ResourceSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    stateless_auth = True
+    query_budget = 1
+
+    def get_queryset(self):
+        queryset = Resource.objects.select_related('blob')
+        if not is_faculty(self.request.user):
+            registered = CourseRegistration.objects.filter(student_id=self.request.user.id).values('course_id')
+            queryset = queryset.filter(course_id__in=registered)
+        course = self.request.query_params.get('course')
+        if course:
+            try:
+                queryset = queryset.filter(course_id=int(course))
+            except ValueError:
+                raise ValidationError({"course": "Must be a course id."})
+        return queryset
+
+
+class ResourceSearchView(ResourceListView):
+    """Ranked full-text search inside the resources the user can see: ?q=...&course="""
+    serializer_class = ResourceSearchResultSerializer
+    query_budget = 1
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({"q": "A search query is required."})
+        results = search_resources(query, self.get_queryset())
+        return Response({"query": query, "results": self.get_serializer(results, many=True).data})
+
+
+class ResourceDetailView(generics.RetrieveDestroyAPIView):
+    queryset = Resource.objects.select_related('blob')
+    serializer_class = ResourceSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+
+
+class ResourceDownloadView(APIView):
+    """Send the file; supports Range/If-Range, ETag revalidation and web-server hand-off"""
+    permission_classes = [permissions.IsAuthenticated]
+    stateless_auth = True
+    query_budget = 2
+
+    def get(self, request, pk):
+        resource = get_object_or_404(Resource.objects.select_related('blob'), pk=pk)
+        if not is_faculty(request.user) and not CourseRegistration.objects.filter(
+            student_id=request.user.id, course_id=resource.course_id
+        ).exists():
+            raise PermissionDenied("You are not registered for this course.")
+        return resource_response(request, resource)
+
+
+class UploadSessionCreateView(generics.CreateAPIView):
+    """
+    Start an upload. If `sha256` is given and those bytes are already stored,
+    the resource is created immediately and nothing needs to be sent.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        with transaction.atomic():
+            blob = lock_blob(data['sha256']) if data.get('sha256') else None
+            if blob is not None and blob.size == data['size']:
+                session = serializer.save(created_by_id=request.user.id, status='COMPLETE', received=data['size'])
+                session.resource = create_resource(blob, **resource_fields(session))
+                session.save(update_fields=['resource'])
+                return Response(
+                    {"deduplicated": True, "resource": ResourceSerializer(session.resource).data},
+                    status=status.HTTP_201_CREATED,
+                )
+
+        session = serializer.save(created_by_id=request.user.id)
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED,
+                        headers={'Upload-Offset': '0'})
+
+
+class UploadSessionView(APIView):
+    """
+    GET/HEAD: how many bytes the server has (`Upload-Offset`), to resume after a drop.
+    PATCH: raw bytes continuing at `Upload-Offset`; the last chunk completes the upload.
+    DELETE: abandon the upload.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    parser_classes = []  # the body is streamed to disk, never parsed
+
+    def get(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk)
+        return Response(UploadSessionSerializer(session).data, headers={'Upload-Offset': str(session.received)})
+
+    def offset_conflict(self, session):
+        return Response(
+            {"detail": "Offset does not match the bytes received so far.", "offset": session.received},
+            status=status.HTTP_409_CONFLICT,
+            headers={'Upload-Offset': str(session.received)},
+        )
+
+    def patch(self, request, pk):
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            raise ValidationError({"detail": "An integer Upload-Offset header is required."})
+
+        session = get_object_or_404(UploadSession, pk=pk, status='OPEN')
+        if offset != session.received:
+            return self.offset_conflict(session)
+
+        # The body arrives with no lock held; it is appended only if no other
+        # PATCH moved the offset meanwhile, checked under the row lock.
+        chunk, interrupted = receive_chunk(session, offset, request.stream) if request.stream is not None else (None, False)
+        try:
+            with transaction.atomic():
+                session = get_object_or_404(UploadSession.objects.select_for_update(), pk=pk, status='OPEN')
+                if offset != session.received:
+                    return self.offset_conflict(session)
+                if chunk is not None:
+                    append_chunk(session, chunk)
+                session.save(update_fields=['received', 'updated_at'])
+        finally:
+            if chunk is not None:
+                discard_chunk(chunk)
+
+        headers = {'Upload-Offset': str(session.received)}
+        if interrupted:
+            return Response({"detail": "Upload interrupted; resume from offset.", "offset": session.received},
+                            status=status.HTTP_400_BAD_REQUEST, headers=headers)
+        if session.received < session.size:
+            return Response({"offset": session.received, "size": session.size}, headers=headers)
+
+        try:
+            resource = finish_upload(session)
+        except UploadError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(ResourceSerializer(resource).data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def delete(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, status='OPEN')
+        discard_upload(session)
+        session.status = 'ABORTED'
+        session.save(update_fields=['status', 'updated_at'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,3 +1,16 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import CourseRegistration, SyncChange
+
+
+@admin.register(CourseRegistration)
+class CourseRegistrationAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'date_registered')
+    list_select_related = ('student', 'course')
+    raw_id_fields = ('student', 'course')
+
+
+@admin.register(SyncChange)
+class SyncChangeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'object_id', 'deleted', 'student_id', 'created_at')
+    list_filter = ('kind', 'deleted')
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from admin_panel.catalogue import get_catalogue_version
+from FASSA.routers import pin_to_primary
+
+HITS_KEY = 'students:cache:hits'
+MISSES_KEY = 'students:cache:misses'
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        return cache.incr(key)
+
+
+def user_version_key(user_id):
+    return f'students:user:{user_id}:version'
+
+
+def get_user_version(user_id):
+    return cache.get(user_version_key(user_id), 0)
+
+
+def bump_user_version(user_id):
+    """Invalidate every cached snapshot for this student."""
+    _incr(user_version_key(user_id))
+    pin_to_primary(f'user:{user_id}')
+
+
+def cached_for_user(kind, user_id, build):
+    """
+    Return the cached `kind` snapshot for a student, building it on a miss.
+    Keys carry the student's version and the catalogue version, so stale
+    entries are never read and simply expire.
+    """
+    key = f'students:{kind}:{user_id}:{get_user_version(user_id)}:{get_catalogue_version()}'
+    data = cache.get(key)
+    if data is not None:
+        _incr(HITS_KEY)
+        return data
+
+    _incr(MISSES_KEY)
+    data = build()
+    cache.set(key, data, getattr(settings, 'STUDENT_CACHE_TIMEOUT', 3600))
+    return data
+
+
+def cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else None,
+    }
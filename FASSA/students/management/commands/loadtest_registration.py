@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from rest_framework import serializers
+
+from admin_panel.analytics import students_added
+from admin_panel.models import Course
+from students.models import CourseRegistration
+from students.services import register_student
+
+User = get_user_model()
+
+LOADTEST_PREFIX = 'zzload'
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire parallel registrations at one capped course and verify it is never overbooked. "
+        "Run against PostgreSQL; SQLite serialises writers and reports 'database is locked'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=500)
+        parser.add_argument('--capacity', type=int, default=50)
+        parser.add_argument('--workers', type=int, default=32)
+        parser.add_argument('--keep', action='store_true', help="Keep the synthetic course and students.")
+
+    def handle(self, *args, **options):
+        course = Course.objects.create(
+            code=f'{LOADTEST_PREFIX.upper()}{int(time.time())}',
+            title='Registration load test',
+            capacity=options['capacity'],
+        )
+        students_added(User.objects.bulk_create(
+            User(email=f'{LOADTEST_PREFIX}{course.pk}-{i}@ttu.edu.gh', full_name='Load Test', role='STUDENT')
+            for i in range(options['students'])
+        ))
+        students = list(User.objects.filter(email__startswith=f'{LOADTEST_PREFIX}{course.pk}-'))
+
+        outcomes = {'registered': 0, 'rejected': 0, 'errors': 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(min(options['workers'], len(students)))
+
+        def attempt(student):
+            try:
+                try:
+                    barrier.wait(timeout=5)
+                except threading.BrokenBarrierError:
+                    pass
+                register_student(student, [course])
+                outcome = 'registered'
+            except serializers.ValidationError:
+                outcome = 'rejected'
+            except Exception as exc:
+                self.stderr.write(f"{student.email}: {exc}")
+                outcome = 'errors'
+            finally:
+                connections.close_all()
+            with lock:
+                outcomes[outcome] += 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            list(pool.map(attempt, students))
+        elapsed = time.perf_counter() - start
+
+        course.refresh_from_db()
+        rows = CourseRegistration.objects.filter(course=course).count()
+        self.stdout.write(
+            f"{len(students)} attempts in {elapsed:.2f}s: {outcomes['registered']} registered, "
+            f"{outcomes['rejected']} rejected (full), {outcomes['errors']} errors; "
+            f"capacity {course.capacity}, seats_taken {course.seats_taken}, registrations {rows}"
+        )
+
+        if not options['keep']:
+            User.objects.filter(email__startswith=f'{LOADTEST_PREFIX}{course.pk}-').delete()
+            course.delete()
+
+        if rows > course.capacity or course.seats_taken != rows or outcomes['registered'] != rows:
+            raise CommandError("Course was overbooked or the seat counter drifted.")
+        self.stdout.write(self.style.SUCCESS("No overbooking."))
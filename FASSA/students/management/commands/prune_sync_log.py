@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from students.sync import prune_log
+
+
+class Command(BaseCommand):
+    help = "Delete delta-sync log entries older than SYNC_LOG_RETENTION_DAYS in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Override SYNC_LOG_RETENTION_DAYS.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.05, help="Seconds to sleep between batches.")
+
+    def handle(self, *args, **options):
+        deleted = prune_log(options['days'], options['batch_size'], options['pause'])
+        self.stdout.write(f"Deleted {deleted} sync log entries.")
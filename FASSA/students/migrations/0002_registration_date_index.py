@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='courseregistration',
+            index=models.Index(fields=['date_registered'], name='registration_date_idx'),
+        ),
+    ]
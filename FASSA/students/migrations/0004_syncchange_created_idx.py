@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_sync_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='syncchange',
+            index=models.Index(fields=['created_at'], name='syncchange_created_idx'),
+        ),
+    ]
@@ -6,9 +6,46 @@ class CourseRegistration(models.Model):
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='course_registrations')
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='registrations')
     date_registered = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('student', 'course')
+        indexes = [
+            models.Index(fields=['date_registered'], name='registration_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.email} -> {self.course.code}"
+
+
+class SyncChange(models.Model):
+    """
+    Append-only log of Course, Timetable and CourseRegistration writes behind
+    the delta-sync endpoint (students.sync); the id is the client's watermark.
+    Registration entries carry their student and are only shown to them.
+    """
+    KIND_CHOICES = (
+        ('course', 'Course'),
+        ('timetable', 'Timetable'),
+        ('registration', 'Registration'),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    # No FK constraint: entries outlive the rows (and accounts) they describe.
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['student', 'id'], name='syncchange_student_idx'),
+            models.Index(fields=['created_at'], name='syncchange_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.kind} {self.object_id}{' deleted' if self.deleted else ''}"
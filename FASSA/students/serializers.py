@@ -1,11 +1,13 @@
 from rest_framework import serializers
-from admin_panel.models import Course, Timetable
+from admin_panel.models import Course
+from admin_panel.values import ValuesSerializer
 from .models import CourseRegistration
+from .services import register_student
 
 class CourseListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
-        fields = ['id', 'code', 'title', 'program', 'level', 'semester', 'lecturer']
+        fields = ['id', 'code', 'title', 'program', 'level', 'semester', 'lecturer', 'capacity']
 
 class CourseRegistrationSerializer(serializers.ModelSerializer):
     course_detail = CourseListSerializer(source='course', read_only=True)
@@ -17,16 +19,50 @@ class CourseRegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         student = self.context['request'].user
-        course = validated_data['course']
-        obj, created = CourseRegistration.objects.get_or_create(student=student, course=course)
-        if not created:
-            raise serializers.ValidationError("You are already registered for this course.")
-        return obj
+        return register_student(student, [validated_data['course']])[0]
 
-class TimetableEntrySerializer(serializers.ModelSerializer):
-    course_code = serializers.CharField(source='course.code', read_only=True)
-    course_title = serializers.CharField(source='course.title', read_only=True)
 
-    class Meta:
-        model = Timetable
-        fields = ['id', 'course', 'course_code', 'course_title', 'day_of_week', 'start_time', 'end_time', 'venue']
+class BulkCourseRegistrationSerializer(serializers.Serializer):
+    courses = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all(), many=True, allow_empty=False)
+
+    def create(self, validated_data):
+        student = self.context['request'].user
+        return register_student(student, validated_data['courses'])
+
+class SyncCourseSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'code': 'code',
+        'title': 'title',
+        'program': 'program',
+        'level': 'level',
+        'semester': 'semester',
+        'lecturer': 'lecturer',
+        'capacity': 'capacity',
+        'updated_at': 'updated_at',
+    }
+
+
+class SyncTimetableSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'course': 'course_id',
+        'day_of_week': 'day_of_week',
+        'start_time': 'start_time',
+        'end_time': 'end_time',
+        'venue': 'venue',
+        'updated_at': 'updated_at',
+    }
+    formatters = {
+        'start_time': lambda value: value.isoformat(),
+        'end_time': lambda value: value.isoformat(),
+    }
+
+
+class SyncRegistrationSerializer(ValuesSerializer):
+    fields = {
+        'id': 'id',
+        'course': 'course_id',
+        'date_registered': 'date_registered',
+        'updated_at': 'updated_at',
+    }
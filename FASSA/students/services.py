@@ -0,0 +1,56 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from rest_framework import serializers
+
+from admin_panel.clashes import registration_clashes
+from admin_panel.models import Course
+from .models import CourseRegistration
+
+
+def claim_seat(course):
+    """
+    Take one seat with a single conditional UPDATE. The row lock it takes
+    serialises concurrent claims, so a course can never be overbooked.
+    """
+    return Course.objects.filter(pk=course.pk).filter(
+        Q(capacity__isnull=True) | Q(seats_taken__lt=F('capacity'))
+    ).update(seats_taken=F('seats_taken') + 1) == 1
+
+
+def release_seat(course_id):
+    Course.objects.filter(pk=course_id, seats_taken__gt=0).update(seats_taken=F('seats_taken') - 1)
+
+
+def register_student(student, courses):
+    """
+    Register `student` for every course in `courses` in one transaction, all or nothing.
+    """
+    # Claim seats in primary-key order so parallel bulk requests cannot deadlock.
+    courses = sorted({course.pk: course for course in courses}.values(), key=lambda course: course.pk)
+
+    with transaction.atomic():
+        registered = set(
+            CourseRegistration.objects.filter(student=student, course__in=courses).values_list('course_id', flat=True)
+        )
+        if registered:
+            codes = ', '.join(course.code for course in courses if course.pk in registered)
+            raise serializers.ValidationError(f"You are already registered for: {codes}.")
+
+        clashes = registration_clashes(student, courses)
+        if clashes:
+            raise serializers.ValidationError({"course": [
+                f"{entry.course.code} ({entry.day_of_week} {entry.start_time:%H:%M}-{entry.end_time:%H:%M}) "
+                f"clashes with {other.course.code} ({other.day_of_week} {other.start_time:%H:%M}-{other.end_time:%H:%M})."
+                for entry, other in clashes
+            ]})
+
+        full = [course.code for course in courses if not claim_seat(course)]
+        if full:
+            raise serializers.ValidationError({"course": f"No seats left in: {', '.join(full)}."})
+
+        try:
+            with transaction.atomic():
+                return [CourseRegistration.objects.create(student=student, course=course) for course in courses]
+        except IntegrityError:
+            # A parallel request registered the same course first.
+            raise serializers.ValidationError("You are already registered for this course.")
@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from admin_panel.models import Course, Timetable
+from .cache import bump_user_version
+from .models import CourseRegistration
+from .services import release_seat
+from .sync import log_changes
+
+
+@receiver([post_save, post_delete], sender=CourseRegistration)
+def registration_changed(sender, instance, **kwargs):
+    # After commit: a read between the write and the commit would otherwise
+    # cache the old registrations under the new version.
+    student_id = instance.student_id
+    transaction.on_commit(lambda: bump_user_version(student_id))
+
+
+@receiver(post_delete, sender=CourseRegistration)
+def registration_deleted(sender, instance, **kwargs):
+    release_seat(instance.course_id)
+
+
+SYNC_KINDS = {Course: 'course', Timetable: 'timetable', CourseRegistration: 'registration'}
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Timetable)
+@receiver(post_save, sender=CourseRegistration)
+def log_saved(sender, instance, **kwargs):
+    log_changes(SYNC_KINDS[sender], [instance])
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Timetable)
+@receiver(post_delete, sender=CourseRegistration)
+def log_deleted(sender, instance, **kwargs):
+    log_changes(SYNC_KINDS[sender], [instance], deleted=True)
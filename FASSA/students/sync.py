@@ -0,0 +1,143 @@
+"""
+Delta sync for mobile clients. Every Course, Timetable and CourseRegistration
+write appends a SyncChange row (model signals, or log_changes() for bulk
+writes); a client keeps the id of the last row it has seen as its cursor and
+asks only for what changed after it.
+"""
+import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.sweeper import in_batches
+from admin_panel.models import Course, Timetable
+from .models import CourseRegistration, SyncChange
+from .serializers import SyncCourseSerializer, SyncRegistrationSerializer, SyncTimetableSerializer
+
+# kind -> (model, serializer, response key)
+KINDS = {
+    'course': (Course, SyncCourseSerializer, 'courses'),
+    'timetable': (Timetable, SyncTimetableSerializer, 'timetables'),
+    'registration': (CourseRegistration, SyncRegistrationSerializer, 'registrations'),
+}
+
+
+def log_changes(kind, objects, deleted=False):
+    """Call after bulk writes (bulk_create, queryset update), which skip the model signals."""
+    SyncChange.objects.bulk_create(
+        (
+            SyncChange(kind=kind, object_id=obj.pk, deleted=deleted, student_id=getattr(obj, 'student_id', None))
+            for obj in objects
+        ),
+        batch_size=5000,
+    )
+
+
+def settle_bound(since):
+    """
+    The first id after `since` that is not settled yet, or None. Entries younger
+    than SYNC_SETTLE_SECONDS are held back, together with everything after
+    them, because ids are assigned at insert but become visible at commit: a
+    transaction that is still open could otherwise commit an id below a
+    cursor a client already has.
+
+    This is a window, not a guarantee: a transaction that stays open longer
+    than SYNC_SETTLE_SECONDS after writing its entries can still commit
+    behind a handed-out cursor, and clients miss that change until the row
+    changes again or they reset. Keep writes that log changes short; bulk
+    paths call log_changes() just before they commit.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    return (
+        SyncChange.objects.filter(id__gt=since, created_at__gt=cutoff)
+        .order_by('id').values_list('id', flat=True).first()
+    )
+
+
+def settled(since, bound):
+    entries = SyncChange.objects.filter(id__gt=since)
+    return entries if bound is None else entries.filter(id__lt=bound)
+
+
+def latest_cursor(since, bound):
+    return settled(since, bound).order_by('-id').values_list('id', flat=True).first() or since
+
+
+def needs_reset(since):
+    """True when the client has no cursor, or entries after it were pruned (see prune_sync_log)."""
+    if not since:
+        return True
+    oldest = SyncChange.objects.order_by('id').values_list('id', flat=True).first()
+    return oldest is None or since < oldest - 1
+
+
+def empty_payload(cursor, reset):
+    payload = {'cursor': cursor, 'reset': reset, 'has_more': False}
+    for _, _, key in KINDS.values():
+        payload[key] = []
+    payload['deleted'] = {key: [] for _, _, key in KINDS.values()}
+    return payload
+
+
+def snapshot(student_id):
+    """Everything the client stores, with the cursor to continue from."""
+    # Read the cursor first: rows changed meanwhile are in the snapshot and replayed later, which is harmless.
+    payload = empty_payload(latest_cursor(0, settle_bound(0)), reset=True)
+    for kind, (model, serializer, key) in KINDS.items():
+        rows = model.objects.order_by('id')
+        if kind == 'registration':
+            rows = rows.filter(student_id=student_id)
+        payload[key] = serializer(rows).data
+    return payload
+
+
+def changes_since(student_id, since, limit=None):
+    """Rows created or updated after `since`, and tombstones for deleted ones, at most `limit` log entries."""
+    limit = limit or settings.SYNC_PAGE_SIZE
+    bound = settle_bound(since)
+    entries = list(
+        settled(since, bound)
+        .filter(Q(student__isnull=True) | Q(student_id=student_id))
+        .order_by('id').values_list('id', 'kind', 'object_id', 'deleted')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    # Skip past other students' registration entries too, so the next call does not rescan them.
+    # Both queries stop at the same bound, so nothing below the cursor can be missing from the page.
+    cursor = entries[-1][0] if has_more else latest_cursor(since, bound)
+
+    latest = {kind: {} for kind in KINDS}
+    for _, kind, object_id, deleted in entries:
+        latest[kind][object_id] = deleted
+
+    payload = empty_payload(cursor, reset=False)
+    payload['has_more'] = has_more
+    for kind, states in latest.items():
+        model, serializer, key = KINDS[kind]
+        changed = [object_id for object_id, deleted in states.items() if not deleted]
+        deleted = {object_id for object_id, deleted in states.items() if deleted}
+        if changed:
+            rows = serializer(model.objects.filter(id__in=changed).order_by('id')).data
+            payload[key] = rows
+            # Deleted after the page was read; its tombstone arrives with a later cursor too.
+            deleted.update(set(changed) - {row['id'] for row in rows})
+        payload['deleted'][key] = sorted(deleted)
+    return payload
+
+
+def sync_payload(student_id, since):
+    if needs_reset(since):
+        return snapshot(student_id)
+    return changes_since(student_id, since)
+
+
+def prune_log(days=None, batch_size=1000, pause=0.0):
+    """Delete entries older than SYNC_LOG_RETENTION_DAYS; clients behind them get a full snapshot."""
+    days = settings.SYNC_LOG_RETENTION_DAYS if days is None else days
+    old = SyncChange.objects.filter(created_at__lt=timezone.now() - datetime.timedelta(days=days))
+    # Keep the newest entry so needs_reset() can still tell how far back the log goes.
+    newest = SyncChange.objects.order_by('-id').values_list('id', flat=True).first()
+    if newest is not None:
+        old = old.exclude(id=newest)
+    return in_batches(old, lambda batch: batch.delete()[0], batch_size, pause)
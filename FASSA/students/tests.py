@@ -1,3 +1,247 @@
-from django.test import TestCase
+import datetime
+import random
+import threading
+import time
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connections
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+
+from accounts.testing import log_in, make_user, shared_cache
+from admin_panel.catalogue import get_catalogue_version
+from admin_panel.models import Course, Timetable
+from admin_panel.serializers import CourseSerializer
+from FASSA.instrumentation import QueryBudgetTestMixin
+from .cache import get_user_version
+from .models import CourseRegistration, SyncChange
+from .services import claim_seat, register_student
+from .sync import changes_since, sync_payload
+
+User = get_user_model()
+
+
+def retry_locked(operation, attempts=1000):
+    """SQLite allows one writer at a time and reports the others as locked; PostgreSQL just waits."""
+    for _ in range(attempts):
+        try:
+            return operation()
+        except OperationalError as exc:
+            if 'locked' not in str(exc):
+                raise
+            time.sleep(random.uniform(0.001, 0.02))
+    raise AssertionError("Gave up waiting for the database lock.")
+
+
+def make_students(count, prefix='seat'):
+    return [
+        User.objects.create(email=f'{prefix}{i}@ttu.edu.gh', full_name=f'Student {i}', role='STUDENT')
+        for i in range(count)
+    ]
+
+
+class SeatCounterTests(TestCase):
+    def test_editing_a_course_keeps_the_seat_count(self):
+        course = Course.objects.create(code='SEAT1', title='Seats', capacity=1)
+        loaded = Course.objects.get(pk=course.pk)  # e.g. by CourseDetailView before a PATCH
+
+        self.assertTrue(claim_seat(course))
+        serializer = CourseSerializer(loaded, data={'title': 'Renamed'}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        course.refresh_from_db()
+        self.assertEqual(course.title, 'Renamed')
+        self.assertEqual(course.seats_taken, 1)
+        self.assertFalse(claim_seat(course))
+
+
+class CacheVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_versions_move_only_when_the_write_commits(self):
+        student = make_students(1, prefix='version')[0]
+        course = Course.objects.create(code='VER1', title='Versions')
+        user_version, catalogue_version = get_user_version(student.id), get_catalogue_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseRegistration.objects.create(student=student, course=course)
+            Timetable.objects.create(course=course, day_of_week='Monday', start_time=datetime.time(8),
+                                     end_time=datetime.time(9))
+            self.assertEqual(get_user_version(student.id), user_version)
+            self.assertEqual(get_catalogue_version(), catalogue_version)
+
+        self.assertGreater(get_user_version(student.id), user_version)
+        self.assertGreater(get_catalogue_version(), catalogue_version)
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    capacity = 5
+    students = 30
+    edits = 20
+
+    def test_parallel_registrations_never_overbook(self):
+        course = Course.objects.create(code='RUSH1', title='Rush', capacity=self.capacity)
+        students = make_students(self.students)
+        loaded = Course.objects.get(pk=course.pk)
+        outcomes = []
+        errors = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(len(students) + 1)
+
+        def register(student):
+            try:
+                barrier.wait(timeout=10)
+                try:
+                    retry_locked(lambda: register_student(student, [course]))
+                    outcome = 'registered'
+                except serializers.ValidationError:
+                    outcome = 'full'
+                with lock:
+                    outcomes.append(outcome)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        def edit_course():
+            # An admin editing the course mid-rush with an instance loaded before it started.
+            try:
+                barrier.wait(timeout=10)
+                for i in range(self.edits):
+                    serializer = CourseSerializer(loaded, data={'title': f'Rush {i}'}, partial=True)
+                    serializer.is_valid(raise_exception=True)
+                    retry_locked(serializer.save)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=register, args=(student,)) for student in students]
+        threads.append(threading.Thread(target=edit_course))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        course.refresh_from_db()
+        rows = CourseRegistration.objects.filter(course=course).count()
+        self.assertEqual(rows, self.capacity)
+        self.assertEqual(outcomes.count('registered'), rows)
+        self.assertEqual(outcomes.count('full'), self.students - self.capacity)
+        self.assertEqual(course.seats_taken, rows)
+        self.assertTrue(course.title.startswith('Rush'))
+
+
+@override_settings(SYNC_SETTLE_SECONDS=60)
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.student = make_students(1, prefix='sync')[0]
+
+    def age(self, course_id, seconds=120):
+        SyncChange.objects.filter(kind='course', object_id=course_id).update(
+            created_at=timezone.now() - datetime.timedelta(seconds=seconds)
+        )
+
+    def test_cursor_stops_before_unsettled_entries(self):
+        first = Course.objects.create(code='SYNC1', title='One')
+        second = Course.objects.create(code='SYNC2', title='Two')
+        third = Course.objects.create(code='SYNC3', title='Three')
+        self.age(first.pk)
+        self.age(third.pk)  # settled, but logged after an entry that is not
+
+        payload = changes_since(self.student.id, since=0)
+        self.assertEqual([row['id'] for row in payload['courses']], [first.pk])
+        cursor = payload['cursor']
+
+        self.age(second.pk)
+        payload = changes_since(self.student.id, since=cursor)
+        self.assertEqual([row['id'] for row in payload['courses']], [second.pk, third.pk])
+
+    def test_deletes_come_back_as_tombstones(self):
+        course = Course.objects.create(code='SYNC4', title='Four')
+        course_id = course.pk
+        self.age(course_id)
+        cursor = sync_payload(self.student.id, 0)['cursor']
+
+        course.delete()
+        self.age(course_id)
+        payload = sync_payload(self.student.id, cursor)
+        self.assertFalse(payload['reset'])
+        self.assertEqual(payload['deleted']['courses'], [course_id])
+
+
+@shared_cache
+class StudentsQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = make_user('budget@ttu.edu.gh')
+        cls.admin = make_user('budget-admin@ttu.edu.gh', role='ADMIN')
+        for i in range(3):
+            course = Course.objects.create(code=f'STB{i}', title=f'Budget {i}')
+            Timetable.objects.create(course=course, day_of_week='Tuesday', start_time=datetime.time(8 + i),
+                                     end_time=datetime.time(9 + i))
+            CourseRegistration.objects.create(student=cls.student, course=course)
+
+    def setUp(self):
+        cache.clear()
+        log_in(self.client, self.student)
+
+    def test_available_courses(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('available-courses')))
+
+    def test_my_courses(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('my-courses')))
+
+    def test_personal_timetable(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('personal-timetable')))
+
+    def test_sync_snapshot(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('student-sync')))
+
+    @override_settings(SYNC_SETTLE_SECONDS=0)
+    def test_sync_changes(self):
+        cursor = self.client.get(reverse('student-sync')).data['cursor']
+        Course.objects.filter(code='STB0').get().save()
+        self.assertWithinQueryBudget(self.client.get(reverse('student-sync'), {'since': cursor}))
+
+    def test_cache_stats(self):
+        log_in(self.client, self.admin)
+        self.assertWithinQueryBudget(self.client.get(reverse('student-cache-stats')))
+
+
+@override_settings(SHARED_CACHE=False)
+class StudentsLocalCacheQueryBudgetTests(StudentsQueryBudgetTests):
+    """The same budgets with a per-process cache, where every request also loads the user."""
+
+
+@shared_cache
+class StudentsConstantQueryTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        self.student = make_user('rows@ttu.edu.gh')
+        log_in(self.client, self.student)
+        self.courses = [Course.objects.create(code=f'ROW{i}', title=f'Rows {i}') for i in range(10)]
+        self.register(self.courses[:1])
+
+    def register(self, courses):
+        for course in courses:
+            Timetable.objects.create(course=course, day_of_week='Friday', start_time=datetime.time(10),
+                                     end_time=datetime.time(11))
+            CourseRegistration.objects.create(student=self.student, course=course)
+
+    def fetch(self, name):
+        def get():
+            cache.clear()
+            return self.client.get(reverse(name))
+        return get
+
+    def test_personal_timetable(self):
+        self.assertQueriesDoNotGrow(self.fetch('personal-timetable'), lambda: self.register(self.courses[1:]))
+
+    def test_my_courses(self):
+        self.assertQueriesDoNotGrow(self.fetch('my-courses'), lambda: self.register(self.courses[1:]))
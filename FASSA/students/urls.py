@@ -1,9 +1,13 @@
 from django.urls import path
 from .views import AvailableCoursesView, RegisterCourseView, MyCoursesView, PersonalTimetableView
+from .views import RegisterCoursesView, StudentCacheStatsView, SyncView
 
 urlpatterns = [
     path('courses/', AvailableCoursesView.as_view(), name='available-courses'),
     path('register-course/', RegisterCourseView.as_view(), name='register-course'),
+    path('register-courses/', RegisterCoursesView.as_view(), name='register-courses'),
     path('my-courses/', MyCoursesView.as_view(), name='my-courses'),
     path('timetable/', PersonalTimetableView.as_view(), name='personal-timetable'),
+    path('sync/', SyncView.as_view(), name='student-sync'),
+    path('cache-stats/', StudentCacheStatsView.as_view(), name='student-cache-stats'),
 ]
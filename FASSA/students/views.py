@@ -1,19 +1,35 @@
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions, filters, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from admin_panel.conditional import CatalogueConditionalMixin
 from admin_panel.models import Course, Timetable
+from admin_panel.serializers import TimetableValuesSerializer
+from .cache import cache_stats, cached_for_user
 from .models import CourseRegistration
-from .serializers import CourseListSerializer, CourseRegistrationSerializer, TimetableEntrySerializer
-from accounts.permissions import IsStudent
+from .serializers import CourseListSerializer, CourseRegistrationSerializer
+from .serializers import BulkCourseRegistrationSerializer
+from .sync import sync_payload
+from accounts.permissions import IsAdmin, IsStudent
+from accounts.search import RankedSearchFilter
+from FASSA.routers import ReplicaReadMixin
 
 
-class AvailableCoursesView(generics.ListAPIView):
+class AvailableCoursesView(ReplicaReadMixin, CatalogueConditionalMixin, generics.ListAPIView):
     """List all available courses students can register for"""
     queryset = Course.objects.all().order_by('code')
     serializer_class = CourseListSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'code', 'lecturer__name']
+    query_budget = 2
+    stateless_auth = True
+    filter_backends = [RankedSearchFilter, filters.OrderingFilter]
+    search_fields = ['title', 'code', 'lecturer']
+    search_vector_fields = ['title', 'code', 'lecturer']
     ordering_fields = ['code', 'title']
 
+    def get_replica_pins(self):
+        return ('catalogue',)
+
 
 class RegisterCourseView(generics.CreateAPIView):
     """Register a student for a course"""
@@ -21,21 +37,82 @@ class RegisterCourseView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated, IsStudent]
 
 
+class RegisterCoursesView(generics.GenericAPIView):
+    """Register a student for several courses in one transaction (all or nothing)"""
+    serializer_class = BulkCourseRegistrationSerializer
+    permission_classes = [permissions.IsAuthenticated, IsStudent]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        registrations = serializer.save()
+        data = CourseRegistrationSerializer(registrations, many=True, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
 class MyCoursesView(generics.ListAPIView):
     """List all courses registered by the logged-in student"""
     serializer_class = CourseListSerializer
     permission_classes = [permissions.IsAuthenticated, IsStudent]
+    query_budget = 1
+    stateless_auth = True
 
     def get_queryset(self):
-        regs = CourseRegistration.objects.filter(student=self.request.user)
+        regs = CourseRegistration.objects.filter(student_id=self.request.user.id)
         return Course.objects.filter(id__in=regs.values_list('course_id', flat=True))
 
+    def list(self, request, *args, **kwargs):
+        data = cached_for_user(
+            'courses', request.user.id,
+            lambda: list(self.get_serializer(self.get_queryset(), many=True).data),
+        )
+        return Response(data)
+
 
-class PersonalTimetableView(generics.ListAPIView):
+class PersonalTimetableView(ReplicaReadMixin, generics.ListAPIView):
     """Display student's personalized timetable"""
-    serializer_class = TimetableEntrySerializer
     permission_classes = [permissions.IsAuthenticated, IsStudent]
+    stateless_auth = True
+    query_budget = 1
+
+    def get_replica_pins(self):
+        return ('catalogue', f'user:{self.request.user.id}')
 
     def get_queryset(self):
-        regs = CourseRegistration.objects.filter(student=self.request.user).values_list('course_id', flat=True)
+        regs = CourseRegistration.objects.filter(student_id=self.request.user.id).values_list('course_id', flat=True)
         return Timetable.objects.filter(course_id__in=regs).order_by('day_of_week', 'start_time')
+
+    def list(self, request, *args, **kwargs):
+        # One joined .values() query regardless of row count.
+        data = cached_for_user('timetable', request.user.id, lambda: TimetableValuesSerializer(self.get_queryset()).data)
+        return Response(data)
+
+
+class SyncView(APIView):
+    """
+    Delta sync: GET ?since=<cursor> returns the courses, timetable entries and
+    own registrations changed after the cursor, plus deleted ids. Without a
+    usable cursor the response is a full snapshot with "reset": true. Store
+    the returned cursor; repeat while "has_more" is true. See students.sync
+    for how long changes are held back (SYNC_SETTLE_SECONDS) and why.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsStudent]
+    stateless_auth = True
+    query_budget = 7
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since') or 0)
+        except ValueError:
+            raise ValidationError({"since": "Must be the integer cursor from a previous sync."})
+        return Response(sync_payload(request.user.id, since))
+
+
+class StudentCacheStatsView(APIView):
+    """Hit/miss counters for the per-student course and timetable cache"""
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    query_budget = 0
+    stateless_auth = True
+
+    def get(self, request):
+        return Response(cache_stats())